@@ -0,0 +1,39 @@
+"""geocode cache
+
+Revision ID: 3c1f0b7d9e42
+Revises: 778e17c2a7ea
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c1f0b7d9e42"
+down_revision: Union[str, None] = "778e17c2a7ea"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "geocode_cache",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("lat", sa.Float(), nullable=False),
+        sa.Column("long", sa.Float(), nullable=False),
+        sa.Column("country", sa.String(), nullable=False),
+        sa.Column("city", sa.String(), nullable=False),
+        sa.Column("postcode", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("id"),
+        sa.UniqueConstraint("lat", "long"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("geocode_cache")
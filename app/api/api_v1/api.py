@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .endpoints import report, user, login
+from .endpoints import report, user, login, cache
 
 api_router = APIRouter()
 api_router.include_router(
@@ -7,3 +7,4 @@ api_router.include_router(
 )
 api_router.include_router(user.router, prefix="/user", tags=["user"])
 api_router.include_router(login.router, prefix="/login", tags=["login"])
+api_router.include_router(cache.router, prefix="/cache", tags=["cache"])
@@ -0,0 +1,55 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+
+from api import deps
+from schemas import CacheStats, DiskCacheStats, Message
+from utils.charts import chart_cache
+from utils.entity_cache import entity_cache
+from utils.satellite_image_get import wms_cache
+
+router = APIRouter()
+
+
+@router.get("/", response_model=CacheStats)
+def retrieve_cache_stats(token=Depends(deps.get_current_user)) -> CacheStats:
+    """
+    Returns size and hit/miss counters of the Farm Calendar entity cache.
+    """
+    return CacheStats(**entity_cache.stats())
+
+
+@router.delete("/", response_model=Message)
+def invalidate_cache(
+    entity_type: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    token=Depends(deps.get_current_user),
+) -> Message:
+    """
+    Invalidates cached Farm Calendar entities.
+
+    Without parameters the whole cache is cleared, otherwise only entries
+    matching the given entity type (e.g. "parcel") and/or entity id.
+    """
+    removed = entity_cache.invalidate(entity_type=entity_type, entity_id=entity_id)
+    return Message(message=f"Invalidated {removed} cached entries.")
+
+
+@router.get("/imagery/", response_model=DiskCacheStats)
+def retrieve_imagery_cache_stats(
+    token=Depends(deps.get_current_user),
+) -> DiskCacheStats:
+    """
+    Returns size and hit/miss counters of the on-disk satellite imagery cache.
+    """
+    return DiskCacheStats(**wms_cache.stats())
+
+
+@router.get("/charts/", response_model=DiskCacheStats)
+def retrieve_chart_cache_stats(
+    token=Depends(deps.get_current_user),
+) -> DiskCacheStats:
+    """
+    Returns size and hit/miss counters of the on-disk chart image cache.
+    """
+    return DiskCacheStats(**chart_cache.stats())
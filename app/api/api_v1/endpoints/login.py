@@ -10,7 +10,7 @@ from core.config import settings
 from api import deps
 from crud import user
 from schemas import Token
-import requests
+from utils.http_client import get_http_session, get_request_timeout
 
 router = APIRouter()
 
@@ -24,13 +24,14 @@ def login_access_token(
     OAuth2 compatible token login, get an access token for future requests
     """
     if settings.REPORTING_USING_GATEKEEPER:
-        login = requests.post(
+        login = get_http_session().post(
             url=settings.REPORTING_GATEKEEPER_BASE_URL + "api/login/",
             headers={"Content-Type": "application/json"},
             json={
                 "username": "{}".format(form_data.username),
                 "password": "{}".format(form_data.password),
             },
+            timeout=get_request_timeout(),
         )
 
         if login.status_code // 100 != 2:
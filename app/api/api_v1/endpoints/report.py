@@ -16,18 +16,41 @@ from pydantic import UUID4
 
 from api import deps
 from core import settings
-from schemas import PDF, ManualFarmInfo, ManualParcelInfo, QualityCertification
+from schemas import PDF, ManualFarmInfo, ManualParcelInfo, QualityCertification, ReportFormat
 from utils import decode_jwt_token
 from utils.animals_report import process_animal_data
 from utils.farm_calendar_report import process_farm_calendar_data
 from utils.field_notebook_report import process_field_notebook_data
 from utils.irrig_fert_pest_report import process_irrigation_fertilization_data
+from utils.report_tables import REPORT_MEDIA_TYPES, report_file_path
 from utils.standalone_observation_report import process_standalone_observation_data
 from fastapi.responses import FileResponse
 
 router = APIRouter()
 
 
+def _report_file_response(base_path: str, report_id: str) -> FileResponse:
+    # The report exists in the format it was requested in
+    for output_format in ReportFormat:
+        file_path = report_file_path(base_path, output_format)
+        if os.path.exists(file_path):
+            filename = (
+                report_id
+                if output_format == ReportFormat.PDF
+                else f"{report_id}.{output_format.value}"
+            )
+            return FileResponse(
+                path=file_path,
+                media_type=REPORT_MEDIA_TYPES[output_format],
+                filename=filename,
+            )
+
+    raise HTTPException(
+        status_code=202,
+        detail=f"PDF uuid {report_id} is being generated. Please be patient and try again in couple of seconds.",
+    )
+
+
 @router.get("/{report_id}/", response_class=FileResponse)
 def retrieve_generated_pdf(
     report_id: str,
@@ -35,7 +58,8 @@ def retrieve_generated_pdf(
 ):
     """
 
-    Retrieve generated PDF file
+    Retrieve generated PDF file, or the CSV/XLSX/JSON file when the report
+    was requested in one of these formats
 
     """
     user_id = (
@@ -44,17 +68,7 @@ def retrieve_generated_pdf(
         else token.id
     )
 
-    file_path = f"{settings.PDF_DIRECTORY}{user_id}/{report_id}.pdf"
-
-    if not os.path.exists(file_path):
-        raise HTTPException(
-            status_code=202,
-            detail=f"PDF uuid {report_id} is being generated. Please be patient and try again in couple of seconds.",
-        )
-
-    return FileResponse(
-        path=file_path, media_type="application/pdf", filename=f"{report_id}"
-    )
+    return _report_file_response(f"{settings.PDF_DIRECTORY}{user_id}/{report_id}", report_id)
 
 
 @router.post("/irrigation-report/", response_model=PDF)
@@ -65,7 +79,8 @@ async def generate_irrigation_report(
     data: UploadFile = None,
     from_date: datetime.date = None,
     to_date: datetime.date = None,
-    parcel_id: str = None
+    parcel_id: str = None,
+    output_format: ReportFormat = ReportFormat.PDF,
 ):
     """
     Generates Irrigation Report PDF file
@@ -94,7 +109,8 @@ async def generate_irrigation_report(
         from_date=from_date,
         to_date=to_date,
         operation_id=irrigation_id,
-        parcel_id=parcel_id
+        parcel_id=parcel_id,
+        output_format=output_format
     )
 
     return PDF(uuid=uuid_v4)
@@ -109,7 +125,8 @@ async def generate_generic_observation_report(
     operation_id: str = None,
     from_date: datetime.date = None,
     to_date: datetime.date = None,
-    parcel_id: str = None
+    parcel_id: str = None,
+    output_format: ReportFormat = ReportFormat.PDF,
 ):
     """
     Generates Observation Report PDF file
@@ -135,7 +152,8 @@ async def generate_generic_observation_report(
         operation_id=operation_id,
         from_date=from_date,
         to_date=to_date,
-        parcel_id=parcel_id
+        parcel_id=parcel_id,
+        output_format=output_format
     )
 
     return PDF(uuid=uuid_v4)
@@ -153,7 +171,8 @@ async def generate_animal_report(
     data: UploadFile = None,
     from_date: datetime.date = None,
     to_date: datetime.date = None,
-    parcel_id: str = None
+    parcel_id: str = None,
+    output_format: ReportFormat = ReportFormat.PDF,
 ):
     """
     Generates Animal Report PDF file
@@ -195,6 +214,7 @@ async def generate_animal_report(
         from_date=from_date,
         to_date=to_date,
         farm_animal_id=farm_animal_id,
+        output_format=output_format,
     )
 
     return PDF(uuid=uuid_v4)
@@ -209,7 +229,8 @@ async def generate_fertilization_report(
     data: UploadFile = None,
     from_date: datetime.date = None,
     to_date: datetime.date = None,
-    parcel_id: str = None
+    parcel_id: str = None,
+    output_format: ReportFormat = ReportFormat.PDF,
 ):
     """
     Generates Fertilization Report PDF file
@@ -240,7 +261,8 @@ async def generate_fertilization_report(
         operation_id=fertilization_id,
         parcel_id=parcel_id,
         irrigation_flag=False,
-        fertilization_flag=True
+        fertilization_flag=True,
+        output_format=output_format
     )
 
     return PDF(uuid=uuid_v4)
@@ -249,21 +271,10 @@ async def generate_fertilization_report(
 @router.get("/standalone-observation-report/{report_id}/", response_class=FileResponse)
 def retrieve_standalone_observation_pdf(report_id: str):
     """
-    Retrieve a standalone-observation PDF. No authentication required —
-    matches the no-auth POST endpoint.
+    Retrieve a standalone-observation PDF, or its CSV/XLSX/JSON file.
+    No authentication required — matches the no-auth POST endpoint.
     """
-    file_path = f"{settings.PDF_DIRECTORY}standalone/{report_id}.pdf"
-
-
-    if not os.path.exists(file_path):
-        raise HTTPException(
-            status_code=202,
-            detail=f"PDF uuid {report_id} is being generated. Please be patient and try again in couple of seconds.",
-        )
-
-    return FileResponse(
-        path=file_path, media_type="application/pdf", filename=f"{report_id}"
-    )
+    return _report_file_response(f"{settings.PDF_DIRECTORY}standalone/{report_id}", report_id)
 
 
 @router.post("/standalone-observation-report/", response_model=PDF)
@@ -284,6 +295,7 @@ async def generate_standalone_observation_report(
     farm_vat_id: str = Form(""),
     farm_contact_person: str = Form(""),
     farm_description: str = Form(""),
+    output_format: ReportFormat = Form(ReportFormat.PDF),
 ):
     """
     Generates an Observation Report PDF from a pure JSON-LD observation array.
@@ -323,6 +335,7 @@ async def generate_standalone_observation_report(
         title=title,
         from_date=from_date,
         to_date=to_date,
+        output_format=output_format,
     )
 
     return PDF(uuid=uuid_v4)
@@ -336,7 +349,8 @@ async def generate_pesticides_report(
     data: UploadFile = None,
     from_date: datetime.date = None,
     to_date: datetime.date = None,
-    parcel_id: str = None
+    parcel_id: str = None,
+    output_format: ReportFormat = ReportFormat.PDF,
 ):
     """
     Generates Pesticides Report PDF file
@@ -369,7 +383,8 @@ async def generate_pesticides_report(
         operation_id=pesticide_id,
         parcel_id=parcel_id,
         irrigation_flag=False,
-        pesticides_flag= True
+        pesticides_flag= True,
+        output_format=output_format
     )
 
     return PDF(uuid=uuid_v4)
@@ -389,6 +404,7 @@ async def generate_field_notebook(
     include_observations: bool = True,
     # Quality certification — optional request body
     certification: Optional[QualityCertification] = None,
+    output_format: ReportFormat = ReportFormat.PDF,
 ):
     """
     Generates a unified Field Notebook PDF for a farm parcel.
@@ -433,6 +449,7 @@ async def generate_field_notebook(
         cert_issue_date=certification.cert_issue_date if certification else None,
         cert_expiry_date=certification.cert_expiry_date if certification else None,
         cert_notes=certification.cert_notes if certification else None,
+        output_format=output_format,
     )
 
     return PDF(uuid=uuid_v4)
\ No newline at end of file
@@ -1,6 +1,5 @@
 from typing import Generator
 
-import requests
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 import jwt
@@ -13,6 +12,7 @@ from crud import user
 from core import security
 from core.config import settings
 from db.session import SessionLocal
+from utils.http_client import get_http_session, get_request_timeout
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl="/api/v1/login/access-token/")
 
@@ -30,10 +30,11 @@ def get_current_user(
 ):
     try:
         if settings.REPORTING_USING_GATEKEEPER:
-            response = requests.post(
+            response = get_http_session().post(
                 url=settings.REPORTING_GATEKEEPER_BASE_URL + "api/validate_token/",
                 headers={"Content-Type": "application/json"},
                 json={"token": token, "token_type": "access"},
+                timeout=get_request_timeout(),
             )
 
             if str(response.status_code)[0] != "2":
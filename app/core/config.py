@@ -41,11 +41,100 @@ class Settings(BaseSettings):
         "farm": "/Farm/"
     }
 
+    # Reverse geocoding cache, coordinates are rounded to this many decimals
+    # (4 decimals is roughly 11 m) before lookup in the LRU and the database
+    REPORTING_GEOCODE_PRECISION: int = 4
+    REPORTING_GEOCODE_LRU_SIZE: int = 1024
+    REPORTING_GEOCODE_PERSISTENT_CACHE: bool = True
+    # Shared Nominatim queue, requests per second (usage policy allows 1) and
+    # seconds a report waits for its lookup before leaving the address empty
+    REPORTING_GEOCODER_RATE_LIMIT: float = 1.0
+    REPORTING_GEOCODER_BURST: float = 1.0
+    REPORTING_GEOCODER_WAIT_TIMEOUT: float = 30.0
+
+    # "nominatim" or "offline" (nearest place of a local GeoNames postal code dump)
+    REPORTING_GEOCODER_BACKEND: str = "nominatim"
+    REPORTING_GEOCODER_GAZETTEER_PATH: str = ""
+    REPORTING_GEOCODER_MAX_DISTANCE_KM: float = 50.0
+
+    # Items requested per page from Farm Calendar list endpoints
+    REPORTING_FARMCALENDAR_PAGE_SIZE: int = 500
+
     REPORTING_FORECASTING_BASE_URL: str = ""
     REPORTING_FORECASTING_URLS: dict = {
         "pest_risk": "/PestRisk/",
     }
 
+    # Pooled HTTP client used for all upstream calls
+    REPORTING_HTTP_POOL_CONNECTIONS: int = 10
+    REPORTING_HTTP_POOL_MAXSIZE: int = 20
+    REPORTING_HTTP_POOL_BLOCK: bool = True
+    REPORTING_HTTP_MAX_RETRIES: int = 0
+    REPORTING_HTTP_KEEP_ALIVE: bool = True
+    REPORTING_HTTP_CONNECT_TIMEOUT: float = 5.0
+    REPORTING_HTTP_READ_TIMEOUT: float = 30.0
+    REPORTING_WMS_READ_TIMEOUT: float = 20.0
+    # Satellite images are requested at this resolution for their size in the
+    # PDF and re-encoded as JPEG of this quality before embedding (0 keeps PNG)
+    REPORTING_WMS_DPI: int = 150
+    REPORTING_WMS_JPEG_QUALITY: int = 80
+    # Images are prefetched while report data is collected, rendering waits
+    # at most this many seconds for them before leaving the image out
+    REPORTING_WMS_PREFETCH_WORKERS: int = 4
+    REPORTING_WMS_PREFETCH_DEADLINE: float = 10.0
+    # WMS providers in order of preference. A request goes to the next one when
+    # the previous has not answered within the given percentile of its recent
+    # latencies (or the default delay until enough samples exist)
+    REPORTING_WMS_PROVIDERS: list = [
+        {"url": "https://tiles.maps.eox.at/wms", "layer": "s2cloudless"},
+    ]
+    REPORTING_WMS_HEDGE_PERCENTILE: float = 95.0
+    REPORTING_WMS_HEDGE_DEFAULT_DELAY: float = 3.0
+    REPORTING_WMS_HEDGE_MIN_DELAY: float = 0.5
+    REPORTING_WMS_HEDGE_WORKERS: int = 8
+    # Fetch one image for all parcels of a farm and crop parcel views from it,
+    # unless it would be larger than this many pixels per side
+    REPORTING_WMS_FARM_MOSAIC: bool = False
+    REPORTING_WMS_MOSAIC_MAX_PIXELS: int = 4096
+
+    REPORTING_ASYNC_MAX_CONCURRENCY: int = 10
+    # Coalesce identical in-flight GETs across concurrent report jobs
+    REPORTING_HTTP_SINGLEFLIGHT: bool = True
+
+    # On-disk cache of WMS satellite images (0 disables)
+    REPORTING_WMS_CACHE_DIR: str = "cache/wms/"
+    REPORTING_WMS_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+
+    # Cross-request cache of slow-changing Farm Calendar entities (0 disables)
+    REPORTING_ENTITY_CACHE_MAX_SIZE: int = 2048
+    # Seconds to live, keyed like REPORTING_FARMCALENDAR_URLS
+    REPORTING_ENTITY_CACHE_TTLS: dict = {
+        "parcel": 300,
+        "farm": 900,
+        "pest": 3600,
+        "machines": 900,
+        "activity_types": 3600,
+        "crops": 300,
+        "farm_parcels": 300,
+    }
+
+    # Logo placed on every PDF, read once per process. Relative to the project
+    # root. When the file does not exist it is downloaded once from the URL if
+    # one is set, otherwise reports are generated without the logo
+    REPORTING_LOGO_PATH: str = "assets/openagri_logo.png"
+    REPORTING_LOGO_URL: str = ""
+
+    # Render the pages of field notebook sections as separate documents in
+    # worker processes and merge them, instead of one document in order
+    REPORTING_NOTEBOOK_PARALLEL_SECTIONS: bool = False
+    REPORTING_NOTEBOOK_SECTION_WORKERS: int = 4
+
+    # Draw report charts with PDF vector operators, False embeds matplotlib PNGs
+    REPORTING_VECTOR_CHARTS: bool = True
+    # On-disk cache of those PNGs, keyed by chart template and data (0 disables)
+    REPORTING_CHART_CACHE_DIR: str = "cache/charts/"
+    REPORTING_CHART_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
     PDF_DIRECTORY: str = "user_reports/"
     SQLALCHEMY_DATABASE_URI: Optional[str] = None
 
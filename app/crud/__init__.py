@@ -1 +1,2 @@
 from .crud_user import user
+from .crud_geocode_cache import geocode_cache
@@ -0,0 +1,22 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from crud.base import CRUDBase
+from models import GeocodeCache
+from schemas import GeocodeCacheCreate
+
+
+class CrudGeocodeCache(CRUDBase[GeocodeCache, GeocodeCacheCreate, GeocodeCacheCreate]):
+
+    def get_by_coordinates(
+        self, db: Session, lat: float, long: float
+    ) -> Optional[GeocodeCache]:
+        return (
+            db.query(GeocodeCache)
+            .filter(GeocodeCache.lat == lat, GeocodeCache.long == long)
+            .first()
+        )
+
+
+geocode_cache = CrudGeocodeCache(GeocodeCache)
@@ -1,11 +1,11 @@
 import json
 
-import requests
 import logging
 
 from fastapi import APIRouter
 from core.config import settings
 from api.api_v1.endpoints import report
+from utils.http_client import get_http_session, get_request_timeout
 
 
 logging.basicConfig(level=logging.INFO)
@@ -13,12 +13,14 @@ logger = logging.getLogger(__name__)
 
 
 def register_apis_to_gatekeeper():
-    at = requests.post(
+    session = get_http_session()
+    at = session.post(
         url=settings.REPORTING_GATEKEEPER_BASE_URL + "api/login/",
         json={
             "username": "{}".format(settings.REPORTING_GATEKEEPER_USERNAME),
             "password": "{}".format(settings.REPORTING_GATEKEEPER_PASSWORD),
         },
+        timeout=get_request_timeout(),
     )
     temp = at.json()
     access = temp["access"]
@@ -39,13 +41,14 @@ def register_apis_to_gatekeeper():
                 "methods": list(api.methods),
             }
             logger.info("Port registered: %s", settings.REPORTING_SERVICE_PORT)
-            api_response = requests.post(
+            api_response = session.post(
                 url=settings.REPORTING_GATEKEEPER_BASE_URL + "api/register_service/",
                 headers={
                     "Content-Type": "application/json",
                     "Authorization": "Bearer {}".format(access),
                 },
                 json=json_data,
+                timeout=get_request_timeout(),
             )
 
         except Exception as e:
@@ -57,8 +60,9 @@ def register_apis_to_gatekeeper():
                 f"API api/v1/{api.path.strip('/')} failed with registration to gatekeeper"
             )
 
-    requests.post(
+    session.post(
         url=settings.REPORTING_GATEKEEPER_BASE_URL + "api/logout/",
         json={"refresh": refresh},
+        timeout=get_request_timeout(),
     )
     return
@@ -5,13 +5,22 @@ from starlette.middleware.cors import CORSMiddleware
 from core.config import settings
 from api.api_v1.api import api_router
 from init_gatekeeper import register_apis_to_gatekeeper
+from utils.field_notebook_report import shutdown_section_pool
+from utils.http_client import close_http_session
+from utils.offline_geocoder import get_offline_geocoder
+from utils.pdf_assets import preload_shared_images
 
 
 @asynccontextmanager
 async def lifespan(fa: FastAPI):
     if settings.REPORTING_USING_GATEKEEPER:
         register_apis_to_gatekeeper()
+    if settings.REPORTING_GEOCODER_BACKEND == "offline":
+        get_offline_geocoder()
+    preload_shared_images()
     yield
+    shutdown_section_pool()
+    close_http_session()
 
 
 app = FastAPI(
@@ -1 +1,2 @@
 from .user import User
+from .geocode_cache import GeocodeCache
@@ -0,0 +1,18 @@
+import datetime
+
+from sqlalchemy import Column, DateTime, Float, Integer, String, UniqueConstraint
+
+from db.base_class import Base
+
+
+class GeocodeCache(Base):
+    __tablename__ = "geocode_cache"
+    __table_args__ = (UniqueConstraint("lat", "long"),)
+
+    id = Column(Integer, primary_key=True, unique=True, nullable=False)
+    lat = Column(Float, nullable=False)
+    long = Column(Float, nullable=False)
+    country = Column(String, nullable=False, default="")
+    city = Column(String, nullable=False, default="")
+    postcode = Column(String, nullable=False, default="")
+    created_at = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)
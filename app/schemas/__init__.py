@@ -1,7 +1,9 @@
-from .generic import Message, PDF, QualityCertification
+from .generic import Message, PDF, QualityCertification, ReportFormat
 from .token import *
 from .user import *
 from .irrigation import *
 from .compost import *
 from .animals import *
 from .standalone_observation import *
+from .cache import *
+from .geocode import *
@@ -0,0 +1,26 @@
+from typing import Dict
+
+from pydantic import BaseModel
+
+
+class CacheEntityTypeStats(BaseModel):
+    size: int
+    hits: int
+    misses: int
+
+
+class CacheStats(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    entity_types: Dict[str, CacheEntityTypeStats]
+
+
+class DiskCacheStats(BaseModel):
+    entries: int
+    size_bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import Optional
 
 from pydantic import BaseModel
@@ -11,6 +12,13 @@ class PDF(BaseModel):
     uuid: str
 
 
+class ReportFormat(str, Enum):
+    PDF = "pdf"
+    CSV = "csv"
+    XLSX = "xlsx"
+    JSON = "json"
+
+
 class QualityCertification(BaseModel):
     cert_type: Optional[str] = None
     cert_number: Optional[str] = None
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+
+class GeocodeAddress(BaseModel):
+    country: str = ""
+    city: str = ""
+    postcode: str = ""
+
+    def formatted(self) -> str:
+        return (
+            f"Country: {self.country} | City: {self.city} | Postcode: {self.postcode}"
+        )
+
+    class Config:
+        from_attributes = True
+
+
+class GeocodeCacheCreate(GeocodeAddress):
+    lat: float
+    long: float
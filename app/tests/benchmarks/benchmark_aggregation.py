@@ -0,0 +1,153 @@
+"""
+Seconds to aggregate irrigation and pesticide operations with the columnar
+NumPy functions against the former per-row pandas DataFrame path.
+
+    python -m tests.benchmarks.benchmark_aggregation [operations ...]
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+PESTICIDES = [f"urn:farmcalendar:Pesticide:{i:04d}" for i in range(40)]
+UNITS = ("Litre", "Kilogram")
+
+
+def _operations(count: int) -> tuple:
+    from schemas import CropProtectionOperation, IrrigationOperation
+    from schemas.irrigation import QuantityValue
+
+    rng = random.Random(count)
+    start = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    irrigations, pesticides = [], []
+    for i in range(count):
+        amount = QuantityValue.model_construct(
+            unit=rng.choice(UNITS), numericValue=round(rng.uniform(0, 80), 2)
+        )
+        started = start + timedelta(minutes=rng.randrange(200 * 24 * 60))
+        irrigations.append(
+            IrrigationOperation.model_construct(
+                hasStartDatetime=started, hasAppliedAmount=amount
+            )
+        )
+        pesticides.append(
+            CropProtectionOperation.model_construct(
+                hasStartDatetime=started,
+                hasAppliedAmount=amount,
+                usesPesticide={"@id": rng.choice(PESTICIDES)},
+            )
+        )
+    return irrigations, pesticides
+
+
+def _pesticide_name(pest_id: str, token) -> str:
+    return f"Pesticide {pest_id[-4:]}" if pest_id else ""
+
+
+def pandas_aggregation(irrigations: list, pesticides: list, area: int) -> tuple:
+    """
+    The former implementation, with DataFrames built from a dict per operation.
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(
+        [
+            {
+                "Started Date": irrig.hasStartDatetime,
+                "Dose": (
+                    irrig.hasAppliedAmount.numericValue if irrig.hasAppliedAmount else 0
+                ),
+            }
+            for irrig in irrigations
+        ]
+    )
+    df["Started Date"] = pd.to_datetime(df["Started Date"], format="%d/%m/%Y")
+    df["Total Volume"] = df["Dose"] * area
+    sorted_df = df.sort_values(by="Started Date")
+    series = sorted_df["Started Date"].to_numpy(), sorted_df["Total Volume"].to_numpy()
+    statistics = {
+        "Volume of applied water": [df["Dose"].sum(), df["Total Volume"].sum()],
+        "Average dose": [df["Dose"].mean(), df["Total Volume"].mean()],
+        "Maximum Dose": [df["Dose"].max(), df["Total Volume"].max()],
+        "Minimum Dose": [df["Dose"].min(), df["Total Volume"].min()],
+    }
+
+    pest_df = pd.DataFrame(
+        [
+            {
+                "Dose": pt.hasAppliedAmount.numericValue if pt.hasAppliedAmount else 0,
+                "Pesticide": _pesticide_name(
+                    pt.usesPesticide.get("@id", None) if pt.usesPesticide else None,
+                    None,
+                ),
+                "Unit": pt.hasAppliedAmount.unit if pt.hasAppliedAmount else "",
+            }
+            for pt in pesticides
+        ]
+    )
+    totals = pest_df.groupby(["Pesticide", "Unit"])["Dose"].sum().reset_index()
+    return series, statistics, [tuple(row) for row in totals.itertuples(index=False)]
+
+
+def numpy_aggregation(irrigations: list, pesticides: list, area: int) -> tuple:
+    from utils import generate_aggregation_data as aggregation
+
+    columns = aggregation.operation_columns(irrigations)
+    series = aggregation.total_volume_series(columns, area)
+    statistics = aggregation.generate_aggregation_table_data(columns, area)
+    totals = aggregation.pesticides_aggregation(pesticides, None)
+    return series, statistics, [(t.pesticide, t.unit, t.dose) for t in totals]
+
+
+def main(sizes: list) -> None:
+    from unittest.mock import patch
+
+    import numpy as np
+    import pandas as pd
+
+    from utils import generate_aggregation_data
+
+    with patch.object(generate_aggregation_data, "pesticide_name", _pesticide_name):
+        for size in sizes:
+            irrigations, pesticides = _operations(size)
+            results = {}
+            for name, aggregate in (
+                ("pandas", pandas_aggregation),
+                ("numpy", numpy_aggregation),
+            ):
+                started = time.perf_counter()
+                results[name] = aggregate(irrigations, pesticides, 3)
+                elapsed = time.perf_counter() - started
+                print(
+                    f"{name:>7} {size:>8} operations: {elapsed:7.3f} s {size / elapsed:10.0f} ops/s"
+                )
+
+            (pd_dates, pd_volumes), pd_stats, pd_totals = results["pandas"]
+            (np_dates, np_volumes), np_stats, np_totals = results["numpy"]
+            # Timestamps in UTC on the pandas side
+            pd_dates = pd.DatetimeIndex(pd_dates).tz_convert(None).to_numpy()
+            # Operations of the same date may be in another order
+            assert (pd_dates == np_dates).all()
+            assert (abs(np.sort(pd_volumes) - np.sort(np_volumes)) < 1e-6).all()
+            assert all(
+                abs(a - b) < 1e-6 * max(1, abs(a))
+                for key in pd_stats
+                for a, b in zip(pd_stats[key], np_stats[key])
+            )
+            assert [(p, u) for p, u, _ in pd_totals] == [
+                (p, u) for p, u, _ in np_totals
+            ]
+            assert all(
+                abs(a[2] - b[2]) < 1e-6 * max(1, a[2])
+                for a, b in zip(pd_totals, np_totals)
+            )
+
+
+if __name__ == "__main__":
+    for k, v in REQUIRED_ENV_VARS.items():
+        os.environ.setdefault(k, v)
+    main([int(size) for size in sys.argv[1:]] or [1_000, 100_000, 1_000_000])
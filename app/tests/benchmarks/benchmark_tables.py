@@ -0,0 +1,112 @@
+"""
+Rows per second of `FastTable` against `FPDF.table`, on an animal report
+like table.
+
+    python -m tests.benchmarks.benchmark_tables [rows ...]
+"""
+
+import os
+import random
+import sys
+import time
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+HEADINGS = (
+    "Date",
+    "Animal",
+    "Description",
+    "Parcel",
+    "Parcel Identifier",
+    "Species",
+    "Sex",
+    "Birthdate",
+    "Invalidated",
+    "Group Member",
+)
+WORDS = (
+    "Holstein cow record created upon purchase born on farm pasture north "
+    "barn vaccinated heifer calf Jersey Κοπάδι Αθήνα"
+).split()
+
+
+def _rows(count: int) -> list:
+    rng = random.Random(count)
+    return [
+        (
+            f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2025",
+            f"Animal {i}",
+            " ".join(rng.choices(WORDS, k=rng.randint(3, 12))),
+            f"Country: GR | City: Athens | Postcode: {10000 + i % 500}",
+            f"PARCEL-{i % 37}",
+            "Bos taurus",
+            "Female | Castrated: False",
+            "12/04/2022",
+            "N/A",
+            "Main Herd",
+        )
+        for i in range(count)
+    ]
+
+
+def _document():
+    from fpdf import FPDF
+    from utils import add_fonts
+
+    pdf = FPDF()
+    add_fonts(pdf)
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    return pdf
+
+
+def render_fpdf_table(rows: list) -> bytes:
+    pdf = _document()
+    with pdf.table(text_align="CENTER", padding=0.5) as table:
+        row = table.row()
+        pdf.set_font("FreeSerif", "B", 10)
+        for heading in HEADINGS:
+            row.cell(heading)
+        pdf.set_font("FreeSerif", "", 9)
+        for values in rows:
+            row = table.row()
+            for value in values:
+                row.cell(value)
+    return bytes(pdf.output())
+
+
+def render_fast_table(rows: list) -> bytes:
+    from utils.table_renderer import FastTable
+
+    pdf = _document()
+    with FastTable(pdf) as table:
+        row = table.row()
+        for heading in HEADINGS:
+            row.cell(heading)
+        for values in rows:
+            row = table.row()
+            for value in values:
+                row.cell(value)
+    return bytes(pdf.output())
+
+
+def main(sizes: list) -> None:
+    for size in sizes:
+        rows = _rows(size)
+        for name, render in (
+            ("pdf.table", render_fpdf_table),
+            ("FastTable", render_fast_table),
+        ):
+            started = time.perf_counter()
+            document = render(rows)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{name:>10} {size:>6} rows: {elapsed:7.2f} s "
+                f"{size / elapsed:8.0f} rows/s {len(document) / 1024:8.0f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    for k, v in REQUIRED_ENV_VARS.items():
+        os.environ.setdefault(k, v)
+    main([int(size) for size in sys.argv[1:]] or [100, 1000, 5000])
@@ -0,0 +1,186 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import patch
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+
+class TestChart(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        import numpy as np
+        from utils import charts
+
+        from utils.disk_cache import DiskLRUCache
+
+        self.np = np
+        self.charts = charts
+        self.templates = [charts.TOTAL_VOLUME_CHART, charts.AMOUNT_PER_HECTARE_CHART]
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        # Disabled, every render draws its chart
+        patcher = patch.object(
+            charts, "chart_cache", DiskLRUCache(self.directory, max_bytes=0)
+        )
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+    def chart_data(self, i):
+        days = 3 + i % 5
+        dates = self.np.datetime64("2024-05-01") + self.np.arange(days)
+        return dates, self.np.arange(days, dtype=float) * (i + 1)
+
+    def new_pdf(self):
+        from fpdf import FPDF
+        from utils import add_fonts
+
+        pdf = FPDF()
+        add_fonts(pdf)
+        pdf.add_page()
+        return pdf
+
+    def test_figure_uses_template_style(self):
+        figure = self.templates[0].figure(*self.chart_data(0))
+        ax = figure.axes[0]
+
+        assert ax.get_title() == "Total Volume of applied water per irrigation activity"
+        assert ax.get_ylabel() == "Total Volume (m3)"
+        assert ax.lines[0].get_color() == "#8B8000"
+        assert [text.get_text() for text in ax.texts] == ["0.0", "1.0", "2.0"]
+
+    def test_concurrent_renders_match_serial_renders(self):
+        jobs = [(self.templates[i % 2], *self.chart_data(i)) for i in range(16)]
+        serial = [
+            template.render(dates, values).getvalue()
+            for template, dates, values in jobs
+        ]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            concurrent = list(
+                executor.map(lambda job: job[0].render(job[1], job[2]).getvalue(), jobs)
+            )
+
+        assert concurrent == serial
+        # Every chart differs, no figure was drawn into another one
+        assert len(set(serial)) == len(jobs)
+
+    def test_nice_ticks_cover_values(self):
+        assert self.charts._nice_ticks(3.2, 198.21) == [0, 50, 100, 150, 200]
+        assert self.charts._nice_ticks(-8.11, 46.07) == [-10, 0, 10, 20, 30, 40, 50]
+        assert self.charts._nice_ticks(5, 5) == [4, 4.5, 5, 5.5, 6]
+
+    def test_number_labels_are_not_in_exponent_form(self):
+        label = self.charts._number_label
+
+        assert label(1234567.0) == "1,234,567"
+        assert label(2500000.126) == "2,500,000.13"
+        assert label(-0.001) == "0"
+        assert label(0.025, 3) == "0.025"
+
+    def test_place_draws_vector_chart_without_image(self):
+        pdf = self.new_pdf()
+        pdf.set_y(200)
+        dates, values = self.chart_data(2)
+
+        self.templates[0].place(pdf, dates, values, w=180)
+
+        # Did not fit below y=200, moved to the next page like an image
+        assert pdf.page == 2
+        assert abs(pdf.y - (pdf.t_margin + 90)) < 0.01
+        assert not pdf.image_cache.images
+
+    def test_operations_without_start_date_are_left_out(self):
+        from schemas import IrrigationOperation
+        from utils.generate_aggregation_data import (
+            operation_columns,
+            total_volume_series,
+        )
+
+        def operation(start):
+            return IrrigationOperation.model_validate(
+                {
+                    "@id": "urn:farmcalendar:Operation:1",
+                    "@type": "IrrigationOperation",
+                    "hasStartDatetime": start,
+                    "hasAppliedAmount": {"numericValue": 2, "unit": "m3"},
+                }
+            )
+
+        for starts in ([None], [None, "2024-05-01T08:00:00", "2024-05-03T08:00:00"]):
+            dates, values = total_volume_series(
+                operation_columns(map(operation, starts)), 3
+            )
+            pdf = self.new_pdf()
+
+            self.templates[0].place(pdf, dates, values, w=180)
+
+            kept_dates, kept_values = self.templates[0].points(dates, values)
+            assert len(kept_dates) == len(starts) - 1
+            assert not self.np.isnat(kept_dates).any()
+
+    def test_place_embeds_png_when_vector_charts_disabled(self):
+        pdf = self.new_pdf()
+        dates, values = self.chart_data(2)
+
+        with patch.object(self.charts.settings, "REPORTING_VECTOR_CHARTS", False):
+            self.templates[1].place(pdf, dates, values, w=180)
+
+        assert len(pdf.image_cache.images) == 1
+        assert abs(pdf.y - (pdf.t_margin + 90)) < 0.01
+
+    def test_lttb_keeps_ends_and_peaks(self):
+        x = self.np.arange(1000, dtype=float)
+        y = self.np.zeros(1000)
+        y[[137, 512, 868]] = [50, -40, 30]
+
+        kept = self.charts.lttb(x, y, 20)
+
+        assert len(kept) == 20
+        assert kept[0] == 0 and kept[-1] == 999
+        assert (self.np.diff(kept) > 0).all()
+        assert {137, 512, 868} <= set(kept.tolist())
+        assert len(self.charts.lttb(x[:10], y[:10], 20)) == 10
+
+    def test_long_series_are_downsampled_and_not_annotated(self):
+        rng = self.np.random.default_rng(0)
+        n = 20_000
+        dates = self.np.datetime64("2024-03-01T00:00") + rng.permutation(n).astype(
+            "timedelta64[m]"
+        )
+        values = rng.uniform(0, 10, n)
+
+        template = self.templates[0]
+        line = template.figure(dates, values).axes[0].lines[0]
+
+        assert len(line.get_xdata()) == template.max_points
+        assert (self.np.diff(line.get_xdata()) > self.np.timedelta64(0)).all()
+        assert line.get_marker() == "None"
+        assert not line.axes.texts
+
+    def test_identical_charts_are_rendered_once(self):
+        from utils.disk_cache import DiskLRUCache
+
+        cache = DiskLRUCache(self.directory, max_bytes=1024 * 1024)
+        template = self.templates[0]
+        dates, values = self.chart_data(1)
+
+        with patch.object(self.charts, "chart_cache", cache):
+            first = template.render(dates, values).getvalue()
+            with patch.object(self.charts.Chart, "figure", side_effect=AssertionError):
+                # Same data with another date precision
+                again = template.render(
+                    dates.astype("datetime64[ns]"), list(values)
+                ).getvalue()
+            template.render(dates, values * 2)
+            template._replace(title="Another title").render(dates, values)
+
+        assert again == first
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["entries"] == 3
@@ -0,0 +1,51 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+
+class TestDiskLRUCache(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from utils.disk_cache import DiskLRUCache, content_key
+
+        self.DiskLRUCache = DiskLRUCache
+        self.content_key = content_key
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_hit_and_miss(self):
+        cache = self.DiskLRUCache(self.directory, max_bytes=100)
+        key = self.content_key("s2cloudless", "1,2,3,4", 800, 600, "image/png")
+
+        assert cache.get(key) is None
+        cache.put(key, b"image")
+
+        assert cache.get(key) == b"image"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = self.DiskLRUCache(self.directory, max_bytes=25)
+        cache.put("a" * 64, b"x" * 10)
+        cache.put("b" * 64, b"x" * 10)
+        cache.get("a" * 64)
+        cache.put("c" * 64, b"x" * 10)
+
+        assert cache.get("b" * 64) is None
+        assert cache.get("a" * 64) is not None
+        assert cache.stats()["size_bytes"] == 20
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_survive_a_restart(self):
+        self.DiskLRUCache(self.directory, max_bytes=100).put("d" * 64, b"image")
+
+        cache = self.DiskLRUCache(self.directory, max_bytes=100)
+
+        assert cache.get("d" * 64) == b"image"
+        assert cache.stats()["size_bytes"] == 5
@@ -0,0 +1,162 @@
+import os
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from fastapi import HTTPException
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+
+class TestEntityCache(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from utils import entity_cache
+
+        self.entity_cache = entity_cache
+        self.cache = entity_cache.TTLCache(max_size=2)
+
+    def test_entries_expire(self):
+        with patch.object(self.entity_cache.time, "monotonic", return_value=100.0):
+            self.cache.set(("parcel", "1", "u"), {"id": 1}, ttl=10)
+            assert self.cache.get(("parcel", "1", "u")) == (True, {"id": 1})
+
+        with patch.object(self.entity_cache.time, "monotonic", return_value=111.0):
+            assert self.cache.get(("parcel", "1", "u")) == (False, None)
+
+        stats = self.cache.stats()
+        assert stats["size"] == 0
+        assert stats["entity_types"]["parcel"] == {"size": 0, "hits": 1, "misses": 1}
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.set(("parcel", "1", "u"), 1, ttl=60)
+        self.cache.set(("parcel", "2", "u"), 2, ttl=60)
+        self.cache.get(("parcel", "1", "u"))
+        self.cache.set(("farm", "3", "u"), 3, ttl=60)
+
+        assert self.cache.get(("parcel", "1", "u")) == (True, 1)
+        assert self.cache.get(("parcel", "2", "u")) == (False, None)
+        assert self.cache.get(("farm", "3", "u")) == (True, 3)
+
+    def test_invalidate_by_type_and_id(self):
+        self.cache.max_size = 10
+        self.cache.set(("parcel", "1", "u"), 1, ttl=60)
+        self.cache.set(("parcel", "2", "u"), 2, ttl=60)
+        self.cache.set(("farm", "1", "u"), 3, ttl=60)
+
+        assert self.cache.invalidate(entity_type="parcel", entity_id="1") == 1
+        assert self.cache.invalidate(entity_type="parcel") == 1
+        assert self.cache.invalidate() == 1
+        assert self.cache.stats()["size"] == 0
+
+    def test_fetch_entity_is_cached_per_user(self):
+        loader = MagicMock(return_value={"name": "Farm"})
+        cache = self.entity_cache.TTLCache(max_size=10)
+        self.patch_module("entity_cache", cache)
+        self.patch_module("make_get_request", loader)
+        self.patch_module(
+            "_caller_identity", lambda token: {"a": "user-a", "b": "user-b"}[token]
+        )
+
+        assert self.entity_cache.fetch_entity("farm", "1", "a") == {"name": "Farm"}
+        assert self.entity_cache.fetch_entity("farm", "1", "a") == {"name": "Farm"}
+        self.entity_cache.fetch_entity("farm", "1", "b")
+
+        assert loader.call_count == 2
+
+    def test_empty_results_are_not_cached(self):
+        loader = MagicMock(return_value=None)
+        self.patch_module("entity_cache", self.entity_cache.TTLCache(max_size=10))
+        self.patch_module("make_get_request", loader)
+
+        self.entity_cache.fetch_entity("parcel", "1", "token")
+        self.entity_cache.fetch_entity("parcel", "1", "token")
+
+        assert loader.call_count == 2
+
+    def patch_module(self, attr, value):
+        patcher = patch.object(self.entity_cache, attr, value)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+
+class TestCacheAPI(TestCase):
+
+    CORRECT_TOKEN = "correct"
+    BASE_URL = "/api/v1/cache"
+
+    @staticmethod
+    def user_login(token):
+        if token == TestCacheAPI.CORRECT_TOKEN:
+            return ""
+        raise HTTPException(status_code=401, detail="Not Auth!")
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from main import app
+        from api.api_v1.endpoints import cache
+        from fastapi.testclient import TestClient
+        from api.deps import get_current_user
+        from utils.entity_cache import TTLCache
+
+        app.dependency_overrides[get_current_user] = TestCacheAPI.user_login
+        self.addCleanup(app.dependency_overrides.pop, get_current_user, None)
+
+        self.cache = TTLCache(max_size=10)
+        patcher = patch.object(cache, "entity_cache", self.cache)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+        self.client = TestClient(app)
+
+    def test_cache_endpoints_not_auth(self):
+        response = self.client.get(
+            f"{TestCacheAPI.BASE_URL}/", params={"token": "wrong"}
+        )
+        assert response.status_code == 401
+
+    def test_retrieve_cache_stats(self):
+        self.cache.set(("parcel", "1", "u"), 1, ttl=60)
+
+        response = self.client.get(
+            f"{TestCacheAPI.BASE_URL}/", params={"token": TestCacheAPI.CORRECT_TOKEN}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["size"] == 1
+        assert response.json()["entity_types"]["parcel"]["size"] == 1
+
+    def test_invalidate_cache(self):
+        self.cache.set(("parcel", "1", "u"), 1, ttl=60)
+        self.cache.set(("farm", "1", "u"), 2, ttl=60)
+
+        response = self.client.delete(
+            f"{TestCacheAPI.BASE_URL}/",
+            params={"token": TestCacheAPI.CORRECT_TOKEN, "entity_type": "parcel"},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"message": "Invalidated 1 cached entries."}
+        assert self.cache.stats()["size"] == 1
+
+    def test_retrieve_imagery_cache_stats(self):
+        response = self.client.get(
+            f"{TestCacheAPI.BASE_URL}/imagery/",
+            params={"token": TestCacheAPI.CORRECT_TOKEN},
+        )
+
+        assert response.status_code == 200
+        assert set(response.json()) >= {"hits", "misses", "size_bytes"}
+
+    def test_retrieve_chart_cache_stats(self):
+        response = self.client.get(
+            f"{TestCacheAPI.BASE_URL}/charts/",
+            params={"token": TestCacheAPI.CORRECT_TOKEN},
+        )
+
+        assert response.status_code == 200
+        assert set(response.json()) >= {"hits", "misses", "size_bytes"}
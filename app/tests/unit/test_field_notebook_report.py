@@ -0,0 +1,97 @@
+import io
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+
+class TestParallelSections(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from utils import field_notebook_report
+
+        self.field_notebook_report = field_notebook_report
+
+        patcher = patch.object(
+            field_notebook_report.settings, "REPORTING_NOTEBOOK_SECTION_WORKERS", 1
+        )
+        self.addCleanup(patcher.stop)
+        patcher.start()
+        self.addCleanup(field_notebook_report.shutdown_section_pool)
+
+    def sections(self):
+        from schemas import IrrigationOperation
+
+        irrigation_ops = [
+            IrrigationOperation.model_validate(
+                {
+                    "@id": f"urn:farmcalendar:Operation:{i}",
+                    "@type": "IrrigationOperation",
+                    "title": f"Irrigation {i}",
+                    "hasStartDatetime": "2024-05-01T08:00:00",
+                    "hasAppliedAmount": {"numericValue": i, "unit": "m3"},
+                }
+            )
+            for i in range(200)
+        ]
+        return self.field_notebook_report.field_notebook_sections(
+            None,
+            "token",
+            irrigation_ops=irrigation_ops,
+            forecasting_data=[{"pest": "Aphids", "riskLevel": "High"}],
+            include_pesticides=False,
+            cert_type="Organic",
+        )
+
+    def test_merged_document_matches_sequential_rendering(self):
+        from pypdf import PdfReader
+
+        sections = self.sections()
+        sequential = PdfReader(
+            io.BytesIO(
+                bytes(
+                    self.field_notebook_report.render_field_notebook(sections).output()
+                )
+            )
+        )
+        merged = PdfReader(
+            io.BytesIO(
+                self.field_notebook_report.render_field_notebook_parallel(sections)
+            )
+        )
+
+        assert len(merged.pages) == len(sequential.pages) > 5
+
+        def outline(reader):
+            return [
+                (item.title, reader.get_destination_page_number(item))
+                for item in reader.outline
+            ]
+
+        assert outline(merged) == outline(sequential)
+        assert [title for title, _ in outline(merged)] == [
+            "1. Farm & Parcel Information",
+            "2. Forecasting Models – Last 15 Days",
+            "3. Fertilization Activities",
+            "4. Irrigation Activities",
+            "5. Crop Data & Observations",
+        ]
+        assert "Organic" in merged.pages[-1].extract_text()
+
+    def test_sections_starting_a_page_are_separate_documents(self):
+        documents = self.field_notebook_report._section_documents(self.sections())
+
+        assert [
+            [(number, section.render.__name__) for number, section in document]
+            for document in documents
+        ] == [
+            [(None, "_render_title"), ("1", "_render_farm_info")],
+            [("2", "_render_forecasting")],
+            [("3", "_render_fertilization")],
+            [("4", "_render_irrigation")],
+            [("5", "_render_observations"), (None, "_render_certification")],
+        ]
@@ -0,0 +1,103 @@
+import os
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+
+class TestColumnarAggregation(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        import numpy as np
+        from utils import generate_aggregation_data
+
+        self.np = np
+        self.aggregation = generate_aggregation_data
+
+    def operation(self, start, dose, unit="Litre", pesticide=None):
+        from schemas import CropProtectionOperation, IrrigationOperation
+
+        data = {
+            "@id": "urn:farmcalendar:Operation:1",
+            "@type": "Operation",
+            "hasStartDatetime": start,
+            "hasAppliedAmount": {"numericValue": dose, "unit": unit},
+        }
+        if pesticide is None:
+            return IrrigationOperation.model_validate(data)
+        data["usesPesticide"] = {"@id": f"urn:farmcalendar:Pesticide:{pesticide}"}
+        return CropProtectionOperation.model_validate(data)
+
+    def test_columns_of_operations(self):
+        columns = self.aggregation.operation_columns(
+            [
+                self.operation("2024-05-02T10:00:00+02:00", 2.5, "m3"),
+                self.operation("2024-05-01T08:00:00", 1, "Litre", pesticide="b"),
+                self.operation(None, 4, "m3", pesticide="a"),
+            ]
+        )
+
+        assert columns.dates.tolist()[:2] == [
+            self.np.datetime64("2024-05-02T08:00:00", "us").tolist(),
+            self.np.datetime64("2024-05-01T08:00:00", "us").tolist(),
+        ]
+        assert self.np.isnat(columns.dates[2])
+        assert columns.doses.tolist() == [2.5, 1, 4]
+        assert columns.units[columns.unit_codes].tolist() == ["m3", "Litre", "m3"]
+        assert columns.units.tolist() == ["Litre", "m3"]
+        assert columns.pesticide_ids[columns.pesticide_codes].tolist() == [
+            "",
+            "urn:farmcalendar:Pesticide:b",
+            "urn:farmcalendar:Pesticide:a",
+        ]
+
+    def test_pesticide_totals_are_grouped_by_name_and_unit(self):
+        names = {"a": "Copper", "b": "Azadirachtin", "c": "Copper", "d": None}
+        get_pesticide = MagicMock(
+            side_effect=lambda pest_id, token: {"hasCommercialName": names[pest_id]}
+        )
+        patcher = patch.object(self.aggregation, "get_pesticide", get_pesticide)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+        totals = self.aggregation.pesticides_aggregation(
+            [
+                self.operation("2024-05-01T08:00:00", 1.5, "Litre", pesticide="a"),
+                self.operation("2024-05-02T08:00:00", 2, "Litre", pesticide="c"),
+                self.operation("2024-05-03T08:00:00", 3, "Kilogram", pesticide="a"),
+                self.operation("2024-05-04T08:00:00", 5, "Litre", pesticide="b"),
+                self.operation("2024-05-05T08:00:00", 7, "Litre", pesticide="d"),
+                self.operation("2024-05-06T08:00:00", 0.5, "Litre", pesticide="a"),
+            ],
+            "token",
+        )
+
+        assert totals == [
+            ("Azadirachtin", "Litre", 5.0),
+            ("Copper", "Kilogram", 3.0),
+            ("Copper", "Litre", 4.0),
+        ]
+        # Once per distinct pesticide
+        assert get_pesticide.call_count == 4
+
+    def test_aggregation_table_data(self):
+        columns = self.aggregation.operation_columns(
+            [
+                self.operation("2024-05-02T08:00:00", 3),
+                self.operation("2024-05-01T08:00:00", 1),
+                self.operation("2024-05-03T08:00:00", 2),
+            ]
+        )
+
+        assert self.aggregation.generate_aggregation_table_data(columns, 10) == {
+            "Volume of applied water": [6, 60],
+            "Average dose": [2, 20],
+            "Maximum Dose": [3, 30],
+            "Minimum Dose": [1, 10],
+        }
+        dates, volumes = self.aggregation.total_volume_series(columns, 10)
+        assert volumes.tolist() == [10, 30, 20]
+        assert (self.np.diff(dates) > self.np.timedelta64(0)).all()
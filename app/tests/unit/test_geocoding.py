@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+
+class TestReverseGeocode(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from sqlalchemy.pool import StaticPool
+
+        from models import GeocodeCache
+        from utils import geocoding
+        from utils.entity_cache import TTLCache
+
+        # Lookups are stored from the geocoding worker thread, share one connection
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        GeocodeCache.metadata.create_all(engine, tables=[GeocodeCache.__table__])
+
+        self.geocoding = geocoding
+        for attr, value in (
+            ("SessionLocal", sessionmaker(bind=engine)),
+            ("address_cache", TTLCache(max_size=10)),
+        ):
+            patcher = patch.object(geocoding, attr, value)
+            self.addCleanup(patcher.stop)
+            patcher.start()
+
+        self.nominatim = MagicMock()
+        self.nominatim.reverse.return_value.raw = {
+            "address": {"country": "Greece", "city": "Athens", "postcode": "10558"}
+        }
+        self.geolocator = geocoding.GeocodingService(
+            self.nominatim, rate=100, burst=10, on_resolved=geocoding._remember
+        )
+
+    def test_nearby_coordinates_share_one_lookup(self):
+        first = self.geocoding.reverse_geocode(37.97451, 23.72791, self.geolocator)
+        second = self.geocoding.reverse_geocode(37.974512, 23.727908, self.geolocator)
+
+        assert first == second == "Country: Greece | City: Athens | Postcode: 10558"
+        self.nominatim.reverse.assert_called_once_with("37.9745, 23.7279")
+
+    def test_persisted_address_survives_a_cold_lru(self):
+        self.geocoding.reverse_geocode(37.97451, 23.72791, self.geolocator)
+        self.geocoding.address_cache.invalidate()
+
+        address = self.geocoding.reverse_geocode(37.97451, 23.72791, self.geolocator)
+
+        assert address == "Country: Greece | City: Athens | Postcode: 10558"
+        assert self.nominatim.reverse.call_count == 1
+
+    def test_unknown_location_is_not_cached(self):
+        self.nominatim.reverse.return_value = None
+
+        assert self.geocoding.reverse_geocode(0.0, 0.0, self.geolocator) == ""
+        assert self.geocoding.reverse_geocode(0.0, 0.0, self.geolocator) == ""
+        assert self.nominatim.reverse.call_count == 2
+
+
+class TestGeocodingService(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from utils.geocoding import GeocodingService
+
+        self.release = threading.Event()
+        self.nominatim = MagicMock()
+
+        def reverse(coordinates):
+            self.release.wait(1)
+            location = MagicMock()
+            location.raw = {"address": {"city": coordinates}}
+            return location
+
+        self.nominatim.reverse.side_effect = reverse
+        self.service = GeocodingService(self.nominatim, rate=20, burst=1)
+
+    def test_pending_lookups_are_deduplicated(self):
+        futures = [self.service.submit(37.9745, 23.7279) for _ in range(5)]
+        other = self.service.submit(40.6321, 22.9414)
+        self.release.set()
+
+        assert len({id(f) for f in futures}) == 1
+        assert futures[0].result(1).city == "37.9745, 23.7279"
+        assert other.result(1).city == "40.6321, 22.9414"
+        assert self.nominatim.reverse.call_count == 2
+        assert self.service.pending() == 0
+
+    def test_requests_are_rate_limited(self):
+        self.release.set()
+        start = time.monotonic()
+
+        futures = [self.service.submit(float(i), 0.0) for i in range(4)]
+        for future in futures:
+            future.result(1)
+
+        # One token up front, the other three refill at 20 per second
+        assert time.monotonic() - start >= 0.14
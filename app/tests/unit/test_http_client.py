@@ -0,0 +1,46 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+
+class TestSharedSession(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from utils import http_client
+
+        self.session = http_client._build_session()
+        self.addCleanup(self.session.close)
+
+        received = self.received = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                received.append(self.headers.get("Cookie"))
+                self.send_response(200)
+                self.send_header("Set-Cookie", "sessionid=user-a; Path=/")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    def test_cookies_are_not_sent_with_later_requests(self):
+        first = self.session.get(self.url, timeout=5)
+        self.session.get(self.url, timeout=5)
+
+        # Still readable on the response that set it
+        assert first.cookies.get("sessionid") == "user-a"
+        assert self.received == [None, None]
+        assert not self.session.cookies
@@ -0,0 +1,48 @@
+import asyncio
+import os
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+
+class TestJobContext(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from utils import job_context
+
+        self.job_context = job_context
+
+    def test_values_are_memoized_within_a_job(self):
+        loader = MagicMock(return_value=None)
+
+        @self.job_context.report_job
+        def job():
+            for _ in range(500):
+                self.job_context.job_memoize(("parcel", "1"), loader)
+
+        job()
+        job()
+
+        assert loader.call_count == 2
+
+    def test_no_memoization_outside_a_job(self):
+        loader = MagicMock(return_value={"id": 1})
+
+        self.job_context.job_memoize(("parcel", "1"), loader)
+        self.job_context.job_memoize(("parcel", "1"), loader)
+
+        assert loader.call_count == 2
+        assert self.job_context.current_job_memo() is None
+
+    def test_memo_is_visible_inside_asyncio_run(self):
+        with self.job_context.report_job_context() as memo:
+            memo.set("key", "value")
+
+            async def lookup():
+                return self.job_context.current_job_memo().get("key")
+
+            assert asyncio.run(lookup()) == (True, "value")
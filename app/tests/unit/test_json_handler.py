@@ -0,0 +1,134 @@
+import asyncio
+import os
+from functools import partial
+from unittest import TestCase
+from unittest.mock import patch
+
+import httpx
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+
+class TestConcurrentFetch(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from utils import json_handler
+
+        self.json_handler = json_handler
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        async def handler(request: httpx.Request):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.05)
+            self.in_flight -= 1
+            if request.url.path.endswith("/broken/"):
+                return httpx.Response(500)
+            return httpx.Response(200, json={"path": request.url.path})
+
+        def client_factory():
+            return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        patcher = patch.object(json_handler, "create_async_client", client_factory)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+    def test_results_are_keyed_and_failures_are_none(self):
+        tasks = {
+            "ok": partial(self.json_handler.make_async_get_request, url="/ok/"),
+            "broken": partial(self.json_handler.make_async_get_request, url="/broken/"),
+        }
+
+        results = self.json_handler.run_concurrently(tasks)
+
+        assert results["ok"] == {"path": "/ok/"}
+        assert results["broken"] is None
+
+    def test_fetches_run_concurrently(self):
+        tasks = {
+            i: partial(self.json_handler.make_async_get_request, url=f"/item/{i}/")
+            for i in range(6)
+        }
+
+        results = self.json_handler.run_concurrently(tasks)
+
+        assert len(results) == 6
+        assert self.max_in_flight > 1
+
+
+class TestPagination(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from utils import json_handler
+
+        self.json_handler = json_handler
+        self.requested_pages = []
+
+        def pages(request: httpx.Request):
+            page = int(request.url.params["page"])
+            self.requested_pages.append(page)
+            if request.url.path.endswith("/plain/"):
+                return httpx.Response(200, json=[{"id": 1}, {"id": 2}])
+            return httpx.Response(
+                200,
+                json={
+                    "count": 5,
+                    "next": "next-page" if page < 3 else None,
+                    "previous": None,
+                    "results": [
+                        {"id": i} for i in range(page * 2 - 2, min(page * 2, 5))
+                    ],
+                },
+            )
+
+        self.pages = pages
+
+        def client_factory():
+            return httpx.AsyncClient(transport=httpx.MockTransport(pages))
+
+        patcher = patch.object(json_handler, "create_async_client", client_factory)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+    def test_iterator_follows_pages(self):
+        def make_get_request(url, params=None, token=None):
+            request = httpx.Request(
+                "GET", f"http://mock.gatekeeper{url}", params=params
+            )
+            assert (
+                params["page_size"]
+                == self.json_handler.settings.REPORTING_FARMCALENDAR_PAGE_SIZE
+            )
+            return self.pages(request).json()
+
+        with patch.object(self.json_handler, "make_get_request", make_get_request):
+            items = self.json_handler.iter_paginated("/ops/", params={"format": "json"})
+
+            assert next(items) == {"id": 0}
+            assert self.requested_pages == [1]
+            assert [item["id"] for item in items] == [1, 2, 3, 4]
+
+        assert self.requested_pages == [1, 2, 3]
+
+    def test_async_fetch_of_plain_list_is_a_single_page(self):
+        results = self.json_handler.run_concurrently(
+            {
+                "plain": partial(
+                    self.json_handler.fetch_paginated_async, url="/plain/"
+                ),
+                "paged": partial(
+                    self.json_handler.fetch_paginated_async, url="/paged/"
+                ),
+            }
+        )
+
+        assert results["plain"] == [{"id": 1}, {"id": 2}]
+        assert [item["id"] for item in results["paged"]] == [0, 1, 2, 3, 4]
+        assert sorted(self.requested_pages) == [1, 1, 2, 3]
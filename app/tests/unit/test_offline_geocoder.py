@@ -0,0 +1,56 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+GAZETTEER = (
+    "GR\t105 58\tAthina\tAttiki\tI\t\t\t\t\t37.9738\t23.7275\t4\n"
+    "GR\t546 21\tThessaloniki\tKentriki Makedonia\tB\t\t\t\t\t40.6321\t22.9414\t4\n"
+    "NL\t1012\tAmsterdam\tNoord-Holland\t07\t\t\t\t\t52.3731\t4.8922\t6\n"
+    "broken line\n"
+)
+
+
+class TestOfflineGeocoder(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from utils import offline_geocoder
+
+        self.offline_geocoder = offline_geocoder
+
+    def test_kd_tree_matches_brute_force(self):
+        rng = np.random.default_rng(7)
+        points = self.offline_geocoder.to_unit_vectors(
+            rng.uniform(-90, 90, 5000), rng.uniform(-180, 180, 5000)
+        )
+        tree = self.offline_geocoder.KDTree(points)
+
+        queries = self.offline_geocoder.to_unit_vectors(
+            rng.uniform(-90, 90, 200), rng.uniform(-180, 180, 200)
+        )
+        for query in queries:
+            distance, index = tree.query(query)
+            expected = int(((points - query) ** 2).sum(axis=1).argmin())
+            assert index == expected
+            assert np.isclose(distance, np.linalg.norm(points[expected] - query))
+
+    def test_reverse_from_gazetteer(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write(GAZETTEER)
+        self.addCleanup(os.remove, f.name)
+
+        geocoder = self.offline_geocoder.OfflineGeocoder.from_gazetteer(f.name)
+
+        assert len(geocoder.places) == 3
+        assert (
+            geocoder.reverse(37.98, 23.72).formatted()
+            == "Country: GR | City: Athina | Postcode: 105 58"
+        )
+        assert geocoder.reverse(52.36, 4.90).city == "Amsterdam"
+        assert geocoder.reverse(-33.86, 151.20) is None
@@ -0,0 +1,127 @@
+import io
+import os
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from PIL import Image
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+
+class TestSharedImages(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from utils import pdf_assets
+
+        self.pdf_assets = pdf_assets
+        png = io.BytesIO()
+        Image.new("RGBA", (1024, 338), (0, 80, 160, 200)).save(png, format="PNG")
+        self.load_logo = MagicMock(return_value=png.getvalue())
+
+        for attr, value in (
+            ("_decoded", {}),
+            (
+                "_loaders",
+                {
+                    pdf_assets.OPENAGRI_LOGO: self.load_logo,
+                    pdf_assets.EU_EMBLEM: pdf_assets._load_eu_emblem,
+                },
+            ),
+        ):
+            patcher = patch.object(pdf_assets, attr, value)
+            self.addCleanup(patcher.stop)
+            patcher.start()
+
+    @staticmethod
+    def render() -> bytes:
+        from utils import EX, add_fonts
+
+        pdf = EX()
+        add_fonts(pdf)
+        pdf.add_page()
+        pdf.add_page()
+        pdf.set_font("FreeSerif", "", 10)
+        pdf.cell(0, 10, "Report")
+        return bytes(pdf.output())
+
+    def test_images_are_decoded_once_per_process(self):
+        first, second = self.render(), self.render()
+
+        self.load_logo.assert_called_once()
+        for document in (first, second):
+            # Logo with its alpha mask and the EU emblem, embedded once per document
+            assert document.count(b"/Subtype /Image") == 3
+
+    def test_missing_logo_keeps_layout(self):
+        self.load_logo.side_effect = OSError("unavailable")
+
+        document = self.render()
+
+        assert document.count(b"/Subtype /Image") == 1
+        assert self.pdf_assets.shared_image_info(self.pdf_assets.OPENAGRI_LOGO) is None
+        self.load_logo.assert_called_once()
+
+    def test_logo_is_downloaded_only_when_url_is_set(self):
+        session = MagicMock()
+        session.get.return_value.content = b"logo"
+        for attr, value in (
+            ("REPORTING_LOGO_PATH", "assets/missing_logo.png"),
+            ("REPORTING_LOGO_URL", ""),
+        ):
+            patcher = patch.object(self.pdf_assets.settings, attr, value)
+            self.addCleanup(patcher.stop)
+            patcher.start()
+
+        with patch.object(self.pdf_assets, "get_http_session", return_value=session):
+            with self.assertRaises(FileNotFoundError):
+                self.pdf_assets._load_logo()
+            session.get.assert_not_called()
+
+            url = "https://example.com/logo.png"
+            with patch.object(self.pdf_assets.settings, "REPORTING_LOGO_URL", url):
+                assert self.pdf_assets._load_logo() == b"logo"
+            session.get.assert_called_once()
+
+
+class TestSharedFonts(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from utils import pdf_assets
+
+        self.pdf_assets = pdf_assets
+        patcher = patch.object(pdf_assets, "_font_templates", {})
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+    @staticmethod
+    def document():
+        from fpdf import FPDF
+        from utils import add_fonts
+
+        pdf = FPDF()
+        add_fonts(pdf)
+        return pdf
+
+    def test_fonts_are_parsed_once_and_subset_per_document(self):
+        first, second = self.document(), self.document()
+
+        assert len(self.pdf_assets._font_templates) == 2
+        assert first.fonts["freeserif"].cmap is second.fonts["freeserif"].cmap
+        assert first.fonts["freeserif"].ttfont is not second.fonts["freeserif"].ttfont
+
+        for pdf, text in ((first, "Αγρός"), (second, "Field")):
+            pdf.add_page()
+            pdf.set_font("FreeSerif", "B", 12)
+            pdf.cell(0, 10, text)
+            document = bytes(pdf.output())
+            assert document.count(b"/FontFile2") == 2
+        assert (
+            second.fonts["freeserifB"].subset.get_all_glyph_names()
+            != first.fonts["freeserifB"].subset.get_all_glyph_names()
+        )
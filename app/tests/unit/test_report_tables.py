@@ -0,0 +1,140 @@
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+
+class TestWriteReportTables(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from schemas import ReportFormat
+        from utils import report_tables
+
+        self.ReportFormat = ReportFormat
+        self.report_tables = report_tables
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.base_path = os.path.join(directory.name, "user", "report")
+
+    def tables(self):
+        ReportTable = self.report_tables.ReportTable
+        return [
+            ReportTable(
+                "Operations",
+                ["Date", "Dose"],
+                (row for row in [["01/05/2024", 1.5], ["02/05/2024", None]]),
+            ),
+            ReportTable("Totals", ["Total"], [["1.5"]]),
+        ]
+
+    def test_csv_has_one_block_per_table(self):
+        self.report_tables.write_report_tables(
+            self.tables(), self.base_path, self.ReportFormat.CSV
+        )
+
+        with open(f"{self.base_path}.csv", encoding="utf-8") as f:
+            assert f.read().splitlines() == [
+                "Operations",
+                "Date,Dose",
+                "01/05/2024,1.5",
+                "02/05/2024,",
+                "",
+                "Totals",
+                "Total",
+                "1.5",
+            ]
+
+    def test_json_rows_follow_columns(self):
+        self.report_tables.write_report_tables(
+            self.tables(), self.base_path, self.ReportFormat.JSON
+        )
+
+        with open(f"{self.base_path}.json", encoding="utf-8") as f:
+            assert json.load(f) == {
+                "tables": [
+                    {
+                        "title": "Operations",
+                        "columns": ["Date", "Dose"],
+                        "rows": [["01/05/2024", "1.5"], ["02/05/2024", ""]],
+                    },
+                    {"title": "Totals", "columns": ["Total"], "rows": [["1.5"]]},
+                ]
+            }
+
+    def test_xlsx_has_one_sheet_per_table(self):
+        from openpyxl import load_workbook
+
+        ReportTable = self.report_tables.ReportTable
+        tables = self.tables() + [
+            ReportTable("Crop Data & Observations / 2024 [all parcels]", ["Date"], [])
+        ]
+        self.report_tables.write_report_tables(
+            tables, self.base_path, self.ReportFormat.XLSX
+        )
+
+        with open(f"{self.base_path}.xlsx", "rb") as f:
+            workbook = load_workbook(io.BytesIO(f.read()))
+        assert workbook.sheetnames == [
+            "Operations",
+            "Totals",
+            "Crop Data & Observations   2024",
+        ]
+        assert list(workbook["Operations"].iter_rows(values_only=True)) == [
+            ("Date", "Dose"),
+            ("01/05/2024", "1.5"),
+            ("02/05/2024", None),
+        ]
+        assert os.listdir(os.path.dirname(self.base_path)) == ["report.xlsx"]
+
+
+class TestOperationReportTables(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from utils import irrig_fert_pest_report
+
+        self.report = irrig_fert_pest_report
+        self.fetch_entity = MagicMock(return_value={"area": 30_000})
+        for patcher in (
+            patch.object(
+                irrig_fert_pest_report.settings, "REPORTING_USING_GATEKEEPER", True
+            ),
+            patch.object(irrig_fert_pest_report, "fetch_entity", self.fetch_entity),
+            patch.object(
+                irrig_fert_pest_report, "get_parcel_info", side_effect=AssertionError
+            ),
+        ):
+            self.addCleanup(patcher.stop)
+            patcher.start()
+
+    def test_aggregates_use_parcel_area_without_geocoding(self):
+        from schemas import IrrigationOperation
+
+        operations = [
+            IrrigationOperation.model_validate(
+                {
+                    "@id": f"urn:farmcalendar:Operation:{i}",
+                    "@type": "IrrigationOperation",
+                    "hasStartDatetime": f"2024-05-0{i}T08:00:00",
+                    "hasAppliedAmount": {"numericValue": i, "unit": "m3"},
+                }
+            )
+            for i in (1, 2)
+        ]
+
+        _, aggregates = self.report.operation_report_tables(
+            operations, "token", parcel_id="parcel-1"
+        )
+
+        self.fetch_entity.assert_called_once_with("parcel", "parcel-1", "token")
+        assert aggregates.title == "Aggregates"
+        assert list(aggregates.rows)[0] == ["Volume of applied water", "3.00", "9.00"]
@@ -142,4 +142,40 @@ class TestReportAPI(TestCase):
         mock_bg_task.assert_called_once()
 
         _, kwargs = mock_bg_task.call_args
-        assert kwargs['data'] == file_content
\ No newline at end of file
+        assert kwargs['data'] == file_content
+
+    def test_get_report_endpoint_csv_output(self):
+        from api.api_v1.endpoints import report
+        from fastapi import Response
+        mock_file_response = self.patch(
+            report,
+            "FileResponse",
+            MagicMock(return_value=Response(content=b"a,b", media_type="text/csv"))
+        )
+        self.patch(
+            report.os.path,
+            "exists",
+            MagicMock(side_effect=lambda path: path.endswith(".csv"))
+        )
+        response = self.client.get(f"{TestReportAPI.BASE_URL}/123/", headers={"X-Token": "OK"},
+                          params={"token": TestReportAPI.CORRECT_TOKEN})
+        assert response.status_code == 200
+
+        args, kwargs = mock_file_response.call_args
+        assert kwargs["media_type"] == "text/csv"
+        assert kwargs["filename"] == "123.csv"
+
+    def test_generate_irrigation_report_output_format(self):
+        from api.api_v1.endpoints import report
+        from schemas import ReportFormat
+
+        mock_bg_task = self.patch(report, "process_irrigation_fertilization_data")
+        response = self.client.post(
+            f"{TestReportAPI.BASE_URL}/irrigation-report/",
+            headers={"X-Token": "OK"},
+            params={"token": TestReportAPI.CORRECT_TOKEN, "output_format": "xlsx"}
+        )
+
+        assert response.status_code == 200
+        args, kwargs = mock_bg_task.call_args
+        assert kwargs["output_format"] == ReportFormat.XLSX
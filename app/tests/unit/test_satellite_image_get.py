@@ -0,0 +1,299 @@
+import io
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from PIL import Image
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+
+class TestFetchWmsImage(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from utils import satellite_image_get
+        from utils.disk_cache import DiskLRUCache
+
+        self.satellite_image_get = satellite_image_get
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        png = io.BytesIO()
+        Image.new("RGBA", (8, 6), (20, 120, 40, 255)).save(png, format="PNG")
+        response = MagicMock(
+            content=png.getvalue(), headers={"Content-Type": "image/png"}
+        )
+        self.session = MagicMock()
+        self.session.get.return_value = response
+
+        for attr, value in (
+            ("wms_cache", DiskLRUCache(directory.name, max_bytes=1024 * 1024)),
+            ("get_http_session", MagicMock(return_value=self.session)),
+        ):
+            patcher = patch.object(satellite_image_get, attr, value)
+            self.addCleanup(patcher.stop)
+            patcher.start()
+
+    def test_size_follows_placement_and_dpi(self):
+        with patch.object(self.satellite_image_get.settings, "REPORTING_WMS_DPI", 150):
+            self.satellite_image_get.fetch_wms_image(37.9, 23.7, placement_width_mm=100)
+
+        params = self.session.get.call_args.kwargs["params"]
+        assert (params["WIDTH"], params["HEIGHT"]) == (591, 443)
+
+    def test_image_is_reencoded_and_cached(self):
+        with patch.object(
+            self.satellite_image_get.settings, "REPORTING_WMS_JPEG_QUALITY", 80
+        ):
+            first = self.satellite_image_get.fetch_wms_image(
+                37.9, 23.7, placement_width_mm=100
+            )
+            second = self.satellite_image_get.fetch_wms_image(
+                37.9, 23.7, placement_width_mm=100
+            )
+
+        assert Image.open(io.BytesIO(first)).format == "JPEG"
+        assert first == second
+        assert self.session.get.call_count == 1
+
+    def test_parcel_image_is_prefetched(self):
+        parcel = {"location": {"lat": 37.9, "long": 23.7}}
+        with patch.object(
+            self.satellite_image_get, "fetch_entity", return_value=parcel
+        ) as fetch_entity:
+            image = self.satellite_image_get.prefetch_parcel_image(
+                "parcel-1", "token", placement_width_mm=100
+            )
+            image_bytes = self.satellite_image_get.collect_prefetched_image(image)
+
+        fetch_entity.assert_called_once_with("parcel", "parcel-1", "token")
+        assert image_bytes
+        assert self.session.get.call_count == 1
+
+    def test_image_not_ready_by_deadline_is_skipped(self):
+        from concurrent.futures import Future
+
+        with patch.object(
+            self.satellite_image_get.settings, "REPORTING_WMS_PREFETCH_DEADLINE", 0.01
+        ):
+            assert self.satellite_image_get.collect_prefetched_image(Future()) is None
+
+
+class TestHedgedWmsImage(TestCase):
+
+    PRIMARY = {"url": "https://primary.example/wms", "layer": "a"}
+    SECONDARY = {"url": "https://secondary.example/wms", "layer": "b"}
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from collections import defaultdict
+
+        from utils import satellite_image_get
+        from utils.disk_cache import DiskLRUCache
+
+        self.satellite_image_get = satellite_image_get
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        png = io.BytesIO()
+        Image.new("RGB", (8, 6), (20, 120, 40)).save(png, format="PNG")
+        self.png = png.getvalue()
+        self.session = MagicMock()
+
+        for target, attr, value in (
+            (
+                satellite_image_get,
+                "wms_cache",
+                DiskLRUCache(directory.name, max_bytes=1024 * 1024),
+            ),
+            (
+                satellite_image_get,
+                "get_http_session",
+                MagicMock(return_value=self.session),
+            ),
+            (
+                satellite_image_get,
+                "provider_latencies",
+                defaultdict(satellite_image_get.ProviderLatency),
+            ),
+            (
+                satellite_image_get.settings,
+                "REPORTING_WMS_PROVIDERS",
+                [self.PRIMARY, self.SECONDARY],
+            ),
+            (satellite_image_get.settings, "REPORTING_WMS_HEDGE_DEFAULT_DELAY", 0.05),
+            (satellite_image_get.settings, "REPORTING_WMS_HEDGE_MIN_DELAY", 0.05),
+            (satellite_image_get, "_hedge_executor", ThreadPoolExecutor(max_workers=4)),
+        ):
+            patcher = patch.object(target, attr, value)
+            self.addCleanup(patcher.stop)
+            patcher.start()
+        # Requests left behind by a hedge finish while the test's cache is patched
+        self.addCleanup(satellite_image_get._hedge_executor.shutdown, wait=True)
+
+    def respond(self, delays):
+        import time
+
+        def _get(url, params, timeout):
+            delay = delays[url]
+            if isinstance(delay, Exception):
+                raise delay
+            time.sleep(delay)
+            return MagicMock(content=self.png, headers={"Content-Type": "image/png"})
+
+        self.session.get.side_effect = _get
+
+    def test_slow_provider_is_hedged(self):
+        import time
+
+        self.respond({self.PRIMARY["url"]: 1.0, self.SECONDARY["url"]: 0.0})
+
+        started = time.monotonic()
+        image_bytes = self.satellite_image_get.fetch_wms_image(37.9, 23.7)
+
+        assert image_bytes
+        assert time.monotonic() - started < 0.5
+        called = [c.args[0] for c in self.session.get.call_args_list]
+        assert called == [self.PRIMARY["url"], self.SECONDARY["url"]]
+
+    def test_failing_provider_falls_back(self):
+        import requests
+
+        self.respond(
+            {
+                self.PRIMARY["url"]: requests.exceptions.ConnectionError("down"),
+                self.SECONDARY["url"]: 0.0,
+            }
+        )
+
+        assert self.satellite_image_get.fetch_wms_image(37.9, 23.7)
+        primary = self.satellite_image_get.provider_latencies[
+            (self.PRIMARY["url"], self.PRIMARY["layer"])
+        ]
+        assert primary.failures == 1
+
+    def test_all_providers_failing_raise(self):
+        import requests
+
+        error = requests.exceptions.ConnectionError("down")
+        self.respond({self.PRIMARY["url"]: error, self.SECONDARY["url"]: error})
+
+        with self.assertRaises(self.satellite_image_get.SatelliteImageException):
+            self.satellite_image_get.fetch_wms_image(37.9, 23.7)
+
+    def test_hedge_delay_follows_latency_percentile(self):
+        provider = (self.PRIMARY["url"], self.PRIMARY["layer"])
+        assert self.satellite_image_get.hedge_delay(provider) == 0.05
+
+        for seconds in range(1, 21):
+            self.satellite_image_get.provider_latencies[provider].record(seconds / 10)
+
+        with patch.object(
+            self.satellite_image_get.settings, "REPORTING_WMS_HEDGE_PERCENTILE", 50.0
+        ):
+            assert self.satellite_image_get.hedge_delay(provider) == 1.1
+
+
+class TestFarmMosaic(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from utils import satellite_image_get
+        from utils.disk_cache import DiskLRUCache
+
+        self.satellite_image_get = satellite_image_get
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.session = MagicMock()
+        self.session.get.side_effect = self.respond
+
+        for target, attr, value in (
+            (
+                satellite_image_get,
+                "wms_cache",
+                DiskLRUCache(directory.name, max_bytes=16 * 1024 * 1024),
+            ),
+            (
+                satellite_image_get,
+                "get_http_session",
+                MagicMock(return_value=self.session),
+            ),
+            (
+                satellite_image_get.settings,
+                "REPORTING_WMS_PROVIDERS",
+                [{"url": "https://wms.example", "layer": "a"}],
+            ),
+            (satellite_image_get.settings, "REPORTING_WMS_FARM_MOSAIC", True),
+        ):
+            patcher = patch.object(target, attr, value)
+            self.addCleanup(patcher.stop)
+            patcher.start()
+
+    @staticmethod
+    def respond(url, params, timeout):
+        # West half red, east half blue
+        width, height = params["WIDTH"], params["HEIGHT"]
+        img = Image.new("RGB", (width, height), (255, 0, 0))
+        img.paste((0, 0, 255), (width // 2, 0, width, height))
+        png = io.BytesIO()
+        img.save(png, format="PNG")
+        return MagicMock(content=png.getvalue(), headers={"Content-Type": "image/png"})
+
+    def test_parcel_views_are_cropped_from_one_image(self):
+        locations = [(37.9, 23.70), (37.9, 23.72)]
+        parcels = [
+            {"location": {"lat": lat, "long": lon}, "farm": {"@id": "urn:farm:f1"}}
+            for lat, lon in locations
+        ]
+
+        with patch.object(
+            self.satellite_image_get, "_farm_parcel_locations", return_value=locations
+        ):
+            west, east = (
+                self.satellite_image_get.fetch_parcel_image(
+                    parcel, "token", placement_width_mm=100
+                )
+                for parcel in parcels
+            )
+
+        assert self.session.get.call_count == 1
+        params = self.session.get.call_args.kwargs["params"]
+        assert (params["WIDTH"], params["HEIGHT"]) == (1248, 443)
+        for image_bytes, colour in ((west, (255, 0, 0)), (east, (0, 0, 255))):
+            with Image.open(io.BytesIO(image_bytes)) as img:
+                assert img.size == (591, 443)
+                pixel = img.convert("RGB").getpixel((295, 221))
+            assert all(abs(a - b) < 20 for a, b in zip(pixel, colour))
+
+    def test_large_farm_falls_back_to_single_views(self):
+        locations = [(37.9, 23.7), (38.9, 24.7)]
+        parcel = {
+            "location": {"lat": 37.9, "long": 23.7},
+            "farm": {"@id": "urn:farm:f1"},
+        }
+
+        with patch.object(
+            self.satellite_image_get, "_farm_parcel_locations", return_value=locations
+        ):
+            assert (
+                self.satellite_image_get.fetch_farm_mosaic(
+                    locations, placement_width_mm=100
+                )
+                is None
+            )
+            assert self.satellite_image_get.fetch_parcel_image(
+                parcel, "token", placement_width_mm=100
+            )
+
+        params = self.session.get.call_args.kwargs["params"]
+        assert (params["WIDTH"], params["HEIGHT"]) == (591, 443)
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+
+class TestSingleFlight(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from utils.singleflight import SingleFlight
+
+        self.flights = SingleFlight()
+        self.calls = 0
+        self.started = threading.Event()
+
+    def slow_fetch(self):
+        self.calls += 1
+        self.started.set()
+        time.sleep(0.1)
+        return {"name": "Parcel"}
+
+    def test_concurrent_calls_are_coalesced(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [
+                executor.submit(self.flights.do, "parcel", self.slow_fetch)
+                for _ in range(8)
+            ]
+            results = [f.result() for f in futures]
+
+        assert self.calls == 1
+        assert all(r == {"name": "Parcel"} for r in results)
+        assert len({id(r) for r in results}) == 8
+        assert self.flights.in_flight() == 0
+
+    def test_sequential_calls_are_not_coalesced(self):
+        self.flights.do("parcel", self.slow_fetch)
+        self.flights.do("parcel", self.slow_fetch)
+
+        assert self.calls == 2
+
+    def test_leader_error_is_raised_to_followers(self):
+        def failing_fetch():
+            self.started.set()
+            time.sleep(0.1)
+            raise ValueError("upstream down")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(self.flights.do, "parcel", failing_fetch)
+            self.started.wait()
+            follower = executor.submit(self.flights.do, "parcel", self.slow_fetch)
+
+            self.assertRaises(ValueError, leader.result)
+            self.assertRaises(ValueError, follower.result)
+
+        assert self.calls == 0
+
+    def test_coroutine_joins_a_threaded_flight(self):
+        async def async_fetch():
+            self.calls += 1
+            return {}
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(self.flights.do, "parcel", self.slow_fetch)
+            self.started.wait()
+            result = asyncio.run(self.flights.do_async("parcel", async_fetch))
+
+        assert result == leader.result() == {"name": "Parcel"}
+        assert self.calls == 1
+
+
+class TestRequestCoalescing(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from utils import json_handler
+
+        self.json_handler = json_handler
+
+    def test_identical_gets_share_one_request(self):
+        response = MagicMock()
+        response.json.return_value = {"name": "Farm"}
+
+        def get(*args, **kwargs):
+            time.sleep(0.1)
+            return response
+
+        session = MagicMock()
+        session.get.side_effect = get
+        patcher = patch.object(
+            self.json_handler, "get_http_session", return_value=session
+        )
+        self.addCleanup(patcher.stop)
+        patcher.start()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            same = [
+                executor.submit(
+                    self.json_handler.make_get_request,
+                    "farm/1/",
+                    {"format": "json"},
+                    "t",
+                )
+                for _ in range(3)
+            ]
+            other_scope = executor.submit(
+                self.json_handler.make_get_request, "farm/1/", {"format": "json"}, "t2"
+            )
+            results = [f.result() for f in same + [other_scope]]
+
+        assert results == [{"name": "Farm"}] * 4
+        assert session.get.call_count == 2
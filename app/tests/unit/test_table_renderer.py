@@ -0,0 +1,63 @@
+import os
+from unittest import TestCase
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+
+class TestFastTable(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        from fpdf import FPDF
+        from utils import add_fonts
+        from utils.table_renderer import FastTable
+
+        self.FastTable = FastTable
+        self.pdf = FPDF()
+        add_fonts(self.pdf)
+        self.pdf.set_auto_page_break(auto=True, margin=15)
+        self.pdf.add_page()
+
+    def fill(self, table, rows):
+        row = table.row()
+        for heading in ("Date", "Title", "Details"):
+            row.cell(heading)
+        for values in rows:
+            row = table.row()
+            for value in values:
+                row.cell(value)
+
+    def test_columns_fill_page_width(self):
+        with self.FastTable(self.pdf) as table:
+            self.fill(
+                table,
+                [("01/01/2025", "Irrigation", "Drip line, north field " * 10)] * 3,
+            )
+
+        assert abs(sum(table.col_widths) - self.pdf.epw) < 0.01
+        # The long details column gets the space the short ones don't need
+        assert table.col_widths[2] > table.col_widths[0] + table.col_widths[1]
+        assert table.rows_rendered == 3
+
+    def test_rows_flow_over_pages(self):
+        with self.FastTable(self.pdf, sample_size=10) as table:
+            self.fill(
+                table,
+                [("01/01/2025", f"Operation {i}", "Στο χωράφι") for i in range(300)],
+            )
+
+        assert table.rows_rendered == 300
+        assert self.pdf.page > 1
+        assert self.pdf.y <= self.pdf.page_break_trigger
+
+    def test_long_words_are_broken(self):
+        table = self.FastTable(self.pdf)
+        font = ("", 9)
+
+        lines = table._wrap("a " + "x" * 200, 30, font)
+
+        assert lines[0] == "a"
+        assert "".join(lines[1:]) == "x" * 200
+        assert all(table._width(line, font) <= 30 for line in lines)
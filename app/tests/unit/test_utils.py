@@ -0,0 +1,46 @@
+import os
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from tests.unit.test_reports_endpoints import REQUIRED_ENV_VARS
+
+
+class TestWritePdf(TestCase):
+
+    def setUp(self):
+        for k, v in REQUIRED_ENV_VARS.items():
+            os.environ[k] = v
+
+        import tempfile
+
+        from utils import utils
+
+        self.utils = utils
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_document_is_written_atomically(self):
+        from fpdf import FPDF
+
+        pdf = FPDF()
+        pdf.add_page()
+        path = os.path.join(self.directory, "user", "report.pdf")
+
+        with patch.object(self.utils, "PDF_WRITE_CHUNK_SIZE", 64):
+            self.utils.write_pdf(pdf, path)
+
+        with open(path, "rb") as f:
+            assert f.read() == bytes(pdf.output())
+        assert os.listdir(os.path.dirname(path)) == ["report.pdf"]
+
+    def test_failed_write_leaves_nothing_behind(self):
+        pdf = MagicMock()
+        pdf.output.return_value = bytearray(b"%PDF-1.3")
+        path = os.path.join(self.directory, "report.pdf")
+
+        with patch.object(self.utils.os, "replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.utils.write_pdf(pdf, path)
+
+        assert os.listdir(self.directory) == []
@@ -1,16 +1,18 @@
 import json
 import logging
-import os
 from typing import List, Union
 
 from fastapi import HTTPException
 from fpdf.fonts import FontFace
 
 from core import settings
-from utils import EX, add_fonts, decode_jwt_token, decode_dates_filters, get_parcel_info, FarmInfo
+from utils import EX, add_fonts, decode_jwt_token, decode_dates_filters, get_parcel_info, FarmInfo, write_pdf
+from schemas import ReportFormat
 from schemas.animals import *
 from utils.farm_calendar_report import geolocator
-from utils.json_handler import make_get_request
+from utils.json_handler import iter_paginated, make_get_request
+from utils.job_context import report_job
+from utils.report_tables import ReportTable, render_report_table, write_report_tables
 
 
 logging.basicConfig(level=logging.INFO)
@@ -29,6 +31,59 @@ def parse_animal_data(data: Union[List[dict], str]) -> Optional[List[Animal]]:
         return None
 
 
+def _animal_rows(animals: List[Animal], token: dict[str, str]):
+    for animal in animals:
+        address = ""
+        identifier = ""
+        parcel_id = animal.hasAgriParcel.id if animal.hasAgriParcel else None
+        if parcel_id:
+            parcel = parcel_id.split(":")[3]
+            if parcel:
+                parcel_data, _, identifier = get_parcel_info(
+                    parcel_id.split(":")[-1],
+                    token,
+                    geolocator,
+                    identifier_flag=True,
+                )
+                address = parcel_data.address
+
+        yield [
+            animal.dateCreated.strftime("%d/%m/%Y"),
+            animal.name,
+            animal.description,
+            address,
+            identifier,
+            animal.species,
+            f"{'Male' if animal.sex == 0 else 'Female'} | Castrated: {animal.isCastrated}",
+            animal.birthdate.strftime("%d/%m/%Y"),
+            f"{animal.invalidatedAtTime if animal.invalidatedAtTime else 'N/A'}",
+            f"{animal.isMemberOfAnimalGroup.hasName if animal.isMemberOfAnimalGroup else 'N/A'}",
+        ]
+
+
+def animals_table(animals: List[Animal], token: dict[str, str]) -> ReportTable:
+    """
+    The table of animal records in order of creation, parcel details are
+    looked up while its rows are produced.
+    """
+    return ReportTable(
+        "Animals",
+        [
+            "Date",
+            "Animal",
+            "Description",
+            "Parcel",
+            "Parcel Identifier",
+            "Species",
+            "Sex",
+            "Birthdate",
+            "Invalidated",
+            "Group Member",
+        ],
+        _animal_rows(sorted(animals, key=lambda x: x.dateCreated), token),
+    )
+
+
 def create_pdf_from_animals(
     animals: List[Animal],
     token: dict[str, str],
@@ -168,61 +223,14 @@ def create_pdf_from_animals(
         )
 
     if len(animals) > 1:
-        animals.sort(key=lambda x: x.dateCreated)
         pdf.set_fill_color(0, 255, 255)
-        with pdf.table(text_align="CENTER", padding=0.5) as table:
-            row = table.row()
-            pdf.set_font("FreeSerif", "B", 10)
-            row.cell("Date")
-            row.cell("Animal")
-            row.cell("Description")
-            row.cell("Parcel")
-            row.cell("Parcel Identifier")
-            row.cell("Species")
-            row.cell("Sex")
-            row.cell("Birthdate")
-            row.cell("Invalidated")
-            row.cell("Group Member")
-            pdf.set_fill_color(255, 255, 240)
-            pdf.set_font("FreeSerif", "", 9)
-            for animal in animals:
-                row = table.row()
-                row.cell(animal.dateCreated.strftime("%d/%m/%Y"))
-                row.cell(animal.name)
-                row.cell(animal.description)
-
-                address = ""
-                identifier = ""
-                parcel_id = animal.hasAgriParcel.id if animal.hasAgriParcel else None
-                if parcel_id:
-                    parcel = parcel_id.split(":")[3]
-                    if parcel:
-                        parcel_data, _, identifier = get_parcel_info(
-                            parcel_id.split(":")[-1],
-                            token,
-                            geolocator,
-                            identifier_flag=True,
-                        )
-                        address = parcel_data.address
-
-                row.cell(address)
-                row.cell(identifier)
-                row.cell(animal.species)
-                row.cell(
-                    f"{'Male' if animal.sex == 0 else 'Female'} | Castrated: {animal.isCastrated}",
-                )
-                row.cell(animal.birthdate.strftime("%d/%m/%Y"))
-                row.cell(
-                    f"{animal.invalidatedAtTime if animal.invalidatedAtTime else 'N/A'}"
-                )
-                row.cell(
-                    f"{animal.isMemberOfAnimalGroup.hasName if animal.isMemberOfAnimalGroup else 'N/A'}"
-                )
-                pdf.ln(10)
+        render_report_table(pdf, animals_table(animals, token), padding=0.5)
+        pdf.ln(10)
 
     return pdf
 
 
+@report_job
 def process_animal_data(
     token: dict[str, str],
     pdf_file_name: str,
@@ -231,9 +239,10 @@ def process_animal_data(
     from_date: datetime.date = None,
     to_date: datetime.date = None,
     farm_animal_id: str = None,
+    output_format: ReportFormat = ReportFormat.PDF,
 ) -> None:
     """
-    Process animal data and generate PDF report
+    Process animal data and generate PDF report, or its table in `output_format`
     """
     if farm_animal_id:
         json_data = make_get_request(
@@ -248,7 +257,7 @@ def process_animal_data(
         if params:
             params["format"] = "json"
             decode_dates_filters(params, from_date, to_date)
-            json_data = make_get_request(
+            json_data = iter_paginated(
                 url=f'{settings.REPORTING_FARMCALENDAR_BASE_URL}{settings.REPORTING_FARMCALENDAR_URLS["animals"]}',
                 token=token,
                 params=params,
@@ -259,7 +268,7 @@ def process_animal_data(
                 data = json.loads(data)
                 json_data = data.get("@graph")
             else:
-                json_data = make_get_request(
+                json_data = iter_paginated(
                     url=f'{settings.REPORTING_FARMCALENDAR_BASE_URL}{settings.REPORTING_FARMCALENDAR_URLS["animals"]}',
                     token=token,
                     params={"format": "json"},
@@ -268,6 +277,12 @@ def process_animal_data(
         animals = parse_animal_data(json_data)
     else:
         animals = []
+
+    pdf_dir = f"{settings.PDF_DIRECTORY}{pdf_file_name}"
+    if output_format != ReportFormat.PDF:
+        write_report_tables([animals_table(animals, token)], pdf_dir, output_format)
+        return
+
     try:
         anima_pdf = create_pdf_from_animals(animals, token)
     except Exception:
@@ -275,7 +290,4 @@ def process_animal_data(
             status_code=400, detail="PDF generation of animal report failed."
         )
 
-
-    pdf_dir = f"{settings.PDF_DIRECTORY}{pdf_file_name}"
-    os.makedirs(os.path.dirname(f"{pdf_dir}.pdf"), exist_ok=True)
-    anima_pdf.output(f"{pdf_dir}.pdf")
+    write_pdf(anima_pdf, f"{pdf_dir}.pdf")
@@ -0,0 +1,391 @@
+import hashlib
+import io
+import math
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+from fpdf import FPDF
+
+from core.config import settings
+from utils.disk_cache import DiskLRUCache, content_key
+
+PT_TO_MM = 25.4 / 72
+# Smallest font size of text drawn in PDF charts, in points
+MIN_FONT_SIZE = 6
+
+
+# Identical charts, e.g. of a report generated again, are not rendered twice
+chart_cache = DiskLRUCache(
+    settings.REPORTING_CHART_CACHE_DIR, settings.REPORTING_CHART_CACHE_MAX_BYTES
+)
+
+
+def series_digest(dates: np.ndarray, values: np.ndarray) -> str:
+    """
+    Digest of a chart's data, independent of the dates' precision.
+    """
+    digest = hashlib.sha256(np.asarray(dates, dtype="datetime64[ns]").tobytes())
+    digest.update(np.asarray(values, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def _hex_rgb(color: str) -> Tuple[int, int, int]:
+    color = color.lstrip("#")
+    return int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16)
+
+
+def _nice_ticks(low: float, high: float, max_ticks: int = 6) -> List[float]:
+    """
+    Round tick values (steps of 1, 2, 2.5 or 5 times a power of ten)
+    covering `low` to `high`.
+    """
+    if high <= low:
+        low, high = low - 1, high + 1
+    raw_step = (high - low) / max_ticks
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw_step)
+    first, last = math.floor(low / step), math.ceil(high / step)
+    return [i * step for i in range(first, last + 1)]
+
+
+def _number_label(value: float, decimals: int = 2) -> str:
+    """
+    `value` with thousands separators and at most `decimals` decimals, never
+    in exponent notation.
+    """
+    label = f"{value:,.{decimals}f}".rstrip("0").rstrip(".")
+    return "0" if label == "-0" else label
+
+
+def _day_ticks(low: float, high: float, max_ticks: int = 8) -> List[float]:
+    """
+    Midnights every few days between `low` and `high`, in seconds.
+    """
+    day = 86400
+    step = max(1, math.ceil((high - low) / day / max_ticks)) * day
+    tick = math.ceil(low / day) * day
+    ticks = []
+    while tick <= high:
+        ticks.append(tick)
+        tick += step
+    return ticks
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of the `threshold` points kept by Largest-Triangle-Three-Buckets
+    downsampling of a series sorted by `x`.
+
+    The first and last points are kept, the others are split in
+    `threshold - 2` buckets. From each bucket the point forming the largest
+    triangle with the point kept from the previous bucket and the mean of
+    the next bucket is kept, which preserves peaks and dips. Bucket means
+    are computed at once, each bucket is then a few array operations.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    counts = np.diff(edges)
+    next_x = np.append((np.add.reduceat(x[: n - 1], edges[:-1]) / counts)[1:], x[-1])
+    next_y = np.append((np.add.reduceat(y[: n - 1], edges[:-1]) / counts)[1:], y[-1])
+
+    kept = np.empty(threshold, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        areas = np.abs(
+            (x[a] - next_x[i]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (next_y[i] - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        kept[i + 1] = a
+    return kept
+
+
+class Chart(NamedTuple):
+    """
+    Styled template of a dated line (or bar) chart, one template is shared
+    by every report drawing that chart.
+
+    Charts are drawn in the PDF with vector operators. With
+    `REPORTING_VECTOR_CHARTS` off they are rendered by matplotlib and
+    embedded as PNG images instead, drawn on their own `Figure` and canvas,
+    never through the global `pyplot` state, so reports render them
+    concurrently from any thread. `rcParams` are only read while drawing,
+    they must not be changed at runtime.
+
+    Series longer than `max_points` are downsampled with `lttb` first, so
+    drawing time does not grow with the number of operations. Points are
+    only marked and annotated with their values up to `max_marked_points`.
+    """
+
+    title: str
+    ylabel: str
+    color: str
+    xlabel: str = "Date"
+    kind: str = "line"
+    marker: str = "o"
+    figsize: Tuple[float, float] = (14, 7)
+    title_size: int = 16
+    label_size: int = 12
+    tick_size: int = 10
+    date_format: str = "%d/%m/%Y"
+    annotate: bool = True
+    max_points: int = 500
+    max_marked_points: int = 40
+    font_family: str = "FreeSerif"
+
+    def points(
+        self, dates: Sequence, values: Sequence
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The series as arrays without undated points, downsampled to
+        `max_points` in date order.
+        """
+        dates, values = np.asarray(dates), np.asarray(values)
+        if np.issubdtype(dates.dtype, np.datetime64):
+            dated = ~np.isnat(dates)
+            dates, values = dates[dated], values[dated]
+        if len(values) <= self.max_points:
+            return dates, values
+        order = np.argsort(dates, kind="stable")
+        dates, values = dates[order], values[order]
+        seconds = dates.astype("datetime64[s]").astype("int64")
+        kept = lttb(seconds, values, self.max_points)
+        return dates[kept], values[kept]
+
+    def _bar_width(self, seconds: np.ndarray) -> float:
+        gaps = np.diff(np.unique(seconds))
+        return 0.8 * (gaps.min() if len(gaps) else 86400)
+
+    def figure(self, dates: Sequence, values: Sequence):
+        import matplotlib.dates as mdates
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        dates, values = self.points(dates, values)
+        marked = len(values) <= self.max_marked_points
+        figure = Figure(figsize=self.figsize)
+        FigureCanvasAgg(figure)
+        ax = figure.add_subplot()
+        if self.kind == "bar":
+            seconds = dates.astype("datetime64[s]").astype("int64")
+            ax.bar(
+                dates, values, width=self._bar_width(seconds) / 86400, color=self.color
+            )
+        else:
+            ax.plot(
+                dates, values, marker=self.marker if marked else None, color=self.color
+            )
+
+        if self.annotate and marked:
+            for date, value in zip(dates, values):
+                ax.annotate(
+                    value,
+                    (date, value),
+                    textcoords="offset points",
+                    xytext=(0, 5),
+                    ha="center",
+                )
+
+        ax.set_title(self.title, fontsize=self.title_size)
+        ax.set_ylabel(self.ylabel, fontsize=self.label_size)
+        ax.set_xlabel(self.xlabel, fontsize=self.label_size)
+        ax.grid(True, linestyle="--", alpha=0.6)
+        ax.tick_params(axis="x", labelrotation=45)
+        ax.xaxis.set_major_formatter(mdates.DateFormatter(self.date_format))
+        figure.tight_layout()
+        return figure
+
+    def render(self, dates: Sequence, values: Sequence) -> io.BytesIO:
+        """
+        Draws the chart as a PNG image with matplotlib. Images are cached
+        in `chart_cache` by template, data and matplotlib version.
+        """
+        from matplotlib import __version__ as matplotlib_version
+
+        cache_key = content_key(self, matplotlib_version, series_digest(dates, values))
+        cached = chart_cache.get(cache_key)
+        if cached is not None:
+            return io.BytesIO(cached)
+
+        image_mem = io.BytesIO()
+        self.figure(dates, values).savefig(image_mem, format="png")
+        chart_cache.put(cache_key, image_mem.getvalue())
+        image_mem.seek(0)
+        return image_mem
+
+    def height(self, w: float) -> float:
+        return w * self.figsize[1] / self.figsize[0]
+
+    def draw(
+        self, pdf: FPDF, dates: Sequence, values: Sequence, x: float, y: float, w: float
+    ) -> None:
+        """
+        Draws the chart in the PDF with vector operators, in a box of width
+        `w` and the template's aspect ratio at (`x`, `y`). Font sizes are
+        scaled like those of the PNG shrunk to the same width.
+        """
+        h = self.height(w)
+        scale = w / (self.figsize[0] * 25.4)
+        title_size = max(MIN_FONT_SIZE, self.title_size * scale)
+        label_size = max(MIN_FONT_SIZE, self.label_size * scale)
+        tick_size = max(MIN_FONT_SIZE, self.tick_size * scale)
+
+        dates, values = self.points(dates, values)
+        marked = len(values) <= self.max_marked_points
+        seconds = dates.astype("datetime64[s]").astype("int64").astype(float)
+        values = values.astype(float)
+
+        if len(values):
+            low, high = float(values.min()), float(values.max())
+            if self.kind == "bar":
+                low, high = min(low, 0.0), max(high, 0.0)
+            x_low, x_high = float(seconds.min()), float(seconds.max())
+        else:
+            low, high, x_low, x_high = 0.0, 1.0, 0.0, 0.0
+        y_ticks = _nice_ticks(low, high)
+        y_low, y_high = y_ticks[0], y_ticks[-1]
+        if self.kind == "bar" and len(values):
+            x_pad = self._bar_width(seconds)
+        else:
+            x_pad = (x_high - x_low) * 0.05 or 86400
+        x_low, x_high = x_low - x_pad, x_high + x_pad
+        x_ticks = _day_ticks(x_low, x_high) if len(values) else []
+        x_labels = [
+            np.datetime64(int(tick), "s").astype(object).strftime(self.date_format)
+            for tick in x_ticks
+        ]
+        # Enough decimals for steps like 0.025
+        decimals = max(2, 1 - math.floor(math.log10(y_ticks[1] - y_ticks[0])))
+        y_labels = [_number_label(tick, decimals) for tick in y_ticks]
+
+        with pdf.local_context():
+            pdf.set_font(self.font_family, "", tick_size)
+            tick_h = tick_size * PT_TO_MM
+            y_label_w = max(pdf.get_string_width(label) for label in y_labels)
+            x_label_w = max(
+                (pdf.get_string_width(label) for label in x_labels), default=0
+            )
+
+            left = x + label_size * PT_TO_MM + y_label_w + 4
+            right = x + w - 2
+            top = y + title_size * PT_TO_MM + 4
+            x_labels_h = (x_label_w + tick_h) * math.sqrt(0.5)
+            bottom = y + h - label_size * PT_TO_MM - x_labels_h - 4
+
+            def px(value):
+                return left + (value - x_low) / (x_high - x_low) * (right - left)
+
+            def py(value):
+                return bottom - (value - y_low) / (y_high - y_low) * (bottom - top)
+
+            # Grid and ticks
+            pdf.set_line_width(0.15)
+            pdf.set_draw_color(190)
+            pdf.set_dash_pattern(dash=1, gap=1)
+            for tick in y_ticks:
+                pdf.line(left, py(tick), right, py(tick))
+            for tick in x_ticks:
+                pdf.line(px(tick), top, px(tick), bottom)
+            pdf.set_dash_pattern()
+            pdf.set_draw_color(0)
+            pdf.rect(left, top, right - left, bottom - top)
+
+            for tick, label in zip(y_ticks, y_labels):
+                pdf.line(left - 1, py(tick), left, py(tick))
+                pdf.text(
+                    left - 1.5 - pdf.get_string_width(label),
+                    py(tick) + tick_h / 3,
+                    label,
+                )
+            for tick, label in zip(x_ticks, x_labels):
+                pdf.line(px(tick), bottom, px(tick), bottom + 1)
+                # Rotated by 45 degrees, ending below the tick
+                offset = (pdf.get_string_width(label) + tick_h / 3) * math.sqrt(0.5)
+                with pdf.rotation(45, px(tick) - offset, bottom + 1.5 + offset):
+                    pdf.text(px(tick) - offset, bottom + 1.5 + offset, label)
+
+            # Series
+            points = [(px(s), py(v)) for s, v in zip(seconds, values)]
+            pdf.set_draw_color(*_hex_rgb(self.color))
+            pdf.set_fill_color(*_hex_rgb(self.color))
+            if self.kind == "bar":
+                bar_w = px(x_low + self._bar_width(seconds)) - left
+                base = py(0.0)
+                for bar_x, bar_y in points:
+                    pdf.rect(
+                        bar_x - bar_w / 2,
+                        min(bar_y, base),
+                        bar_w,
+                        abs(base - bar_y),
+                        style="F",
+                    )
+            else:
+                pdf.set_line_width(1.5 * scale * PT_TO_MM)
+                if len(points) > 1:
+                    pdf.polyline(points)
+                if self.marker and marked:
+                    diameter = 6 * scale * PT_TO_MM
+                    for point_x, point_y in points:
+                        pdf.circle(
+                            point_x - diameter / 2,
+                            point_y - diameter / 2,
+                            diameter,
+                            style="F",
+                        )
+
+            if self.annotate and marked:
+                for (point_x, point_y), value in zip(points, values):
+                    label = _number_label(value)
+                    # Below the bars of negative values
+                    label_y = point_y - 1.5
+                    if self.kind == "bar" and value < 0:
+                        label_y = point_y + tick_h + 1.5
+                    pdf.text(point_x - pdf.get_string_width(label) / 2, label_y, label)
+
+            # Title and axis labels
+            pdf.set_font(self.font_family, "", title_size)
+            title_x = (left + right - pdf.get_string_width(self.title)) / 2
+            pdf.text(title_x, y + title_size * PT_TO_MM + 1, self.title)
+            pdf.set_font(self.font_family, "", label_size)
+            pdf.text(
+                (left + right - pdf.get_string_width(self.xlabel)) / 2,
+                y + h - 1,
+                self.xlabel,
+            )
+            label_x = x + label_size * PT_TO_MM
+            label_y = (top + bottom + pdf.get_string_width(self.ylabel)) / 2
+            with pdf.rotation(90, label_x, label_y):
+                pdf.text(label_x, label_y, self.ylabel)
+
+    def place(self, pdf: FPDF, dates: Sequence, values: Sequence, w: float) -> None:
+        """
+        Adds the chart at the current position of the PDF like `FPDF.image`,
+        on a new page when it does not fit.
+        """
+        if not settings.REPORTING_VECTOR_CHARTS:
+            pdf.image(self.render(dates, values), w=w)
+            return
+        h = self.height(w)
+        if pdf.will_page_break(h):
+            pdf.add_page()
+        x, y = pdf.x, pdf.y
+        self.draw(pdf, dates, values, x, y, w)
+        pdf.set_xy(x, y + h)
+
+
+TOTAL_VOLUME_CHART = Chart(
+    title="Total Volume of applied water per irrigation activity",
+    ylabel="Total Volume (m3)",
+    color="#8B8000",
+)
+
+AMOUNT_PER_HECTARE_CHART = Chart(
+    title="Applied amount of water per hectare",
+    ylabel="Dose (m3/Ha)",
+    color="#808080",
+)
@@ -0,0 +1,181 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+import httpx
+import jwt
+
+from core import settings
+from utils.job_context import current_job_memo, job_memoize
+from utils.json_handler import make_async_get_request, make_get_request
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with a per-entry time to live.
+
+    Keys are tuples of (entity_type, entity_id, caller); entity_type is used
+    for per-type hit/miss counters and targeted invalidation.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = defaultdict(int)
+        self._misses = defaultdict(int)
+
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits[key[0]] += 1
+                    return True, value
+                del self._entries[key]
+            self._misses[key[0]] += 1
+            return False, None
+
+    def set(self, key: Tuple, value: Any, ttl: float) -> None:
+        if self.max_size <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(
+        self, entity_type: Optional[str] = None, entity_id: Optional[str] = None
+    ) -> int:
+        """
+        Drops entries matching the given type and/or id (all entries when both
+        are None). Returns the number of dropped entries.
+        """
+        with self._lock:
+            keys = [
+                key
+                for key in self._entries
+                if (entity_type is None or key[0] == entity_type)
+                and (entity_id is None or key[1] == entity_id)
+            ]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def stats(self) -> dict:
+        with self._lock:
+            per_type = defaultdict(int)
+            for key in self._entries:
+                per_type[key[0]] += 1
+            types = set(per_type) | set(self._hits) | set(self._misses)
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": sum(self._hits.values()),
+                "misses": sum(self._misses.values()),
+                "entity_types": {
+                    t: {
+                        "size": per_type[t],
+                        "hits": self._hits[t],
+                        "misses": self._misses[t],
+                    }
+                    for t in sorted(types)
+                },
+            }
+
+
+entity_cache = TTLCache(settings.REPORTING_ENTITY_CACHE_MAX_SIZE)
+
+
+def _caller_identity(token) -> str:
+    """
+    Cached entities are scoped per user, so one user never gets another user's
+    Farm Calendar data. Falls back to a token digest when there is no user id.
+    """
+    try:
+        return str(jwt.decode(token, options={"verify_signature": False})["user_id"])
+    except Exception:
+        return hashlib.sha256(str(token).encode()).hexdigest()
+
+
+def _ttl(entity_type: str) -> float:
+    return settings.REPORTING_ENTITY_CACHE_TTLS.get(entity_type, 0)
+
+
+def _entity_url(entity_type: str, entity_id: str) -> str:
+    return f"{settings.REPORTING_FARMCALENDAR_BASE_URL}{settings.REPORTING_FARMCALENDAR_URLS[entity_type]}{entity_id}/"
+
+
+def get_cached(
+    entity_type: str, entity_id: str, token, loader: Callable[[], Any]
+) -> Any:
+    """
+    Returns the cached value for (entity_type, entity_id, caller) or calls
+    `loader` and caches its result. Empty results are not cached across
+    reports, but are remembered for the rest of the current report job.
+    Cached values are shared between reports and must be treated as read-only.
+    """
+    key = (entity_type, entity_id, _caller_identity(token))
+
+    def _load():
+        hit, value = entity_cache.get(key)
+        if hit:
+            return value
+        value = loader()
+        if value:
+            entity_cache.set(key, value, _ttl(entity_type))
+        return value
+
+    return job_memoize(key, _load)
+
+
+def fetch_entity(entity_type: str, entity_id: str, token) -> Optional[dict]:
+    """
+    Fetches a single Farm Calendar entity (e.g. "parcel", "farm", "pest",
+    "machines", "activity_types", "crops") through the entity cache.
+    """
+    return get_cached(
+        entity_type,
+        entity_id,
+        token,
+        lambda: make_get_request(
+            url=_entity_url(entity_type, entity_id),
+            token=token,
+            params={"format": "json"},
+        ),
+    )
+
+
+async def fetch_entity_async(
+    client: httpx.AsyncClient, entity_type: str, entity_id: str, token
+) -> Optional[dict]:
+    """
+    Async counterpart of `fetch_entity`, to be used inside `run_concurrently`.
+    """
+    key = (entity_type, entity_id, _caller_identity(token))
+    memo = current_job_memo()
+    if memo is not None:
+        hit, value = memo.get(key)
+        if hit:
+            return value
+    hit, value = entity_cache.get(key)
+    if not hit:
+        value = await make_async_get_request(
+            client,
+            url=_entity_url(entity_type, entity_id),
+            token=token,
+            params={"format": "json"},
+        )
+        if value:
+            entity_cache.set(key, value, _ttl(entity_type))
+    if memo is not None:
+        memo.set(key, value)
+    return value
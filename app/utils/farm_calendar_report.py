@@ -2,13 +2,13 @@ import datetime
 import itertools
 import json
 import logging
-import os
-from typing import Union
+from typing import List, Union
 from fastapi import HTTPException
 
 from core import settings
 from fpdf import FontFace
 from fpdf.enums import VAlign
+from schemas import ReportFormat
 from schemas.compost import *
 from utils import (
     EX,
@@ -16,12 +16,17 @@ from utils import (
     decode_dates_filters,
     get_parcel_info,
     get_farm_operation_data,
+    get_farm_operations_data,
     FarmInfo, display_pdf_parcel_details,
+    write_pdf,
 )
-from utils.json_handler import make_get_request
-from geopy.geocoders import Nominatim
+from utils.entity_cache import fetch_entity, get_cached
+from utils.json_handler import fetch_paginated, make_get_request
+from utils.job_context import report_job
+from utils.report_tables import ReportTable, render_report_table, write_report_tables
+from utils.geocoding import geocoding_service
 
-geolocator = Nominatim(user_agent="reporting_open_agri_app", timeout=5)
+geolocator = geocoding_service
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -54,6 +59,164 @@ class FarmCalendarData:
             )
 
 
+def _operation_rows(operations: List[Operation], token: dict[str, str], parcel_defined: bool):
+    for operation in operations:
+        row = [
+            operation.title,
+            operation.details,
+            f"{operation.hasStartDatetime.strftime('%d/%m/%Y') if operation.hasStartDatetime else 'N/A'}",
+            f"{operation.hasEndDatetime.strftime('%d/%m/%Y') if operation.hasEndDatetime else 'N/A'} ",
+            operation.responsibleAgent,
+        ]
+        machinery_ids = ""
+        address, farm = (
+            "",
+            FarmInfo(
+                description="",
+                administrator="",
+                vatID="",
+                name="",
+                municipality="",
+                contactPerson="",
+            ),
+        )
+        if operation.usesAgriculturalMachinery:
+            machinery_ids = ", ".join(
+                [
+                    machinery.get("@id").split(":")[3]
+                    for machinery in operation.usesAgriculturalMachinery
+                ]
+            )
+            agr_mach_id = (
+                operation.usesAgriculturalMachinery[0]
+                .get("@id", "N/A:N/A")
+                .split(":")[-1]
+            )
+            agr_resp = fetch_entity("machines", agr_mach_id, token)
+            if agr_resp:
+                parcel_id = (
+                    agr_resp.get("hasAgriParcel", {})
+                    .get("@id", "N/A:N/A")
+                    .split(":")[-1]
+                )
+                parcel_data, farm = get_parcel_info(
+                    parcel_id, token, geolocator
+                )
+                address = parcel_data.address
+
+        row.append(f"{machinery_ids}")
+        if not parcel_defined:
+            row.append(address)
+            row.append(f"Name: {farm.name} | Municipality: {farm.municipality}")
+        operation = operations[0]
+        cp = (
+            operation.isOperatedOn.get("@id").split(":")[3]
+            if operation.isOperatedOn
+            else "Empty Pile Value"
+        )
+        row.append(cp)
+        row.append(operation.responsibleAgent or "")
+        yield row
+
+
+def operations_table(
+    calendar_data: FarmCalendarData, token: dict[str, str], parcel_defined: bool
+) -> ReportTable:
+    """
+    The operations in chronological order. Parcel columns are left out when
+    the report is about one parcel.
+    """
+    columns = ["Title", "Details", "Start", "End", "Agent", "Machinery IDs"]
+    if not parcel_defined:
+        columns += ["Parcel", "Farm"]
+    columns += ["Compost Pile", "Responsible Agent"]
+    operations = sorted(calendar_data.operations, key=lambda x: x.hasStartDatetime)
+    return ReportTable(
+        "Operations", columns, _operation_rows(operations, token, parcel_defined)
+    )
+
+
+_DATA_TYPES = {
+    "irrigated": "IrrigationOperation",
+    "turned": "CompostTurningOperation",
+    "raw": "AddRawMaterialOperation",
+    "observed": "Observation",
+}
+
+
+def _data_rows(merged_data: list):
+    for x in merged_data:
+        start_time = (
+            x.hasStartDatetime.strftime("%d/%m/%Y")
+            if x.hasStartDatetime
+            else x.phenomenonTime.strftime("%d/%m/%Y")
+        )
+        end_time = (
+            x.hasEndDatetime.strftime("%d/%m/%Y") if x.hasEndDatetime else ""
+        )
+        period = f"{start_time} - {end_time}"
+
+        irrigated = _DATA_TYPES.get("irrigated") == x.type
+        raw = _DATA_TYPES.get("raw") == x.type
+        observed = _DATA_TYPES.get("observed") == x.type
+        turned = _DATA_TYPES.get("turned") == x.type
+
+        value = ""
+        prop = ""
+
+        if irrigated:
+            value = (
+                f"{x.hasAppliedAmount.numericValue} ({x.hasAppliedAmount.unit})"
+            )
+        if raw and x.hasCompostMaterial:
+            for qv in x.hasCompostMaterial:
+                value = f"{qv.quantityValue.numericValue} ({qv.quantityValue.unit})"
+                prop = qv.typeName
+            if len(x.hasCompostMaterial) > 1:
+                # One row per material
+                for qv in x.hasCompostMaterial:
+                    yield [
+                        period,
+                        "",
+                        "",
+                        f"{qv.quantityValue.numericValue} ({qv.quantityValue.unit})",
+                        qv.typeName,
+                        x.details,
+                    ]
+                continue
+
+        if observed:
+            prop = x.observedProperty
+            value = f"{x.hasResult.hasValue} ({x.hasResult.unit})"
+
+        yield [
+            period,
+            "Yes" if irrigated else "",
+            "Yes" if turned else "",
+            value,
+            prop,
+            x.details,
+        ]
+
+
+def data_table(calendar_data: FarmCalendarData) -> ReportTable:
+    """
+    Observations and added materials in chronological order, one row per
+    material of operations adding several.
+    """
+    merged_data = calendar_data.observations + calendar_data.materials
+    merged_data.sort(
+        key=lambda item: getattr(item, "hasStartDatetime")
+        or getattr(item, "phenomenonTime", None)
+    )
+    return ReportTable(
+        "Data Table",
+        ["Start - End", "Is Irrigated", "Is Turned", "Values info", "Property", "Details"],
+        _data_rows(merged_data),
+        styles=[None, "B", "B"],
+    )
+
+
 def create_farm_calendar_pdf(
     calendar_data: FarmCalendarData, token: dict[str, str], parcel_id: str | None = None
 ) -> EX:
@@ -105,11 +268,7 @@ def create_farm_calendar_pdf(
             parcel_id = operation.hasAgriParcel.get("@id", None)
 
         elif agr_mach_id:
-            agr_resp = make_get_request(
-                url=f'{settings.REPORTING_FARMCALENDAR_BASE_URL}{settings.REPORTING_FARMCALENDAR_URLS["machines"]}{agr_mach_id}/',
-                token=token,
-                params={"format": "json"},
-            )
+            agr_resp = fetch_entity("machines", agr_mach_id, token)
             parcel_id = (
                 agr_resp.get("hasAgriParcel", {}).get("@id", None)
                 if agr_resp and agr_mach_id
@@ -210,102 +369,15 @@ def create_farm_calendar_pdf(
     pdf.set_fill_color(0, 255, 255)
 
     if len(calendar_data.operations) > 1:
-        calendar_data.operations.sort(key=lambda x: x.hasStartDatetime)
         pdf.set_font("FreeSerif", "B", 12)
         pdf.set_x(15)
         pdf.cell(0, 10, "Operations", ln=True, align='L')
         pdf.ln(5)
-        with pdf.table(text_align="CENTER", padding=0.5) as table:
-
-            row = table.row()
-            pdf.set_font("FreeSerif", "B", 10)
-            row.cell("Title")
-            row.cell("Details")
-            row.cell("Start")
-            row.cell("End")
-            row.cell("Agent")
-            row.cell("Machinery IDs")
-            if not parcel_defined:
-                row.cell("Parcel")
-                row.cell("Farm")
-            row.cell("Compost Pile")
-            row.cell("Responsible Agent")
-            pdf.set_font("FreeSerif", "", 9)
-            pdf.set_fill_color(255, 255, 240)
-            for operation in calendar_data.operations:
-                row = table.row()
-                row.cell(operation.title)
-                row.cell(operation.details)
-                row.cell(
-                    f"{operation.hasStartDatetime.strftime('%d/%m/%Y') if operation.hasStartDatetime else 'N/A'}",
-                )
-                row.cell(
-                    f"{operation.hasEndDatetime.strftime('%d/%m/%Y') if operation.hasEndDatetime else 'N/A'} ",
-                )
-                row.cell(operation.responsibleAgent)
-                machinery_ids = ""
-                address, farm = (
-                    "",
-                    FarmInfo(
-                        description="",
-                        administrator="",
-                        vatID="",
-                        name="",
-                        municipality="",
-                        contactPerson="",
-                    ),
-                )
-                if operation.usesAgriculturalMachinery:
-                    machinery_ids = ", ".join(
-                        [
-                            machinery.get("@id").split(":")[3]
-                            for machinery in operation.usesAgriculturalMachinery
-                        ]
-                    )
-                    agr_mach_id = (
-                        operation.usesAgriculturalMachinery[0]
-                        .get("@id", "N/A:N/A")
-                        .split(":")[-1]
-                    )
-                    agr_resp = make_get_request(
-                        url=f'{settings.REPORTING_FARMCALENDAR_BASE_URL}{settings.REPORTING_FARMCALENDAR_URLS["machines"]}{agr_mach_id}/',
-                        token=token,
-                        params={"format": "json"},
-                    )
-                    if agr_resp:
-                        parcel_id = (
-                            agr_resp.get("hasAgriParcel", {})
-                            .get("@id", "N/A:N/A")
-                            .split(":")[-1]
-                        )
-                        parcel_data, farm = get_parcel_info(
-                            parcel_id, token, geolocator
-                        )
-                        address = parcel_data.address
-
-                row.cell(f"{machinery_ids}")
-                if not parcel_defined:
-                    row.cell(address)
-                    farm_local = f"Name: {farm.name} | Municipality: {farm.municipality}"
-                    row.cell(farm_local)
-                operation = calendar_data.operations[0]
-                cp = (
-                    operation.isOperatedOn.get("@id").split(":")[3]
-                    if operation.isOperatedOn
-                    else "Empty Pile Value"
-                )
-                row.cell(cp)
-                row.cell(
-                    operation.responsibleAgent
-                ) if operation.responsibleAgent else row.cell("")
-
-    merged_data = calendar_data.observations + calendar_data.materials
-
-    if merged_data:
-        merged_data.sort(
-            key=lambda item: getattr(item, "hasStartDatetime")
-            or getattr(item, "phenomenonTime", None)
+        render_report_table(
+            pdf, operations_table(calendar_data, token, parcel_defined), padding=0.5
         )
+
+    if calendar_data.observations or calendar_data.materials:
         pdf.ln()
         pdf.set_fill_color(0, 255, 255)
 
@@ -313,112 +385,14 @@ def create_farm_calendar_pdf(
         pdf.set_x(15)
         pdf.cell(0, 10, "Data Table", ln=True)
         pdf.ln(5)
-        types = {
-            "irrigated": "IrrigationOperation",
-            "turned": "CompostTurningOperation",
-            "raw": "AddRawMaterialOperation",
-            "observed": "Observation",
-        }
-
-        with pdf.table(text_align="CENTER", padding=0.5, v_align=VAlign.M) as table:
-            row = table.row()
-            pdf.set_font("FreeSerif", "B", 10)
-            row.cell("Start - End")
-            row.cell("Is Irrigated")
-            row.cell("Is Turned")
-            row.cell("Values info")
-            row.cell("Property")
-            row.cell("Details")
-            pdf.set_font("FreeSerif", "", 9)
-            for x in merged_data:
-                row = table.row()
-                pdf.set_fill_color(255, 255, 240)
-
-                start_time = (
-                    x.hasStartDatetime.strftime("%d/%m/%Y")
-                    if x.hasStartDatetime
-                    else x.phenomenonTime.strftime("%d/%m/%Y")
-                )
-                end_time = (
-                    x.hasEndDatetime.strftime("%d/%m/%Y") if x.hasEndDatetime else ""
-                )
-                row.cell(f"{start_time} - {end_time}")
-
-                irrigated = types.get("irrigated") == x.type
-                raw = types.get("raw") == x.type
-                observed = types.get("observed") == x.type
-                turned = types.get("turned") == x.type
-
-                value = ""
-                prop = ""
-
-                generate_inner_row = False
-                if irrigated:
-                    value = (
-                        f"{x.hasAppliedAmount.numericValue} ({x.hasAppliedAmount.unit})"
-                    )
-                if raw:
-                    if x.hasCompostMaterial:
-                        for i, qv in enumerate(x.hasCompostMaterial):
-                            tmp_val = f"{qv.quantityValue.numericValue} ({qv.quantityValue.unit})"
-                            value = tmp_val
-                            prop = qv.typeName
-                            if len(x.hasCompostMaterial) > 1:
-                                if i < (len(x.hasCompostMaterial)):
-                                    if i == 0:
-                                        # Finish current row
-                                        row.cell()
-                                        row.cell()
-                                        row.cell(tmp_val)
-                                        row.cell(qv.typeName)
-                                        row.cell(x.details)
-                                    else:
-                                        # Create new row
-                                        row = table.row()
-                                        start_time = (
-                                            x.hasStartDatetime.strftime("%d/%m/%Y")
-                                            if x.hasStartDatetime
-                                            else x.phenomenonTime.strftime("%d/%m/%Y")
-                                        )
-                                        end_time = (
-                                            x.hasEndDatetime.strftime("%d/%m/%Y")
-                                            if x.hasEndDatetime
-                                            else ""
-                                        )
-                                        row.cell(f"{start_time} - {end_time}")
-                                        row.cell()
-                                        row.cell()
-                                        row.cell(tmp_val)
-                                        row.cell(qv.typeName)
-                                        row.cell(x.details)
-                                        generate_inner_row = True
-
-                if not generate_inner_row:
-                    if observed:
-                        prop = x.observedProperty
-                        value = f"{x.hasResult.hasValue} ({x.hasResult.unit})"
-
-                    ir = "Yes" if irrigated else ""
-                    tr = "Yes" if turned else ""
-                    if ir == "Yes":
-                        pdf.set_font("FreeSerif", "B", 9)
-                    row.cell(ir)
-                    pdf.set_font("FreeSerif", "", 9)
-
-                    if tr == "Yes":
-                        pdf.set_font("FreeSerif", "B", 9)
-                    row.cell(tr)
-                    pdf.set_font("FreeSerif", "", 9)
-
-                    row.cell(value)
-                    row.cell(prop)
-                    row.cell(x.details)
+        render_report_table(pdf, data_table(calendar_data), padding=0.5)
 
     pdf.ln(10)
 
     return pdf
 
 
+@report_job
 def process_farm_calendar_data(
     token: dict[str, str],
     pdf_file_name: str,
@@ -428,9 +402,10 @@ def process_farm_calendar_data(
     from_date: datetime.date = None,
     to_date: datetime.date = None,
     parcel_id: str = None,
+    output_format: ReportFormat = ReportFormat.PDF,
 ) -> None:
     """
-    Process farm calendar data and generate PDF report
+    Process farm calendar data and generate PDF report, or its tables in `output_format`
     """
     try:
         if not data:
@@ -453,10 +428,16 @@ def process_farm_calendar_data(
                 if calendar_activity_type:
                     if calendar_activity_type.strip() != "Compost Operation":
                         params["name"] = calendar_activity_type
-                        farm_activity_type_info = make_get_request(
-                            url=f'{settings.REPORTING_FARMCALENDAR_BASE_URL}{settings.REPORTING_FARMCALENDAR_URLS["activity_types"]}',
-                            token=token,
-                            params=params,
+                        name_params = params.copy()
+                        farm_activity_type_info = get_cached(
+                            "activity_types",
+                            f"name={calendar_activity_type}",
+                            token,
+                            lambda: make_get_request(
+                                url=f'{settings.REPORTING_FARMCALENDAR_BASE_URL}{settings.REPORTING_FARMCALENDAR_URLS["activity_types"]}',
+                                token=token,
+                                params=name_params,
+                            ),
                         )
 
                         del params["name"]
@@ -466,7 +447,7 @@ def process_farm_calendar_data(
                                 "@id"
                             ].split(":")[3]
                             decode_dates_filters(params, from_date, to_date)
-                            observations = make_get_request(
+                            observations = fetch_paginated(
                                 url=obs_url,
                                 token=token,
                                 params=params,
@@ -474,22 +455,20 @@ def process_farm_calendar_data(
                     else:
                         if parcel_id:
                             params["parcel"] = parcel_id
-                        operations = make_get_request(
+                        operations = fetch_paginated(
                             url=operation_url,
                             token=token,
                             params=params,
                         )
                         if operations:
-                            for o in operations:
-                                id = o["@id"].split(":")[3]
-                                decode_dates_filters(params, from_date, to_date)
-                                get_farm_operation_data(
-                                    id=id,
-                                    materials=materials,
-                                    params=params,
-                                    observations=observations,
-                                    token=token,
-                                )
+                            decode_dates_filters(params, from_date, to_date)
+                            get_farm_operations_data(
+                                ids=[o["@id"].split(":")[3] for o in operations],
+                                materials=materials,
+                                params=params,
+                                observations=observations,
+                                token=token,
+                            )
 
             else:
                 operation_url = f"{operation_url}{operation_id}/"
@@ -508,10 +487,8 @@ def process_farm_calendar_data(
                     if not calendar_activity_type:
                         id = operations[0]["activityType"]["@id"].split(":")[3]
                         if id:
-                            farm_activity_type_info = make_get_request(
-                                url=f'{settings.REPORTING_FARMCALENDAR_BASE_URL}{settings.REPORTING_FARMCALENDAR_URLS["activity_types"]}{id}/',
-                                token=token,
-                                params=params,
+                            farm_activity_type_info = fetch_entity(
+                                "activity_types", id, token
                             )
                             calendar_activity_type = farm_activity_type_info["name"]
 
@@ -567,10 +544,18 @@ def process_farm_calendar_data(
                     materials=[],
                 )
 
-        pdf = create_farm_calendar_pdf(calendar_data, token, parcel_id)
         pdf_dir = f"{settings.PDF_DIRECTORY}{pdf_file_name}"
-        os.makedirs(os.path.dirname(f"{pdf_dir}.pdf"), exist_ok=True)
-        pdf.output(f"{pdf_dir}.pdf")
+        if output_format != ReportFormat.PDF:
+            parcel_defined = bool(parcel_id) and len(calendar_data.operations) > 1
+            tables = [
+                operations_table(calendar_data, token, parcel_defined),
+                data_table(calendar_data),
+            ]
+            write_report_tables(tables, pdf_dir, output_format)
+            return
+
+        pdf = create_farm_calendar_pdf(calendar_data, token, parcel_id)
+        write_pdf(pdf, f"{pdf_dir}.pdf")
 
     except Exception as e:
         raise HTTPException(
@@ -1,13 +1,19 @@
+import asyncio
 import datetime
 import io
 import logging
-import os
-
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+import httpx
 from fastapi import HTTPException
-from geopy.geocoders import Nominatim
 
 from core import settings
-from schemas import IrrigationOperation, FertilizationOperation, CropProtectionOperation
+from schemas import IrrigationOperation, FertilizationOperation, CropProtectionOperation, ReportFormat
 from schemas.compost import CropObservation
 from utils import (
     EX,
@@ -15,25 +21,44 @@ from utils import (
     decode_dates_filters,
     display_pdf_parcel_details,
     FarmInfo,
+    merge_pdfs,
+    write_pdf,
 )
+from utils.entity_cache import fetch_entity_async
 from utils.generate_aggregation_data import get_pest_from_obj
-from utils.json_handler import make_get_request
-from utils.satellite_image_get import fetch_wms_image, SatelliteImageException
+from utils.json_handler import (
+    fetch_paginated_async,
+    make_async_get_request,
+    run_concurrently,
+)
+from utils.satellite_image_get import (
+    collect_prefetched_image,
+    fetch_wms_image,
+    prefetch_parcel_image,
+    SatelliteImageException,
+)
+from utils.job_context import report_job
+from utils.report_tables import ReportTable, render_report_table, write_report_tables
+from utils.geocoding import geocoding_service
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-geolocator = Nominatim(user_agent="reporting_open_agri_app", timeout=5)
+geolocator = geocoding_service
 
+SATELLITE_IMAGE_WIDTH_MM = 120
 
-def _fetch_list(url_key: str, token: str, params: dict) -> list:
-    """Generic list fetch from farmcalendar. Returns [] on any failure."""
-    result = make_get_request(
+
+async def _fetch_list(
+    client: httpx.AsyncClient, url_key: str, token: str, params: dict
+) -> list:
+    """Generic paginated list fetch from farmcalendar. Returns [] on any failure."""
+    return await fetch_paginated_async(
+        client,
         url=f"{settings.REPORTING_FARMCALENDAR_BASE_URL}{settings.REPORTING_FARMCALENDAR_URLS[url_key]}",
         token=token,
         params=params,
     )
-    return result if isinstance(result, list) else []
 
 
 def _base_params(parcel_id: str, from_date, to_date) -> dict:
@@ -44,21 +69,24 @@ def _base_params(parcel_id: str, from_date, to_date) -> dict:
     return params
 
 
-def _fetch_crops_for_parcel(parcel_id: str, token: str) -> list:
+async def _fetch_crop(client: httpx.AsyncClient, crop_uuid: str, token: str):
+    crop_data = await fetch_entity_async(client, "crops", crop_uuid, token)
+    return crop_data if crop_data and isinstance(crop_data, dict) else None
+
+
+async def _fetch_crops_for_parcel(
+    client: httpx.AsyncClient, parcel_id: str, token: str
+) -> list:
     """Fetch all crops linked via hasAgriCrop on the parcel. Returns [] on any failure."""
     if not parcel_id:
         return []
-    parcel_data = make_get_request(
-        url=f'{settings.REPORTING_FARMCALENDAR_BASE_URL}{settings.REPORTING_FARMCALENDAR_URLS["parcel"]}{parcel_id}/',
-        token=token,
-        params={"format": "json"},
-    )
+    parcel_data = await fetch_entity_async(client, "parcel", parcel_id, token)
     if not parcel_data or not isinstance(parcel_data, dict):
         return []
     has_agri_crop = parcel_data.get("hasAgriCrop") or []
     if not has_agri_crop:
         return []
-    crops = []
+    crop_uuids = []
     for crop_ref in has_agri_crop:
         crop_id_full = (crop_ref or {}).get("@id", "")
         if not crop_id_full:
@@ -66,17 +94,16 @@ def _fetch_crops_for_parcel(parcel_id: str, token: str) -> list:
         crop_uuid = crop_id_full.split(":")[-1]
         if not crop_uuid:
             continue
-        crop_data = make_get_request(
-            url=f'{settings.REPORTING_FARMCALENDAR_BASE_URL}{settings.REPORTING_FARMCALENDAR_URLS["crops"]}{crop_uuid}/',
-            token=token,
-            params={"format": "json"},
-        )
-        if crop_data and isinstance(crop_data, dict):
-            crops.append(crop_data)
-    return crops
+        crop_uuids.append(crop_uuid)
+    crops = await asyncio.gather(
+        *(_fetch_crop(client, crop_uuid, token) for crop_uuid in crop_uuids)
+    )
+    return [crop for crop in crops if crop]
 
 
-def _fetch_forecasting(token: str, parcel_id: str) -> list:
+async def _fetch_forecasting(
+    client: httpx.AsyncClient, token: str, parcel_id: str
+) -> list:
     """Fetch pest-risk forecasting data. Returns [] when not configured or unavailable."""
     if not settings.REPORTING_FORECASTING_BASE_URL:
         return []
@@ -84,7 +111,8 @@ def _fetch_forecasting(token: str, parcel_id: str) -> list:
     if parcel_id:
         params["parcel"] = parcel_id
     pest_risk_path = settings.REPORTING_FORECASTING_URLS.get("pest_risk", "/PestRisk/")
-    result = make_get_request(
+    result = await make_async_get_request(
+        client,
         url=f"{settings.REPORTING_FORECASTING_BASE_URL}{pest_risk_path}",
         token=token,
         params=params,
@@ -92,6 +120,22 @@ def _fetch_forecasting(token: str, parcel_id: str) -> list:
     return result if isinstance(result, list) else []
 
 
+class NotebookSection(NamedTuple):
+    """
+    A part of the field notebook, drawn by `render(pdf, **kwargs)`.
+    Sections with a title get the next section number, sections not starting
+    a new page continue the page of the previous one.
+    `local` sections need this process (network access, pending downloads)
+    and are never rendered in a worker process.
+    """
+
+    render: Callable[..., None]
+    kwargs: dict
+    title: Optional[str] = None
+    new_page: bool = True
+    local: bool = False
+
+
 def _section_header(pdf: EX, number: str, title: str) -> None:
     pdf.ln(4)
     y = pdf.get_y()
@@ -99,6 +143,7 @@ def _section_header(pdf: EX, number: str, title: str) -> None:
     pdf.line(pdf.l_margin, y, pdf.w - pdf.r_margin, y)
     pdf.set_font("FreeSerif", "B", 13)
     pdf.set_x(pdf.l_margin + 2)
+    pdf.start_section(f"{number}. {title}")
     pdf.cell(0, 10, f"{number}. {title}", ln=True)
     pdf.ln(2)
 
@@ -115,6 +160,25 @@ def _no_data(pdf: EX, msg: str) -> None:
     pdf.cell(0, 8, msg, ln=True)
 
 
+def crops_table(crops: list) -> ReportTable:
+    rows = []
+    for crop in crops:
+        crop_species = crop.get("cropSpecies") or {}
+        rows.append([
+            crop.get("name") or "\u2014",
+            crop.get("description") or "\u2014",
+            str(crop["status"]) if crop.get("status") is not None else "\u2014",
+            crop.get("growth_stage") or "\u2014",
+            crop_species.get("name") or "\u2014",
+            crop_species.get("variety") or "\u2014",
+        ])
+    return ReportTable(
+        "Crops",
+        ["Name", "Description", "Status", "Growth Stage", "Species", "Variety"],
+        rows,
+    )
+
+
 def _render_crops_section(pdf: EX, crops: list) -> None:
     pdf.ln(3)
     pdf.set_font("FreeSerif", "B", 11)
@@ -123,60 +187,10 @@ def _render_crops_section(pdf: EX, crops: list) -> None:
     if not crops:
         _no_data(pdf, "No crops associated with this parcel.")
         return
-    pdf.set_font("FreeSerif", "B", 10)
-    with pdf.table(text_align="CENTER") as table:
-        row = table.row()
-        row.cell("Name")
-        row.cell("Description")
-        row.cell("Status")
-        row.cell("Growth Stage")
-        row.cell("Species")
-        row.cell("Variety")
-        pdf.set_font("FreeSerif", "", 9)
-        for crop in crops:
-            crop_species = crop.get("cropSpecies") or {}
-            row = table.row()
-            row.cell(crop.get("name") or "\u2014")
-            row.cell(crop.get("description") or "\u2014")
-            row.cell(str(crop["status"]) if crop.get("status") is not None else "\u2014")
-            row.cell(crop.get("growth_stage") or "\u2014")
-            row.cell(crop_species.get("name") or "\u2014")
-            row.cell(crop_species.get("variety") or "\u2014")
-
-
-def create_field_notebook_pdf(
-    parcel_id: str,
-    token: str,
-    from_date=None,
-    to_date=None,
-    irrigation_ops: list = None,
-    fertilization_ops: list = None,
-    pesticide_ops: list = None,
-    observations: list = None,
-    forecasting_data: list = None,
-    crops: list = None,
-    cert_type: str = None,
-    cert_number: str = None,
-    cert_issuing_body: str = None,
-    cert_issue_date: str = None,
-    cert_expiry_date: str = None,
-    cert_notes: str = None,
-    include_irrigation: bool = True,
-    include_fertilization: bool = True,
-    include_pesticides: bool = True,
-    include_observations: bool = True,
-) -> EX:
-    irrigation_ops = irrigation_ops or []
-    fertilization_ops = fertilization_ops or []
-    pesticide_ops = pesticide_ops or []
-    observations = observations or []
-    forecasting_data = forecasting_data or []
-    crops = crops or []
+    render_report_table(pdf, crops_table(crops))
 
-    pdf = EX()
-    add_fonts(pdf)
-    pdf.set_auto_page_break(auto=True, margin=20)
-    pdf.add_page()
+
+def _render_title(pdf: EX, from_date=None, to_date=None) -> None:
     pdf.ln(2)
 
     today = datetime.datetime.now().strftime("%d/%m/%Y")
@@ -195,8 +209,14 @@ def create_field_notebook_pdf(
     y = pdf.get_y()
     pdf.line(pdf.l_margin, y, pdf.w - pdf.r_margin, y)
 
-    _section_header(pdf, "1", "Farm & Parcel Information")
 
+def _render_farm_info(
+    pdf: EX,
+    parcel_id: str,
+    token: str,
+    crops: list,
+    satellite_image: Optional[Future] = None,
+) -> None:
     parcel_data = None
     if parcel_id and settings.REPORTING_USING_GATEKEEPER:
         parcel_data = display_pdf_parcel_details(pdf, parcel_id, geolocator, token)
@@ -207,234 +227,189 @@ def create_field_notebook_pdf(
 
     if parcel_data and parcel_data.lat and parcel_data.long:
         try:
-            image_bytes = fetch_wms_image(parcel_data.lat, parcel_data.long)
-            pdf.ln(2)
-            x_start = (pdf.w - 120) / 2
-            pdf.set_x(x_start)
-            pdf.image(io.BytesIO(image_bytes), type="png", w=120)
-            pdf.ln(2)
+            if satellite_image is not None:
+                image_bytes = collect_prefetched_image(satellite_image)
+            else:
+                image_bytes = fetch_wms_image(
+                    parcel_data.lat,
+                    parcel_data.long,
+                    placement_width_mm=SATELLITE_IMAGE_WIDTH_MM,
+                )
+            if image_bytes:
+                pdf.ln(2)
+                x_start = (pdf.w - SATELLITE_IMAGE_WIDTH_MM) / 2
+                pdf.set_x(x_start)
+                pdf.image(io.BytesIO(image_bytes), w=SATELLITE_IMAGE_WIDTH_MM)
+                pdf.ln(2)
         except SatelliteImageException:
             logger.info("Satellite image unavailable, continuing without it.")
 
-    pdf.add_page()
-    _section_header(pdf, "2", "Forecasting Models \u2013 Last 15 Days")
 
+def forecasting_table(forecasting_data: list) -> ReportTable:
+    return ReportTable(
+        "Forecasting Models",
+        ["Pest / Model", "Risk Level", "Date", "Notes"],
+        [
+            [
+                str(entry.get("pest") or entry.get("name") or "\u2014"),
+                str(entry.get("riskLevel") or entry.get("risk_level") or "\u2014"),
+                str(entry.get("date") or "\u2014"),
+                str(entry.get("notes") or entry.get("details") or "\u2014"),
+            ]
+            for entry in forecasting_data
+        ],
+    )
+
+
+def _render_forecasting(pdf: EX, forecasting_data: list) -> None:
     if not forecasting_data:
         _no_data(pdf, "No forecasting data available (service not configured or no data returned).")
-    else:
-        pdf.set_font("FreeSerif", "B", 10)
-        with pdf.table(text_align="CENTER") as table:
-            row = table.row()
-            row.cell("Pest / Model")
-            row.cell("Risk Level")
-            row.cell("Date")
-            row.cell("Notes")
-            pdf.set_font("FreeSerif", "", 9)
-            for entry in forecasting_data:
-                row = table.row()
-                row.cell(str(entry.get("pest") or entry.get("name") or "\u2014"))
-                row.cell(str(entry.get("riskLevel") or entry.get("risk_level") or "\u2014"))
-                row.cell(str(entry.get("date") or "\u2014"))
-                row.cell(str(entry.get("notes") or entry.get("details") or "\u2014"))
-
-    _sec = [3]
-
-    def _next_sec() -> str:
-        n = str(_sec[0])
-        _sec[0] += 1
-        return n
+        return
+    render_report_table(pdf, forecasting_table(forecasting_data))
+
+
+def _pesticide_rows(pesticide_ops: list, pesticide_names: list):
+    for op, pesticide_name in zip(pesticide_ops, pesticide_names):
+        yield [
+            op.hasStartDatetime.strftime("%d/%m/%Y")
+            if op.hasStartDatetime else "\u2014",
+            op.title or "\u2014",
+            pesticide_name or "\u2014",
+            str(op.hasAppliedAmount.numericValue)
+            if op.hasAppliedAmount else "\u2014",
+            op.hasAppliedAmount.unit
+            if op.hasAppliedAmount else "\u2014",
+            op.responsibleAgent or "\u2014",
+        ]
+
+
+def pesticides_table(pesticide_ops: list, pesticide_names: list) -> ReportTable:
+    return ReportTable(
+        "Pest Treatment Activities",
+        ["Date", "Title", "Pesticide", "Dose", "Unit", "Agent"],
+        _pesticide_rows(pesticide_ops, pesticide_names),
+    )
 
-    if include_pesticides:
-        pdf.add_page()
-        _section_header(pdf, _next_sec(), "Pest Treatment Activities")
 
-        if not pesticide_ops:
-            _no_data(pdf, "No pesticide treatment activities recorded for this period.")
-        else:
-            try:
-                pesticide_ops.sort(key=lambda x: x.hasStartDatetime or datetime.datetime.min)
-            except Exception:
-                pass
-            pdf.set_font("FreeSerif", "B", 10)
-            with pdf.table(text_align="CENTER") as table:
-                row = table.row()
-                row.cell("Date")
-                row.cell("Title")
-                row.cell("Pesticide")
-                row.cell("Dose")
-                row.cell("Unit")
-                row.cell("Agent")
-                pdf.set_font("FreeSerif", "", 9)
-                for op in pesticide_ops:
-                    row = table.row()
-                    row.cell(
-                        op.hasStartDatetime.strftime("%d/%m/%Y")
-                        if op.hasStartDatetime else "\u2014"
-                    )
-                    row.cell(op.title or "\u2014")
-                    row.cell(get_pest_from_obj(op, token) or "\u2014")
-                    row.cell(
-                        str(op.hasAppliedAmount.numericValue)
-                        if op.hasAppliedAmount else "\u2014"
-                    )
-                    row.cell(
-                        op.hasAppliedAmount.unit
-                        if op.hasAppliedAmount else "\u2014"
-                    )
-                    row.cell(op.responsibleAgent or "\u2014")
+def _render_pesticides(pdf: EX, pesticide_ops: list, pesticide_names: list) -> None:
+    if not pesticide_ops:
+        _no_data(pdf, "No pesticide treatment activities recorded for this period.")
+        return
+    render_report_table(pdf, pesticides_table(pesticide_ops, pesticide_names))
+
+
+def _fertilization_rows(fertilization_ops: list):
+    for op in fertilization_ops:
+        fertilizer_name = "\u2014"
+        if op.usesFertilizer:
+            fertilizer_name = (
+                op.usesFertilizer.get("name")
+                or op.usesFertilizer.get("@id", "").split(":")[-1]
+                or "Yes"
+            )
+        yield [
+            op.hasStartDatetime.strftime("%d/%m/%Y")
+            if op.hasStartDatetime else "\u2014",
+            op.title or "\u2014",
+            fertilizer_name,
+            op.hasApplicationMethod or "\u2014",
+            str(op.hasAppliedAmount.numericValue)
+            if op.hasAppliedAmount else "\u2014",
+            op.hasAppliedAmount.unit
+            if op.hasAppliedAmount else "\u2014",
+            op.responsibleAgent or "\u2014",
+        ]
+
+
+def fertilization_table(fertilization_ops: list) -> ReportTable:
+    return ReportTable(
+        "Fertilization Activities",
+        ["Date", "Title", "Fertilizer", "Application Method", "Dose", "Unit", "Agent"],
+        _fertilization_rows(fertilization_ops),
+    )
 
-    if include_fertilization:
-        pdf.add_page()
-        _section_header(pdf, _next_sec(), "Fertilization Activities")
 
-        if not fertilization_ops:
-            _no_data(pdf, "No fertilization activities recorded for this period.")
-        else:
-            try:
-                fertilization_ops.sort(key=lambda x: x.hasStartDatetime or datetime.datetime.min)
-            except Exception:
-                pass
-            pdf.set_font("FreeSerif", "B", 10)
-            with pdf.table(text_align="CENTER") as table:
-                row = table.row()
-                row.cell("Date")
-                row.cell("Title")
-                row.cell("Fertilizer")
-                row.cell("Application Method")
-                row.cell("Dose")
-                row.cell("Unit")
-                row.cell("Agent")
-                pdf.set_font("FreeSerif", "", 9)
-                for op in fertilization_ops:
-                    row = table.row()
-                    row.cell(
-                        op.hasStartDatetime.strftime("%d/%m/%Y")
-                        if op.hasStartDatetime else "\u2014"
-                    )
-                    row.cell(op.title or "\u2014")
-                    fertilizer_name = "\u2014"
-                    if op.usesFertilizer:
-                        fertilizer_name = (
-                            op.usesFertilizer.get("name")
-                            or op.usesFertilizer.get("@id", "").split(":")[-1]
-                            or "Yes"
-                        )
-                    row.cell(fertilizer_name)
-                    row.cell(op.hasApplicationMethod or "\u2014")
-                    row.cell(
-                        str(op.hasAppliedAmount.numericValue)
-                        if op.hasAppliedAmount else "\u2014"
-                    )
-                    row.cell(
-                        op.hasAppliedAmount.unit
-                        if op.hasAppliedAmount else "\u2014"
-                    )
-                    row.cell(op.responsibleAgent or "\u2014")
+def _render_fertilization(pdf: EX, fertilization_ops: list) -> None:
+    if not fertilization_ops:
+        _no_data(pdf, "No fertilization activities recorded for this period.")
+        return
+    render_report_table(pdf, fertilization_table(fertilization_ops))
+
+
+def _irrigation_rows(irrigation_ops: list):
+    for op in irrigation_ops:
+        sys_name = "\u2014"
+        if isinstance(op.usesIrrigationSystem, dict):
+            sys_name = op.usesIrrigationSystem.get("name") or "\u2014"
+        elif op.usesIrrigationSystem:
+            sys_name = op.usesIrrigationSystem
+        yield [
+            op.hasStartDatetime.strftime("%d/%m/%Y")
+            if op.hasStartDatetime else "\u2014",
+            op.hasEndDatetime.strftime("%d/%m/%Y")
+            if op.hasEndDatetime else "\u2014",
+            op.title or "\u2014",
+            sys_name,
+            str(op.hasAppliedAmount.numericValue)
+            if op.hasAppliedAmount else "\u2014",
+            op.hasAppliedAmount.unit
+            if op.hasAppliedAmount else "\u2014",
+            op.responsibleAgent or "\u2014",
+        ]
+
+
+def irrigation_table(irrigation_ops: list) -> ReportTable:
+    return ReportTable(
+        "Irrigation Activities",
+        ["Start Date", "End Date", "Title", "Irrigation System", "Dose", "Unit", "Agent"],
+        _irrigation_rows(irrigation_ops),
+    )
 
-    if include_irrigation:
-        pdf.add_page()
-        _section_header(pdf, _next_sec(), "Irrigation Activities")
 
-        if not irrigation_ops:
-            _no_data(pdf, "No irrigation activities recorded for this period.")
-        else:
-            try:
-                irrigation_ops.sort(key=lambda x: x.hasStartDatetime or datetime.datetime.min)
-            except Exception:
-                pass
-            pdf.set_font("FreeSerif", "B", 10)
-            with pdf.table(text_align="CENTER") as table:
-                row = table.row()
-                row.cell("Start Date")
-                row.cell("End Date")
-                row.cell("Title")
-                row.cell("Irrigation System")
-                row.cell("Dose")
-                row.cell("Unit")
-                row.cell("Agent")
-                pdf.set_font("FreeSerif", "", 9)
-                for op in irrigation_ops:
-                    row = table.row()
-                    row.cell(
-                        op.hasStartDatetime.strftime("%d/%m/%Y")
-                        if op.hasStartDatetime else "\u2014"
-                    )
-                    row.cell(
-                        op.hasEndDatetime.strftime("%d/%m/%Y")
-                        if op.hasEndDatetime else "\u2014"
-                    )
-                    row.cell(op.title or "\u2014")
-                    sys_name = "\u2014"
-                    if isinstance(op.usesIrrigationSystem, dict):
-                        sys_name = op.usesIrrigationSystem.get("name") or "\u2014"
-                    elif op.usesIrrigationSystem:
-                        sys_name = op.usesIrrigationSystem
-                    row.cell(sys_name)
-                    row.cell(
-                        str(op.hasAppliedAmount.numericValue)
-                        if op.hasAppliedAmount else "\u2014"
-                    )
-                    row.cell(
-                        op.hasAppliedAmount.unit
-                        if op.hasAppliedAmount else "\u2014"
-                    )
-                    row.cell(op.responsibleAgent or "\u2014")
+def _render_irrigation(pdf: EX, irrigation_ops: list) -> None:
+    if not irrigation_ops:
+        _no_data(pdf, "No irrigation activities recorded for this period.")
+        return
+    render_report_table(pdf, irrigation_table(irrigation_ops))
+
+
+def _observation_rows(observations: list):
+    for obs in observations:
+        date_val = obs.hasStartDatetime or obs.phenomenonTime
+        yield [
+            date_val.strftime("%d/%m/%Y") if date_val else "\u2014",
+            obs.title or "\u2014",
+            obs.observedProperty or "\u2014",
+            str(obs.hasResult.hasValue)
+            if obs.hasResult and obs.hasResult.hasValue else "\u2014",
+            obs.hasResult.unit
+            if obs.hasResult and obs.hasResult.unit else "\u2014",
+            obs.details or "\u2014",
+        ]
+
+
+def observations_table(observations: list) -> ReportTable:
+    return ReportTable(
+        "Crop Data & Observations",
+        ["Date", "Title", "Observed Property", "Value", "Unit", "Details"],
+        _observation_rows(observations),
+    )
 
-    if include_observations:
-        pdf.add_page()
-        _section_header(pdf, _next_sec(), "Crop Data & Observations")
 
-        if not observations:
-            _no_data(pdf, "No observations recorded for this period.")
-        else:
-            try:
-                observations.sort(
-                    key=lambda x: x.hasStartDatetime or x.phenomenonTime or datetime.datetime.min
-                )
-            except Exception:
-                pass
-            pdf.set_font("FreeSerif", "B", 10)
-            with pdf.table(text_align="CENTER") as table:
-                row = table.row()
-                row.cell("Date")
-                row.cell("Title")
-                row.cell("Observed Property")
-                row.cell("Value")
-                row.cell("Unit")
-                row.cell("Details")
-                pdf.set_font("FreeSerif", "", 9)
-                for obs in observations:
-                    row = table.row()
-                    date_val = obs.hasStartDatetime or obs.phenomenonTime
-                    row.cell(
-                        date_val.strftime("%d/%m/%Y") if date_val else "\u2014"
-                    )
-                    row.cell(obs.title or "\u2014")
-                    row.cell(obs.observedProperty or "\u2014")
-                    row.cell(
-                        str(obs.hasResult.hasValue)
-                        if obs.hasResult and obs.hasResult.hasValue else "\u2014"
-                    )
-                    row.cell(
-                        obs.hasResult.unit
-                        if obs.hasResult and obs.hasResult.unit else "\u2014"
-                    )
-                    row.cell(obs.details or "\u2014")
+def _render_observations(pdf: EX, observations: list) -> None:
+    if not observations:
+        _no_data(pdf, "No observations recorded for this period.")
+        return
+    render_report_table(pdf, observations_table(observations))
+
 
+def _render_certification(pdf: EX, cert_fields: list) -> None:
     pdf.ln(8)
     pdf.set_font("FreeSerif", "B", 12)
     pdf.cell(0, 8, "Quality Certification", ln=True)
     y = pdf.get_y()
     pdf.line(pdf.l_margin, y, pdf.w - pdf.r_margin, y)
     pdf.ln(4)
-    cert_fields = [
-        ("Certification Type", cert_type),
-        ("Certification Number / Reference", cert_number),
-        ("Issuing Body", cert_issuing_body),
-        ("Issue Date", cert_issue_date),
-        ("Expiry Date", cert_expiry_date),
-        ("Notes", cert_notes),
-    ]
     for label, value in cert_fields:
         pdf.set_font("FreeSerif", "B", 10)
         pdf.cell(72, 9, f"{label}:")
@@ -445,9 +420,250 @@ def create_field_notebook_pdf(
             pdf.cell(0, 9, "_____________________________________________", ln=True)
         pdf.ln(1)
 
+
+def _sorted(items: list, key) -> list:
+    try:
+        return sorted(items, key=key)
+    except Exception:
+        return items
+
+
+def field_notebook_sections(
+    parcel_id: str,
+    token: str,
+    from_date=None,
+    to_date=None,
+    irrigation_ops: list = None,
+    fertilization_ops: list = None,
+    pesticide_ops: list = None,
+    observations: list = None,
+    forecasting_data: list = None,
+    crops: list = None,
+    cert_type: str = None,
+    cert_number: str = None,
+    cert_issuing_body: str = None,
+    cert_issue_date: str = None,
+    cert_expiry_date: str = None,
+    cert_notes: str = None,
+    include_irrigation: bool = True,
+    include_fertilization: bool = True,
+    include_pesticides: bool = True,
+    include_observations: bool = True,
+    satellite_image: Optional[Future] = None,
+) -> List[NotebookSection]:
+    """
+    The sections of the Field Notebook in document order, with everything
+    that needs the network (parcel details, pesticide names) either resolved
+    here or kept in local sections.
+    """
+    by_start = lambda x: x.hasStartDatetime or datetime.datetime.min  # noqa: E731
+
+    sections = [
+        NotebookSection(_render_title, {"from_date": from_date, "to_date": to_date}),
+        NotebookSection(
+            _render_farm_info,
+            {
+                "parcel_id": parcel_id,
+                "token": token,
+                "crops": crops or [],
+                "satellite_image": satellite_image,
+            },
+            title="Farm & Parcel Information",
+            new_page=False,
+            local=True,
+        ),
+        NotebookSection(
+            _render_forecasting,
+            {"forecasting_data": forecasting_data or []},
+            title="Forecasting Models \u2013 Last 15 Days",
+        ),
+    ]
+    if include_pesticides:
+        pesticide_ops = _sorted(pesticide_ops or [], by_start)
+        sections.append(NotebookSection(
+            _render_pesticides,
+            {
+                "pesticide_ops": pesticide_ops,
+                "pesticide_names": [get_pest_from_obj(op, token) for op in pesticide_ops],
+            },
+            title="Pest Treatment Activities",
+        ))
+    if include_fertilization:
+        sections.append(NotebookSection(
+            _render_fertilization,
+            {"fertilization_ops": _sorted(fertilization_ops or [], by_start)},
+            title="Fertilization Activities",
+        ))
+    if include_irrigation:
+        sections.append(NotebookSection(
+            _render_irrigation,
+            {"irrigation_ops": _sorted(irrigation_ops or [], by_start)},
+            title="Irrigation Activities",
+        ))
+    if include_observations:
+        sections.append(NotebookSection(
+            _render_observations,
+            {
+                "observations": _sorted(
+                    observations or [],
+                    lambda x: x.hasStartDatetime or x.phenomenonTime or datetime.datetime.min,
+                ),
+            },
+            title="Crop Data & Observations",
+        ))
+    sections.append(NotebookSection(
+        _render_certification,
+        {
+            "cert_fields": [
+                ("Certification Type", cert_type),
+                ("Certification Number / Reference", cert_number),
+                ("Issuing Body", cert_issuing_body),
+                ("Issue Date", cert_issue_date),
+                ("Expiry Date", cert_expiry_date),
+                ("Notes", cert_notes),
+            ],
+        },
+        new_page=False,
+    ))
+    return sections
+
+
+# Tables of the sections, built from the same arguments as the sections
+_SECTION_TABLES = {
+    _render_farm_info: lambda crops, **_: crops_table(crops),
+    _render_forecasting: forecasting_table,
+    _render_pesticides: pesticides_table,
+    _render_fertilization: fertilization_table,
+    _render_irrigation: irrigation_table,
+    _render_observations: observations_table,
+}
+
+
+def field_notebook_tables(sections: List[NotebookSection]) -> List[ReportTable]:
+    """
+    The tables of the sections in document order, without rendering anything.
+    """
+    return [
+        _SECTION_TABLES[section.render](**section.kwargs)
+        for section in sections
+        if section.render in _SECTION_TABLES
+    ]
+
+
+def _section_documents(
+    sections: List[NotebookSection],
+) -> List[List[Tuple[Optional[str], NotebookSection]]]:
+    """
+    Numbers the sections and groups them into documents, each one starting
+    with a section on a new page.
+    """
+    documents = []
+    number = 0
+    for section in sections:
+        if section.title:
+            number += 1
+        if section.new_page or not documents:
+            documents.append([])
+        documents[-1].append((str(number) if section.title else None, section))
+    return documents
+
+
+def _new_document() -> EX:
+    pdf = EX()
+    add_fonts(pdf)
+    pdf.set_auto_page_break(auto=True, margin=20)
+    return pdf
+
+
+def _render_document(
+    pdf: EX, document: List[Tuple[Optional[str], NotebookSection]]
+) -> None:
+    pdf.add_page()
+    for number, section in document:
+        if section.title:
+            _section_header(pdf, number, section.title)
+        section.render(pdf, **section.kwargs)
+
+
+def render_field_notebook(sections: List[NotebookSection]) -> EX:
+    """
+    Renders the sections one after the other into one document.
+    """
+    pdf = _new_document()
+    for document in _section_documents(sections):
+        _render_document(pdf, document)
     return pdf
 
 
+def _render_section_document(
+    document: List[Tuple[Optional[str], NotebookSection]],
+) -> bytes:
+    pdf = _new_document()
+    _render_document(pdf, document)
+    return bytes(pdf.output())
+
+
+_section_pool: Optional[ProcessPoolExecutor] = None
+_section_pool_lock = threading.Lock()
+
+
+def _get_section_pool() -> ProcessPoolExecutor:
+    # Started on first use, "spawn" since this process runs threads
+    global _section_pool
+    with _section_pool_lock:
+        if _section_pool is None:
+            _section_pool = ProcessPoolExecutor(
+                max_workers=settings.REPORTING_NOTEBOOK_SECTION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _section_pool
+
+
+def shutdown_section_pool() -> None:
+    global _section_pool
+    with _section_pool_lock:
+        pool, _section_pool = _section_pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+def render_field_notebook_parallel(sections: List[NotebookSection]) -> bytes:
+    """
+    Renders every page-starting group of sections as its own document, in
+    worker processes unless it contains a local section, and merges them.
+    Local documents are rendered here while the workers run, so the notebook
+    takes about as long as its largest section.
+    """
+    global _section_pool
+    pool = _get_section_pool()
+    rendered = []
+    try:
+        for document in _section_documents(sections):
+            if any(section.local for _, section in document):
+                rendered.append(document)
+            else:
+                rendered.append(pool.submit(_render_section_document, document))
+        rendered = [
+            _render_section_document(part) if isinstance(part, list) else part
+            for part in rendered
+        ]
+        documents = [
+            part.result() if isinstance(part, Future) else part for part in rendered
+        ]
+    except BrokenProcessPool:
+        # A worker died, the next notebook starts a new pool
+        with _section_pool_lock:
+            if _section_pool is pool:
+                _section_pool = None
+        raise
+    finally:
+        for part in rendered:
+            if isinstance(part, Future):
+                part.cancel()
+    return merge_pdfs(documents)
+
+
+@report_job
 def process_field_notebook_data(
     token: str,
     pdf_file_name: str,
@@ -464,9 +680,11 @@ def process_field_notebook_data(
     include_fertilization: bool = True,
     include_pesticides: bool = True,
     include_observations: bool = True,
+    output_format: ReportFormat = ReportFormat.PDF,
 ) -> None:
     """
-    Fetch all field activity data for a parcel and generate a unified Field Notebook PDF.
+    Fetch all field activity data for a parcel and generate a unified Field Notebook PDF,
+    or its tables in `output_format`.
     """
     if not settings.REPORTING_USING_GATEKEEPER:
         raise HTTPException(
@@ -476,15 +694,34 @@ def process_field_notebook_data(
 
     params = _base_params(parcel_id, from_date, to_date)
 
-    crops = _fetch_crops_for_parcel(parcel_id, token)
-
-    raw_irrigations = _fetch_list("irrigations", token, params) if include_irrigation else []
-    raw_fertilizations = _fetch_list("fertilization", token, params) if include_fertilization else []
-    raw_pesticides = _fetch_list("pesticides", token, params) if include_pesticides else []
+    # The satellite image downloads while the sections below are fetched
+    satellite_image = None
+    if output_format == ReportFormat.PDF:
+        satellite_image = prefetch_parcel_image(
+            parcel_id, token, placement_width_mm=SATELLITE_IMAGE_WIDTH_MM
+        )
 
-    raw_observations = _fetch_list("observations", token, params) if include_observations else []
+    # All sections are independent, fetch them concurrently
+    tasks = {
+        "crops": partial(_fetch_crops_for_parcel, parcel_id=parcel_id, token=token),
+        "forecasting": partial(_fetch_forecasting, token=token, parcel_id=parcel_id),
+    }
+    if include_irrigation:
+        tasks["irrigations"] = partial(_fetch_list, url_key="irrigations", token=token, params=params)
+    if include_fertilization:
+        tasks["fertilization"] = partial(_fetch_list, url_key="fertilization", token=token, params=params)
+    if include_pesticides:
+        tasks["pesticides"] = partial(_fetch_list, url_key="pesticides", token=token, params=params)
+    if include_observations:
+        tasks["observations"] = partial(_fetch_list, url_key="observations", token=token, params=params)
+    results = run_concurrently(tasks)
 
-    forecasting_data = _fetch_forecasting(token, parcel_id)
+    crops = results.get("crops") or []
+    raw_irrigations = results.get("irrigations") or []
+    raw_fertilizations = results.get("fertilization") or []
+    raw_pesticides = results.get("pesticides") or []
+    raw_observations = results.get("observations") or []
+    forecasting_data = results.get("forecasting") or []
 
     try:
         irrigation_ops = [IrrigationOperation.model_validate(item) for item in raw_irrigations]
@@ -511,7 +748,7 @@ def process_field_notebook_data(
         observations = []
 
     try:
-        pdf = create_field_notebook_pdf(
+        sections = field_notebook_sections(
             parcel_id=parcel_id,
             token=token,
             from_date=from_date,
@@ -532,7 +769,13 @@ def process_field_notebook_data(
             include_fertilization=include_fertilization,
             include_pesticides=include_pesticides,
             include_observations=include_observations,
+            satellite_image=satellite_image,
         )
+        if output_format == ReportFormat.PDF:
+            if settings.REPORTING_NOTEBOOK_PARALLEL_SECTIONS:
+                pdf = render_field_notebook_parallel(sections)
+            else:
+                pdf = render_field_notebook(sections)
     except Exception as e:
         logger.error(f"Field Notebook PDF generation failed: {e}")
         raise HTTPException(
@@ -541,5 +784,7 @@ def process_field_notebook_data(
         )
 
     pdf_dir = f"{settings.PDF_DIRECTORY}{pdf_file_name}"
-    os.makedirs(os.path.dirname(f"{pdf_dir}.pdf"), exist_ok=True)
-    pdf.output(f"{pdf_dir}.pdf")
+    if output_format != ReportFormat.PDF:
+        write_report_tables(field_notebook_tables(sections), pdf_dir, output_format)
+        return
+    write_pdf(pdf, f"{pdf_dir}.pdf")
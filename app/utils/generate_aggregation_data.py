@@ -1,130 +1,193 @@
 import io
-from typing import List
+from datetime import timezone
+from typing import List, NamedTuple, Tuple
 
-import pandas as pd
-import matplotlib
+import numpy as np
 from core.config import settings
 from utils import get_pesticide
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+from utils.charts import AMOUNT_PER_HECTARE_CHART, TOTAL_VOLUME_CHART
 
 from schemas import IrrigationOperation, CropProtectionOperation
 
+# Integer representation of NaT in datetime64 arrays
+NAT_INT = np.iinfo(np.int64).min
+
+
+class OperationColumns(NamedTuple):
+    """
+    Fields of a list of operations as arrays, one entry per operation.
+
+    Units and pesticides are dictionary encoded: `unit_codes` index the
+    sorted distinct `units`, `pesticide_codes` the sorted distinct
+    `pesticide_ids` (full "@id", "" for operations without pesticide).
+    """
+
+    # UTC, NaT for operations without a start
+    dates: np.ndarray
+    doses: np.ndarray
+    unit_codes: np.ndarray
+    units: np.ndarray
+    pesticide_codes: np.ndarray
+    pesticide_ids: np.ndarray
+
+
+def _sorted_codes(categories: dict, codes: list) -> Tuple[np.ndarray, np.ndarray]:
+    # Renumbers codes given in order of appearance by sorted category
+    values = np.array(list(categories), dtype=str)
+    order = np.argsort(values, kind="stable")
+    ranks = np.empty(len(order), dtype=np.intp)
+    ranks[order] = np.arange(len(order))
+    return ranks[np.array(codes, dtype=np.intp)], values[order]
+
+
+def operation_columns(
+    operations: List[IrrigationOperation] | List[CropProtectionOperation],
+) -> OperationColumns:
+    """
+    Extracts the fields the report aggregates from operations in one pass.
+    """
+    # Dates as POSIX timestamps, numpy converts datetime objects one by one
+    seconds, doses, unit_codes, pesticide_codes = [], [], [], []
+    units, pesticide_ids = {}, {}
+    # isinstance checks of pydantic models are slow, done once per type
+    pesticide_types = {}
+    for op in operations:
+        start = op.hasStartDatetime
+        if start is None:
+            seconds.append(np.nan)
+        elif start.tzinfo is None:
+            seconds.append(start.replace(tzinfo=timezone.utc).timestamp())
+        else:
+            seconds.append(start.timestamp())
+        amount = op.hasAppliedAmount
+        doses.append(amount.numericValue if amount else 0)
+        unit_codes.append(units.setdefault(amount.unit if amount else "", len(units)))
+        uses_pesticide = pesticide_types.get(type(op))
+        if uses_pesticide is None:
+            uses_pesticide = pesticide_types[type(op)] = isinstance(
+                op, CropProtectionOperation
+            )
+        pesticide = op.usesPesticide if uses_pesticide else None
+        pesticide_id = (pesticide.get("@id") or "") if pesticide else ""
+        pesticide_codes.append(
+            pesticide_ids.setdefault(pesticide_id, len(pesticide_ids))
+        )
+
+    micros = np.round(np.array(seconds, dtype=float) * 1e6)
+    dates = (
+        np.where(np.isnan(micros), NAT_INT, micros)
+        .astype("int64")
+        .view("datetime64[us]")
+    )
+    return OperationColumns(
+        dates,
+        np.array(doses, dtype=float),
+        *_sorted_codes(units, unit_codes),
+        *_sorted_codes(pesticide_ids, pesticide_codes),
+    )
+
+
+def pesticide_name(pesticide_id: str, token: dict | str) -> str:
+    """
+    Commercial name of the pesticide with the given "@id", "" if unknown.
+    """
+    if not settings.REPORTING_USING_GATEKEEPER or not pesticide_id:
+        return ""
+    pest = get_pesticide(pesticide_id.split(":")[3], token)
+    return pest.get("hasCommercialName") if pest else ""
+
 
 def get_pest_from_obj(pt: CropProtectionOperation, token: dict | str):
-    pest_name = ""
-    if not settings.REPORTING_USING_GATEKEEPER:
-        return pest_name
     pest_id = pt.usesPesticide.get("@id", None) if pt.usesPesticide else None
-    if pest_id:
-        pest_id = pest_id.split(":")[3]
-        pest = get_pesticide(pest_id, token)
-        pest_name = pest.get("hasCommercialName") if pest else ""
-    return pest_name
+    return pesticide_name(pest_id, token)
+
+
+class PesticideTotal(NamedTuple):
+    pesticide: str
+    unit: str
+    dose: float
 
 
 def pesticides_aggregation(
     pests: List[CropProtectionOperation], token: dict | str
-) -> pd.DataFrame:
-    data_for_df = []
-    for pt in pests:
-        data_for_df.append(
-            {
-                "Dose": pt.hasAppliedAmount.numericValue if pt.hasAppliedAmount else 0,
-                "Pesticide": get_pest_from_obj(pt, token),
-                "Unit": pt.hasAppliedAmount.unit if pt.hasAppliedAmount else "",
-            }
-        )
-    df = pd.DataFrame(data_for_df)
-    pesticide_sums = df.groupby(["Pesticide", "Unit"])["Dose"].sum().reset_index()
-    return pesticide_sums
-
-
-def prepare_df_for_calculations(
-    irrigation_reports: List[IrrigationOperation],
-) -> pd.DataFrame:
-    data_for_df = []
-    for irrig in irrigation_reports:
-        data_for_df.append(
-            {
-                "Started Date": irrig.hasStartDatetime,
-                "Dose": irrig.hasAppliedAmount.numericValue
-                if irrig.hasAppliedAmount
-                else 0,
-            }
-        )
-    df = pd.DataFrame(data_for_df)
-    return df
-
-
-def generate_total_volume_graph(df: pd.DataFrame, parcel_area: int) -> io.BytesIO:
-    df["Started Date"] = pd.to_datetime(df["Started Date"], format="%d/%m/%Y")
-    df["Total Volume"] = df["Dose"] * parcel_area
-    df = df.sort_values(by="Started Date")
-    plt.figure(figsize=(14, 7))
-    plt.plot(df["Started Date"], df["Total Volume"], marker="o", color="#8B8000")
-
-    for i, txt in enumerate(df["Total Volume"]):
-        plt.annotate(
-            txt,
-            (df["Started Date"].iloc[i], df["Total Volume"].iloc[i]),
-            textcoords="offset points",
-            xytext=(0, 5),
-            ha="center",
+) -> List[PesticideTotal]:
+    """
+    Total dose per pesticide and unit, ordered by pesticide and unit.
+
+    Names are looked up once per distinct pesticide, operations are then
+    summed per (name, unit) code with one `bincount`. Pesticides without a
+    name in the Farm Calendar are left out.
+    """
+    columns = operation_columns(pests)
+    names = [
+        pesticide_name(pesticide_id, token) for pesticide_id in columns.pesticide_ids
+    ]
+    named = np.array([name is not None for name in names], dtype=bool)[
+        columns.pesticide_codes
+    ]
+    name_values, name_codes = np.unique(
+        np.array([name or "" for name in names], dtype=str), return_inverse=True
+    )
+
+    unit_count = len(columns.units)
+    groups = (
+        name_codes[columns.pesticide_codes[named]] * unit_count
+        + columns.unit_codes[named]
+    )
+    group_count = len(name_values) * unit_count
+    sums = np.bincount(groups, weights=columns.doses[named], minlength=group_count)
+    present = np.bincount(groups, minlength=group_count) > 0
+    return [
+        PesticideTotal(
+            str(name_values[group // unit_count]),
+            str(columns.units[group % unit_count]),
+            float(sums[group]),
         )
+        for group in np.flatnonzero(present)
+    ]
+
+
+def total_volume_series(
+    columns: OperationColumns, parcel_area: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(columns.dates, kind="stable")
+    return columns.dates[order], columns.doses[order] * parcel_area
+
+
+def amount_per_hectare_series(
+    columns: OperationColumns,
+) -> Tuple[np.ndarray, np.ndarray]:
+    return columns.dates, columns.doses
 
-    plt.title("Total Volume of applied water per irrigation activity", fontsize=16)
-    plt.ylabel("Total Volume (m3)", fontsize=12)
-    plt.xlabel("Date", fontsize=12)
-    plt.grid(True, linestyle="--", alpha=0.6)
-    plt.xticks(rotation=45)
-
-    ax = plt.gca()
-    ax.xaxis.set_major_formatter(mdates.DateFormatter("%d/%m/%Y"))
-
-    plt.tight_layout()
-    image_mem = io.BytesIO()
-    plt.savefig(image_mem, format="png")
-    plt.close()
-    return image_mem
-
-
-def generate_amount_per_hectare(df: pd.DataFrame) -> io.BytesIO:
-    df["Started Date"] = pd.to_datetime(df["Started Date"], format="%d/%m/%Y")
-    plt.figure(figsize=(14, 7))
-    plt.plot(df["Started Date"], df["Dose"], marker="o", color="grey")
-
-    for i, txt in enumerate(df["Dose"]):
-        plt.annotate(
-            txt,
-            (df["Started Date"].iloc[i], df["Dose"].iloc[i]),
-            textcoords="offset points",
-            xytext=(0, 5),
-            ha="center",
-        )
 
-    plt.title("Applied amount of water per hectare", fontsize=16)
-    plt.ylabel("Dose (m3/Ha)", fontsize=12)
-    plt.xlabel("Date", fontsize=12)
-    plt.grid(True, linestyle="--", alpha=0.6)
-    plt.xticks(rotation=45)
+def generate_total_volume_graph(
+    columns: OperationColumns, parcel_area: int
+) -> io.BytesIO:
+    return TOTAL_VOLUME_CHART.render(*total_volume_series(columns, parcel_area))
 
-    ax = plt.gca()
-    ax.xaxis.set_major_formatter(mdates.DateFormatter("%d/%m/%Y"))
 
-    plt.tight_layout()
-    image_mem = io.BytesIO()
-    plt.savefig(image_mem, format="png")
-    plt.close()
-    return image_mem
+def generate_amount_per_hectare(columns: OperationColumns) -> io.BytesIO:
+    return AMOUNT_PER_HECTARE_CHART.render(*amount_per_hectare_series(columns))
 
 
-def generate_aggregation_table_data(df: pd.DataFrame) -> dict:
+def generate_aggregation_table_data(
+    columns: OperationColumns, parcel_area: int
+) -> dict:
+    """
+    Sum, mean, maximum and minimum of the doses per hectare and of the
+    total volumes. Only the doses array is reduced, the statistics of the
+    volumes are those of the doses scaled by the area.
+    """
+    doses = columns.doses
+    if len(doses):
+        total, low, high = np.add.reduce(doses), doses.min(), doses.max()
+        stats = np.array([total, total / len(doses), high, low])
+    else:
+        stats = np.array([0.0, np.nan, np.nan, np.nan])
+    volumes = stats * parcel_area
     return {
-        "Volume of applied water": [df["Dose"].sum(), df["Total Volume"].sum()],
-        "Average dose": [df["Dose"].mean(), df["Total Volume"].mean()],
-        "Maximum Dose": [df["Dose"].max(), df["Total Volume"].max()],
-        "Minimum Dose": [df["Dose"].min(), df["Total Volume"].min()],
+        "Volume of applied water": [stats[0], volumes[0]],
+        "Average dose": [stats[1], volumes[1]],
+        "Maximum Dose": [stats[2], volumes[2]],
+        "Minimum Dose": [stats[3], volumes[3]],
     }
@@ -0,0 +1,225 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+from geopy.geocoders import Nominatim
+
+from core import settings
+from crud import geocode_cache
+from db.session import SessionLocal
+from schemas import GeocodeAddress, GeocodeCacheCreate
+from utils.entity_cache import TTLCache
+from utils.job_context import job_memoize
+from utils.offline_geocoder import get_offline_geocoder
+
+logger = logging.getLogger(__name__)
+
+Coordinates = Tuple[float, float]
+
+# In-process LRU in front of the geocode_cache table, addresses never expire
+address_cache = TTLCache(settings.REPORTING_GEOCODE_LRU_SIZE)
+
+
+class TokenBucket:
+    """
+    Blocking token bucket, `rate` tokens per second up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class GeocodingService:
+    """
+    Process-wide reverse geocoding queue shared by all report jobs.
+
+    Lookups are queued and answered by a single worker thread that drains all
+    pending coordinates per batch, at most `rate` provider requests per second.
+    Pending lookups for the same coordinates share one request and one future.
+    `on_resolved` is called with every successful result, also when the
+    requesting caller has stopped waiting.
+    """
+
+    def __init__(
+        self,
+        geolocator: Nominatim,
+        rate: float,
+        burst: float = 1,
+        on_resolved: Optional[Callable[[Coordinates, GeocodeAddress], None]] = None,
+    ):
+        self.geolocator = geolocator
+        self.on_resolved = on_resolved
+        self._bucket = TokenBucket(rate, burst)
+        self._pending: Dict[Coordinates, Future] = {}
+        self._queue: List[Coordinates] = []
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+    def submit(self, lat: float, long: float) -> Future:
+        """
+        Queues a lookup and returns a future of its GeocodeAddress
+        (None for an unknown location).
+        """
+        key = (lat, long)
+        with self._condition:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            future = Future()
+            self._pending[key] = future
+            self._queue.append(key)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="geocoding-service", daemon=True
+                )
+                self._worker.start()
+            self._condition.notify()
+            return future
+
+    def reverse(self, lat: float, long: float) -> Optional[GeocodeAddress]:
+        """
+        Blocking lookup, waits at most `REPORTING_GEOCODER_WAIT_TIMEOUT` seconds.
+        """
+        return self.submit(lat, long).result(
+            timeout=settings.REPORTING_GEOCODER_WAIT_TIMEOUT
+        )
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+                batch, self._queue = self._queue, []
+            for key in batch:
+                self._resolve(key)
+
+    def _resolve(self, key: Coordinates) -> None:
+        try:
+            self._bucket.acquire()
+            address = self._lookup(*key)
+            if address is not None and self.on_resolved is not None:
+                self.on_resolved(key, address)
+        except Exception as e:
+            self._pop(key).set_exception(e)
+        else:
+            self._pop(key).set_result(address)
+
+    def _pop(self, key: Coordinates) -> Future:
+        with self._condition:
+            return self._pending.pop(key)
+
+    def _lookup(self, lat: float, long: float) -> Optional[GeocodeAddress]:
+        location = self.geolocator.reverse(f"{lat}, {long}")
+        if location is None:
+            return None
+        details = location.raw.get("address", {})
+        return GeocodeAddress(
+            country=details.get("country") or "",
+            city=details.get("city") or "",
+            postcode=details.get("postcode") or "",
+        )
+
+
+def _rounded(lat: float, long: float) -> Coordinates:
+    precision = settings.REPORTING_GEOCODE_PRECISION
+    return round(float(lat), precision), round(float(long), precision)
+
+
+def _load_persisted(lat: float, long: float) -> Optional[GeocodeAddress]:
+    if not settings.REPORTING_GEOCODE_PERSISTENT_CACHE:
+        return None
+    try:
+        with SessionLocal() as db:
+            cached = geocode_cache.get_by_coordinates(db, lat=lat, long=long)
+            return GeocodeAddress.model_validate(cached) if cached else None
+    except Exception as e:
+        logger.info(f"Geocode cache lookup failed. {e}")
+        return None
+
+
+def _persist(lat: float, long: float, address: GeocodeAddress) -> None:
+    if not settings.REPORTING_GEOCODE_PERSISTENT_CACHE:
+        return
+    try:
+        with SessionLocal() as db:
+            geocode_cache.create(
+                db,
+                obj_in=GeocodeCacheCreate(lat=lat, long=long, **address.model_dump()),
+            )
+    except Exception as e:
+        logger.info(f"Geocode cache store failed. {e}")
+
+
+def _remember(key: Coordinates, address: GeocodeAddress) -> None:
+    address_cache.set(("geocode", *key), address, ttl=float("inf"))
+    _persist(*key, address)
+
+
+geocoding_service = GeocodingService(
+    Nominatim(user_agent="reporting_open_agri_app", timeout=5),
+    rate=settings.REPORTING_GEOCODER_RATE_LIMIT,
+    burst=settings.REPORTING_GEOCODER_BURST,
+    on_resolved=_remember,
+)
+
+
+def _geocode(
+    lat: float, long: float, geolocator: GeocodingService
+) -> Optional[GeocodeAddress]:
+    key = ("geocode", lat, long)
+    hit, address = address_cache.get(key)
+    if hit:
+        return address
+
+    address = _load_persisted(lat, long)
+    if address is not None:
+        address_cache.set(key, address, ttl=float("inf"))
+        return address
+    return geolocator.reverse(lat, long)
+
+
+def reverse_geocode(
+    lat: float, long: float, geolocator: GeocodingService = geocoding_service
+) -> str:
+    """
+    Returns the "Country: .. | City: .. | Postcode: .." address of a location.
+
+    With the offline backend the nearest gazetteer place is returned directly.
+    Otherwise coordinates are rounded to `REPORTING_GEOCODE_PRECISION` decimals
+    and looked up in the in-process LRU, then in the geocode_cache table, before
+    they are queued on the rate-limited geocoding service.
+    Raises on geocoder errors and when the queue wait times out.
+    """
+    if settings.REPORTING_GEOCODER_BACKEND == "offline":
+        address = get_offline_geocoder().reverse(lat, long)
+        return address.formatted() if address else ""
+
+    lat, long = _rounded(lat, long)
+    address = job_memoize(
+        ("geocode", lat, long), lambda: _geocode(lat, long, geolocator)
+    )
+    return address.formatted() if address else ""
@@ -0,0 +1,87 @@
+import http.cookiejar
+import logging
+import threading
+from typing import Optional, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from core import settings
+
+logger = logging.getLogger(__name__)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_request_timeout() -> Tuple[float, float]:
+    """
+    Returns (connect, read) timeout tuple used for upstream calls.
+    """
+    return (
+        settings.REPORTING_HTTP_CONNECT_TIMEOUT,
+        settings.REPORTING_HTTP_READ_TIMEOUT,
+    )
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    # pool_connections = number of per-host pools kept alive,
+    # pool_maxsize = connections kept (and, when blocking, allowed) per host
+    adapter = HTTPAdapter(
+        pool_connections=settings.REPORTING_HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.REPORTING_HTTP_POOL_MAXSIZE,
+        pool_block=settings.REPORTING_HTTP_POOL_BLOCK,
+        max_retries=settings.REPORTING_HTTP_MAX_RETRIES,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Shared by the requests of all users, cookies set on one response must
+    # not be sent with the next
+    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    if not settings.REPORTING_HTTP_KEEP_ALIVE:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Returns the process-wide pooled session used for all upstream HTTP calls
+    (Gatekeeper, Farm Calendar proxy, WMS).
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def close_http_session() -> None:
+    """
+    Closes pooled connections. Called on application shutdown.
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def create_async_client() -> httpx.AsyncClient:
+    """
+    Creates an async client for concurrent fan-out. The connection limit bounds
+    how many upstream requests are in flight at once; extra requests wait for a
+    free connection instead of failing.
+    """
+    limit = settings.REPORTING_ASYNC_MAX_CONCURRENCY
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit),
+        timeout=httpx.Timeout(
+            settings.REPORTING_HTTP_READ_TIMEOUT,
+            connect=settings.REPORTING_HTTP_CONNECT_TIMEOUT,
+            pool=None,
+        ),
+        headers=None if settings.REPORTING_HTTP_KEEP_ALIVE else {"Connection": "close"},
+    )
@@ -1,30 +1,42 @@
 import io
 import json
 import logging
-import os
+from concurrent.futures import Future
 from datetime import datetime
 from typing import Optional, List
 
 from fastapi import HTTPException
 
 from core import settings
-from schemas import IrrigationOperation, FertilizationOperation, CropProtectionOperation
-from utils.satellite_image_get import fetch_wms_image, SatelliteImageException
-from utils import EX, add_fonts, decode_dates_filters, get_parcel_info, display_pdf_parcel_details, FarmInfo
+from schemas import IrrigationOperation, FertilizationOperation, CropProtectionOperation, ReportFormat
+from utils.satellite_image_get import (
+    collect_prefetched_image,
+    fetch_wms_image,
+    prefetch_parcel_image,
+    SatelliteImageException,
+)
+from utils import EX, add_fonts, decode_dates_filters, get_parcel_info, display_pdf_parcel_details, FarmInfo, write_pdf
 from utils.farm_calendar_report import geolocator
+from utils.charts import AMOUNT_PER_HECTARE_CHART, TOTAL_VOLUME_CHART
+from utils.entity_cache import fetch_entity
 from utils.generate_aggregation_data import (
-    generate_total_volume_graph,
-    generate_amount_per_hectare,
-    prepare_df_for_calculations,
+    OperationColumns,
+    total_volume_series,
+    amount_per_hectare_series,
+    operation_columns,
     generate_aggregation_table_data,
     get_pest_from_obj,
     pesticides_aggregation,
 )
-from utils.json_handler import make_get_request
+from utils.json_handler import iter_paginated, make_get_request
+from utils.job_context import report_job
+from utils.report_tables import ReportTable, render_report_table, write_report_tables
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SATELLITE_IMAGE_WIDTH_MM = 100
+
 
 def parse_irrig_fert_operations(
     data: dict,
@@ -51,6 +63,181 @@ def parse_irrig_fert_operations(
         )
 
 
+def _operation_rows(
+    operations,
+    token: dict[str, str],
+    parcel_defined: bool,
+    irrigation_flag: bool,
+    fertilization_flag: bool,
+):
+    for op in operations:
+        start_time = (
+            op.hasStartDatetime.strftime("%d/%m/%Y")
+            if op.hasStartDatetime
+            else ""
+        )
+        end_time = (
+            op.hasEndDatetime.strftime("%d/%m/%Y") if op.hasEndDatetime else ""
+        )
+        row = [f"{start_time} - {end_time}"]
+
+        if not parcel_defined:
+            parcel_id = op.operatedOn.get("@id") if op.operatedOn else None
+            address = ""
+            farm = FarmInfo(description="", administrator="", vatID="", name="", municipality="", contactPerson="")
+            identifier = ""
+            if parcel_id:
+                parcel = parcel_id.split(":")[3] if op.operatedOn else None
+                if parcel:
+                    parcel_data, farm, identifier = get_parcel_info(
+                        parcel_id.split(":")[-1],
+                        token,
+                        geolocator,
+                        identifier_flag=True,
+                    )
+                    address = parcel_data.address
+
+            row.append(address)
+            row.append(identifier)
+            row.append(f"Name: {farm.name} | Municipality: {farm.municipality}")
+
+        row.append(f"{op.hasAppliedAmount.numericValue}")
+        row.append(f"{op.hasAppliedAmount.unit}")
+
+        if irrigation_flag:
+            if isinstance(op.usesIrrigationSystem, dict):
+                local_sys = op.usesIrrigationSystem.get("name")
+            else:
+                local_sys = op.usesIrrigationSystem
+            row.append(local_sys)
+        elif fertilization_flag:
+            row.append("Yes" if op.usesFertilizer else "No")
+            row.append(op.hasApplicationMethod)
+        else:
+            pest = ""
+            if op.usesPesticide:
+                pest = get_pest_from_obj(op, token)
+            row.append(pest)
+        yield row
+
+
+def operations_table(
+    operations: List[IrrigationOperation]
+    | List[FertilizationOperation | CropProtectionOperation],
+    token: dict[str, str],
+    title: str,
+    data_used: bool = False,
+    parcel_defined: bool = False,
+    irrigation_flag: bool = True,
+    fertilization_flag: bool = False,
+) -> ReportTable:
+    """
+    The operations in chronological order, unless they come from an uploaded
+    file. Parcel columns are left out when the report is about one parcel.
+    """
+    columns = ["Start - End"]
+    if not parcel_defined:
+        columns += ["Parcel", "Parcel Identifier", "Farm"]
+    columns += ["Dose", "Unit"]
+    if irrigation_flag:
+        columns.append("Irrigation System")
+    elif fertilization_flag:
+        columns += ["Fertilizer", "Application Method"]
+    else:
+        columns.append("Pesticide")
+    if not data_used:
+        operations = sorted(operations, key=lambda x: x.hasStartDatetime)
+    return ReportTable(
+        f"{title}s",
+        columns,
+        _operation_rows(
+            operations, token, parcel_defined, irrigation_flag, fertilization_flag
+        ),
+    )
+
+
+def _area_hectares(area) -> int:
+    return int(float(area) / 10_000) if float(area) > 0 else 0
+
+
+def _parcel_area(parcel_id: str, token: dict[str, str]) -> float:
+    """
+    Area of the parcel as in `get_parcel_info`, without its address lookup.
+    """
+    if not settings.REPORTING_USING_GATEKEEPER:
+        return 0.0
+    parcel = fetch_entity("parcel", parcel_id, token)
+    return parcel.get("area", 0.0) if parcel else 0.0
+
+
+def irrigation_aggregates_table(columns: OperationColumns, area_parcel: int) -> ReportTable:
+    return ReportTable(
+        "Aggregates",
+        ["Data", "Per hectare (m3)", "Total volume (m3)"],
+        [
+            [k, f"{v[0]:.2f}", f"{v[1]:.2f}"]
+            for k, v in generate_aggregation_table_data(columns, area_parcel).items()
+        ],
+    )
+
+
+def pesticide_totals_table(
+    operations: List[CropProtectionOperation], token: dict[str, str]
+) -> ReportTable:
+    return ReportTable(
+        "Final report",
+        ["Pesticide", "Total"],
+        [
+            [total.pesticide, f"{total.dose:.2f} {total.unit}"]
+            for total in pesticides_aggregation(operations, token)
+        ],
+    )
+
+
+def operation_report_tables(
+    operations: List[IrrigationOperation]
+    | List[FertilizationOperation | CropProtectionOperation],
+    token: dict[str, str] = None,
+    data_used: bool = False,
+    parcel_id: str = None,
+    irrigation_flag: bool = True,
+    fertilization_flag: bool = False,
+) -> List[ReportTable]:
+    """
+    The tables of the operation report, without its layout, imagery and graphs.
+    """
+    title = _report_title(irrigation_flag, fertilization_flag)
+    parcel_defined = bool(parcel_id)
+    tables = [
+        operations_table(
+            operations,
+            token,
+            title,
+            data_used=data_used,
+            parcel_defined=parcel_defined,
+            irrigation_flag=irrigation_flag,
+            fertilization_flag=fertilization_flag,
+        )
+    ]
+    if operations and parcel_defined:
+        if irrigation_flag:
+            tables.append(irrigation_aggregates_table(
+                operation_columns(operations),
+                _area_hectares(_parcel_area(parcel_id, token)),
+            ))
+        elif isinstance(operations[0], CropProtectionOperation):
+            tables.append(pesticide_totals_table(operations, token))
+    return tables
+
+
+def _report_title(irrigation_flag: bool, fertilization_flag: bool) -> str:
+    if irrigation_flag:
+        return "Irrigation"
+    if fertilization_flag:
+        return "Fertilization"
+    return "Pesticide"
+
+
 def create_pdf_from_operations(
     operations: List[IrrigationOperation]
     | List[FertilizationOperation | CropProtectionOperation],
@@ -61,9 +248,12 @@ def create_pdf_from_operations(
     to_date: datetime.date = None,
     irrigation_flag: bool = True,
     fertilization_flag: bool = False,
+    satellite_image: Optional[Future] = None,
 ):
     """
     Create PDF report from irrigation operations
+
+    `satellite_image` is the prefetched parcel image, fetched here if not given.
     """
     pdf = EX()
     add_fonts(pdf)
@@ -74,11 +264,7 @@ def create_pdf_from_operations(
 
     today = datetime.now().strftime("%d/%m/%Y")
     pdf.set_font("FreeSerif", "B", 14)
-    title = "Pesticide"
-    if irrigation_flag:
-        title = "Irrigation"
-    elif fertilization_flag:
-        title = "Fertilization"
+    title = _report_title(irrigation_flag, fertilization_flag)
 
     pdf.cell(0, 10, f"{title} Operation Report", ln=True, align="C")
     pdf.set_font("FreeSerif", style="", size=9)
@@ -126,12 +312,20 @@ def create_pdf_from_operations(
         parcel_data = display_pdf_parcel_details(pdf, parcel_id, geolocator, token)
         if parcel_data.long != 0 and parcel_data.lat != 0:
             try:
-                image_bytes = fetch_wms_image(parcel_data.lat, parcel_data.long)
-                image_file = io.BytesIO(image_bytes)
-                pdf.ln(2)
-                x_start = (pdf.w - 100) / 2
-                pdf.set_x(x_start)
-                pdf.image(image_file, type="png", w=100)
+                if satellite_image is not None:
+                    image_bytes = collect_prefetched_image(satellite_image)
+                else:
+                    image_bytes = fetch_wms_image(
+                        parcel_data.lat,
+                        parcel_data.long,
+                        placement_width_mm=SATELLITE_IMAGE_WIDTH_MM,
+                    )
+                if image_bytes:
+                    image_file = io.BytesIO(image_bytes)
+                    pdf.ln(2)
+                    x_start = (pdf.w - SATELLITE_IMAGE_WIDTH_MM) / 2
+                    pdf.set_x(x_start)
+                    pdf.image(image_file, w=SATELLITE_IMAGE_WIDTH_MM)
             except SatelliteImageException:
                 logger.info("Satellite image issue happened, continue without image.")
         parcel_defined = True
@@ -231,104 +425,33 @@ def create_pdf_from_operations(
         )
 
     if len(operations) > 1:
-        if not data_used:
-            operations.sort(key=lambda x: x.hasStartDatetime)
         pdf.set_font("FreeSerif", "B", 15)
         pdf.ln(2)
         pdf.set_x((pdf.w / 4) - 30)
         pdf.cell(30, 2,f"2. {title}s", align='L', ln=True)
         pdf.set_fill_color(0, 255, 255)
         pdf.ln(4)
-        with pdf.table(text_align="CENTER") as table:
-            row = table.row()
-            pdf.set_font("FreeSerif", "B", 10)
-            row.cell("Start - End")
-            if not parcel_defined:
-                row.cell("Parcel")
-                row.cell("Parcel Identifier")
-                row.cell("Farm")
-            row.cell("Dose")
-            row.cell("Unit")
-            if irrigation_flag:
-                row.cell("Irrigation System")
-            elif fertilization_flag:
-                row.cell("Fertilizer")
-                row.cell("Application Method")
-            else:
-                row.cell("Pesticide")
-            pdf.set_font("FreeSerif", "", 9)
-            pdf.set_fill_color(255, 255, 240)
-            for op in operations:
-                # Operation Header
-                row = table.row()
-                start_time = (
-                    op.hasStartDatetime.strftime("%d/%m/%Y")
-                    if op.hasStartDatetime
-                    else ""
-                )
-                end_time = (
-                    op.hasEndDatetime.strftime("%d/%m/%Y") if op.hasEndDatetime else ""
-                )
-                row.cell(f"{start_time} - {end_time}")
-
-                if not parcel_defined:
-                    parcel_id = op.operatedOn.get("@id") if op.operatedOn else None
-                    address = ""
-                    farm = FarmInfo(description="", administrator="", vatID="", name="", municipality="", contactPerson="")
-                    identifier = ""
-                    if parcel_id:
-                        parcel = parcel_id.split(":")[3] if op.operatedOn else None
-                        if parcel:
-                            parcel_data, farm, identifier = get_parcel_info(
-                                parcel_id.split(":")[-1],
-                                token,
-                                geolocator,
-                                identifier_flag=True,
-                            )
-                            address = parcel_data.address
-
-                    row.cell(address)
-                    row.cell(identifier)
-                    farm_local = (
-                        f"Name: {farm.name} | Municipality: {farm.municipality}"
-                    )
-                    row.cell(farm_local)
-
-                row.cell(
-                    f"{op.hasAppliedAmount.numericValue}",
-                )
-                row.cell(
-                    f"{op.hasAppliedAmount.unit}",
-                )
-
-                if irrigation_flag:
-                    if isinstance(op.usesIrrigationSystem, dict):
-                        local_sys = op.usesIrrigationSystem.get("name")
-                    else:
-                        local_sys = op.usesIrrigationSystem
-                    row.cell(local_sys)
-                elif fertilization_flag:
-                    row.cell("Yes" if op.usesFertilizer else "No")
-                    row.cell(op.hasApplicationMethod)
-                else:
-                    pest = ""
-                    if op.usesPesticide:
-                        pest = get_pest_from_obj(op, token)
-                    row.cell(pest)
-
+        render_report_table(
+            pdf,
+            operations_table(
+                operations,
+                token,
+                title,
+                data_used=data_used,
+                parcel_defined=parcel_defined,
+                irrigation_flag=irrigation_flag,
+                fertilization_flag=fertilization_flag,
+            ),
+        )
 
     if operations and parcel_defined:
         if irrigation_flag:
             pdf.ln(4)
-            area_parcel = (
-                int(float(parcel_data.area) / 10_000)
-                if float(parcel_data.area) > 0
-                else 0
-            )
-            df_for_calc = prepare_df_for_calculations(operations)
-            total_volume_graph = generate_total_volume_graph(df_for_calc, area_parcel)
+            area_parcel = _area_hectares(parcel_data.area)
+            columns = operation_columns(operations)
+            total_volume = total_volume_series(columns, area_parcel)
             pdf.ln(1)
-            amount_per_hc_graph = generate_amount_per_hectare(df_for_calc)
+            amount_per_hc = amount_per_hectare_series(columns)
             pdf.add_page()
             pdf.set_font("FreeSerif", "B", 15)
             pdf.set_x((pdf.w / 4) - 30)
@@ -337,56 +460,32 @@ def create_pdf_from_operations(
             pdf.set_font("FreeSerif", "", 10)
             pdf.cell(10, 2, "Graph 1: ", ln=2, align='L')
             pdf.ln(2)
-            pdf.image(total_volume_graph, type="png", w=180)
+            TOTAL_VOLUME_CHART.place(pdf, *total_volume, w=180)
             pdf.cell(10, 2, "Graph 2: ", ln=1, align='L')
             pdf.ln(2)
-            pdf.image(amount_per_hc_graph, type="png", w=180)
+            AMOUNT_PER_HECTARE_CHART.place(pdf, *amount_per_hc, w=180)
 
-            dict_average_table = generate_aggregation_table_data(df_for_calc)
             pdf.set_fill_color(0, 255, 255)
             pdf.set_font("FreeSerif", "B", 15)
             pdf.add_page()
             pdf.set_x((pdf.w / 4) - 30)
             pdf.cell(30, 2, "4. Aggregates:", align='L', ln=True)
             pdf.ln(4)
-            pdf.set_font("FreeSerif", "B", 10)
-            with pdf.table(text_align="CENTER") as table:
-                row = table.row()
-                row.cell("Data")
-                row.cell("Per hectare (m3)")
-                row.cell("Total volume (m3)")
-
-                pdf.set_font("FreeSerif", "", 9)
-                pdf.set_fill_color(255, 255, 240)
-                for k, v in dict_average_table.items():
-                    row = table.row()
-                    row.cell(k)
-                    row.cell(f"{v[0]:.2f}")
-                    row.cell(f"{v[1]:.2f}")
+            render_report_table(pdf, irrigation_aggregates_table(columns, area_parcel))
 
         elif isinstance(operations[0], CropProtectionOperation):
-            pesticide_sums = pesticides_aggregation(operations, token)
             pdf.set_fill_color(0, 255, 255)
             pdf.set_font("FreeSerif", "B", 15)
             pdf.add_page()
             pdf.set_x((pdf.w / 4) - 30)
             pdf.cell(30, 2, "3. Final report:", align='L', ln=True)
             pdf.ln(4)
-            pdf.set_font("FreeSerif", "B", 10)
-            with pdf.table(text_align="CENTER") as table:
-                row = table.row()
-                row.cell("Pesticide")
-                row.cell("Total")
-                pdf.set_font("FreeSerif", "", 9)
-                pdf.set_fill_color(255, 255, 240)
-                for _, row_df in pesticide_sums.iterrows():
-                    row = table.row()
-                    row.cell(row_df["Pesticide"])
-                    row.cell(f"{row_df['Dose']:.2f} {row_df['Unit']}")
+            render_report_table(pdf, pesticide_totals_table(operations, token))
 
     return pdf
 
 
+@report_job
 def process_irrigation_fertilization_data(
     data,
     token: dict[str, str],
@@ -398,12 +497,18 @@ def process_irrigation_fertilization_data(
     irrigation_flag: bool = True,
     fertilization_flag: bool = False,
     pesticides_flag: bool = False,
+    output_format: ReportFormat = ReportFormat.PDF,
 ) -> None:
     """
-    Process irrigation data and generate PDF report
+    Process irrigation data and generate PDF report, or its tables in `output_format`
     """
     data_used = False
     url_use = "irrigations"
+    satellite_image = None
+    if output_format == ReportFormat.PDF:
+        satellite_image = prefetch_parcel_image(
+            parcel_id, token, placement_width_mm=SATELLITE_IMAGE_WIDTH_MM
+        )
 
     if fertilization_flag:
         url_use = "fertilization"
@@ -426,7 +531,7 @@ def process_irrigation_fertilization_data(
                 params["parcel"] = parcel_id
 
             decode_dates_filters(params, from_date, to_date)
-            json_data = make_get_request(
+            json_data = iter_paginated(
                 url=f"{settings.REPORTING_FARMCALENDAR_BASE_URL}{settings.REPORTING_FARMCALENDAR_URLS[url_use]}",
                 token=token,
                 params=params,
@@ -447,6 +552,19 @@ def process_irrigation_fertilization_data(
     else:
         operations = []
 
+    pdf_dir = f"{settings.PDF_DIRECTORY}{pdf_file_name}"
+    if output_format != ReportFormat.PDF:
+        tables = operation_report_tables(
+            operations,
+            token,
+            data_used,
+            parcel_id=parcel_id,
+            irrigation_flag=irrigation_flag,
+            fertilization_flag=fertilization_flag,
+        )
+        write_report_tables(tables, pdf_dir, output_format)
+        return
+
     try:
         pdf = create_pdf_from_operations(
             operations,
@@ -457,11 +575,10 @@ def process_irrigation_fertilization_data(
             to_date=to_date,
             irrigation_flag=irrigation_flag,
             fertilization_flag=fertilization_flag,
+            satellite_image=satellite_image,
         )
     except Exception:
         raise HTTPException(
             status_code=400, detail="PDF generation of irrigation report failed."
         )
-    pdf_dir = f"{settings.PDF_DIRECTORY}{pdf_file_name}"
-    os.makedirs(os.path.dirname(f"{pdf_dir}.pdf"), exist_ok=True)
-    pdf.output(f"{pdf_dir}.pdf")
+    write_pdf(pdf, f"{pdf_dir}.pdf")
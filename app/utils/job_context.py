@@ -0,0 +1,83 @@
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+
+class JobMemo:
+    """
+    Values fetched while generating a single report.
+
+    Unlike the entity cache it has no size limit or TTL and also remembers
+    empty results, it only lives as long as the report job that created it.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            if key in self._values:
+                return True, self._values[key]
+            return False, None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._values[key] = value
+
+
+_current_job: ContextVar[Optional[JobMemo]] = ContextVar(
+    "report_job_memo", default=None
+)
+
+
+def current_job_memo() -> Optional[JobMemo]:
+    return _current_job.get()
+
+
+@contextmanager
+def report_job_context():
+    """
+    Opens a job memo for the enclosed code, nested jobs reuse the outer one.
+    The memo follows the context into `asyncio.run` and `asyncio.to_thread`.
+    """
+    if _current_job.get() is not None:
+        yield _current_job.get()
+        return
+    token = _current_job.set(JobMemo())
+    try:
+        yield _current_job.get()
+    finally:
+        _current_job.reset(token)
+
+
+def report_job(func: Callable) -> Callable:
+    """
+    Decorator running a report processor inside its own job memo.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with report_job_context():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def job_memoize(key: Hashable, loader: Callable[[], Any]) -> Any:
+    """
+    Returns the value memoized under `key` for the current report job or calls
+    `loader` and memoizes its result. Outside a report job it simply calls
+    `loader`.
+    """
+    memo = _current_job.get()
+    if memo is None:
+        return loader()
+    hit, value = memo.get(key)
+    if hit:
+        return value
+    value = loader()
+    memo.set(key, value)
+    return value
@@ -1,13 +1,52 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
 from fastapi import HTTPException
 
 from core import settings
-import requests
-from typing import Dict, Optional, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
 import logging
 
+from utils.http_client import (
+    create_async_client,
+    get_http_session,
+    get_request_timeout,
+)
+from utils.singleflight import SingleFlight
+
 logger = logging.getLogger(__name__)
 
 
+def _build_headers(token: Optional[Dict[str, str]]) -> Optional[Dict[str, str]]:
+    if not token:
+        return None
+    return {
+        "Content-Type": "application/json",
+        "Authorization": "Bearer {}".format(token),
+    }
+
+
+# Identical GETs issued concurrently by different report jobs share one request
+request_flights = SingleFlight()
+
+
+def _flight_key(url: str, params: Optional[dict], token) -> Hashable:
+    # The token is part of the key, results are only shared within one auth scope
+    return url, tuple(sorted((k, str(v)) for k, v in (params or {}).items())), token
+
+
 def make_get_request(
     url: str,
     params: Optional[Dict[str, Union[str, int, float]]] = None,
@@ -29,31 +68,195 @@ def make_get_request(
     """
 
     base_url = f"{settings.REPORTING_GATEKEEPER_BASE_URL}{url}"
-    headers = None
-    if token:
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": "Bearer {}".format(token),
-        }
+    headers = _build_headers(token)
 
-    try:
-        response = (
-            requests.get(
+    def _get():
+        try:
+            response = get_http_session().get(
                 base_url,
                 params=params,
                 headers=headers,
+                timeout=get_request_timeout(),
             )
-            if headers
-            else requests.get(
-                base_url,
-                params=params,
+
+            response.raise_for_status()
+
+            return response.json()
+
+        except Exception as e:
+            logger.info(f"Gatekeeper API returned an error. {e}")
+            return None
+
+    if not settings.REPORTING_HTTP_SINGLEFLIGHT:
+        return _get()
+    return request_flights.do(_flight_key(base_url, params, token), _get)
+
+
+async def make_async_get_request(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Optional[Dict[str, Union[str, int, float]]] = None,
+    token: Optional[Dict[str, str]] = None,
+) -> Union[dict, str] | None:
+    """
+    Async counterpart of `make_get_request`, to be used inside `run_concurrently`.
+
+    Args:
+        client (httpx.AsyncClient): Client provided by `run_concurrently`
+        url (str): The base URL for the request
+        params (Dict[str, Union[str, int, float]], optional): Query parameters to append to URL
+        token (Dict[str, str], optional): Token to be sent to request
+
+    Returns:
+        JSON response from the request, None on any failure
+    """
+    base_url = f"{settings.REPORTING_GATEKEEPER_BASE_URL}{url}"
+    headers = _build_headers(token)
+
+    async def _get():
+        try:
+            response = await client.get(base_url, params=params, headers=headers)
+
+            response.raise_for_status()
+
+            return response.json()
+
+        except Exception as e:
+            logger.info(f"Gatekeeper API returned an error. {e}")
+            return None
+
+    if not settings.REPORTING_HTTP_SINGLEFLIGHT:
+        return await _get()
+    return await request_flights.do_async(_flight_key(base_url, params, token), _get)
+
+
+def _page_params(params: Optional[dict], page: int) -> dict:
+    page_params = dict(params or {})
+    page_params["page"] = page
+    page_params["page_size"] = settings.REPORTING_FARMCALENDAR_PAGE_SIZE
+    return page_params
+
+
+def _page_items(response: Any) -> Tuple[list, bool]:
+    """
+    Splits a list response into its items and whether another page follows.
+    Paginated responses look like {"count", "next", "previous", "results"},
+    a plain list is an unpaginated endpoint and therefore the only page.
+    """
+    if isinstance(response, list):
+        return response, False
+    if isinstance(response, dict) and isinstance(response.get("results"), list):
+        return response["results"], bool(response.get("next"))
+    return [], False
+
+
+def iter_paginated(
+    url: str,
+    params: Optional[Dict[str, Union[str, int, float]]] = None,
+    token: Optional[Dict[str, str]] = None,
+) -> Iterator[dict]:
+    """
+    Yields the items of a Farm Calendar list endpoint page by page, so
+    callers can start parsing before the last page is fetched.
+    Page size is set by `REPORTING_FARMCALENDAR_PAGE_SIZE`, a failed page ends
+    the iteration like a failed `make_get_request` would.
+    """
+    page = 1
+    while True:
+        items, has_next = _page_items(
+            make_get_request(url=url, params=_page_params(params, page), token=token)
+        )
+        yield from items
+        if not has_next or not items:
+            return
+        page += 1
+
+
+async def iter_paginated_async(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Optional[Dict[str, Union[str, int, float]]] = None,
+    token: Optional[Dict[str, str]] = None,
+) -> AsyncIterator[dict]:
+    """
+    Async counterpart of `iter_paginated`.
+    """
+    page = 1
+    while True:
+        items, has_next = _page_items(
+            await make_async_get_request(
+                client, url=url, params=_page_params(params, page), token=token
             )
         )
+        for item in items:
+            yield item
+        if not has_next or not items:
+            return
+        page += 1
+
+
+def fetch_paginated(
+    url: str,
+    params: Optional[Dict[str, Union[str, int, float]]] = None,
+    token: Optional[Dict[str, str]] = None,
+) -> list:
+    """
+    Fetches all pages of a Farm Calendar list endpoint into one list.
+    """
+    return list(iter_paginated(url=url, params=params, token=token))
+
+
+async def fetch_paginated_async(
+    client: httpx.AsyncClient,
+    url: str,
+    params: Optional[Dict[str, Union[str, int, float]]] = None,
+    token: Optional[Dict[str, str]] = None,
+) -> list:
+    """
+    Async counterpart of `fetch_paginated`, to be used inside `run_concurrently`.
+    """
+    return [
+        item
+        async for item in iter_paginated_async(
+            client, url=url, params=params, token=token
+        )
+    ]
 
-        response.raise_for_status()
 
-        return response.json()
+def run_concurrently(
+    tasks: Dict[Hashable, Callable[[httpx.AsyncClient], Awaitable[Any]]],
+) -> Dict[Hashable, Any]:
+    """
+    Runs independent upstream fetches concurrently and returns their results
+    under the same keys.
 
-    except Exception as e:
-        logger.info(f"Gatekeeper API returned an error. {e}")
-        return None
+    Each task is a callable receiving the shared `httpx.AsyncClient`, e.g.
+    `functools.partial(make_async_get_request, url=..., token=..., params=...)`.
+    In-flight requests are bounded by `REPORTING_ASYNC_MAX_CONCURRENCY`.
+    A task that raises yields None instead of failing the whole batch.
+    """
+    if not tasks:
+        return {}
+
+    async def _gather() -> Dict[Hashable, Any]:
+        async with create_async_client() as client:
+            results = await asyncio.gather(
+                *(task(client) for task in tasks.values()), return_exceptions=True
+            )
+        gathered = {}
+        for key, result in zip(tasks.keys(), results):
+            if isinstance(result, Exception):
+                logger.info(f"Concurrent fetch {key} failed. {result}")
+                result = None
+            gathered[key] = result
+        return gathered
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # Report processors run as sync background tasks in worker threads
+        return asyncio.run(_gather())
+
+    # Called from inside a running event loop, run the batch on a helper thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, _gather()).result()
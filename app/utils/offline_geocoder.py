@@ -0,0 +1,149 @@
+import csv
+import logging
+import math
+import threading
+from typing import Optional
+
+import numpy as np
+
+from core import settings
+from schemas import GeocodeAddress
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def to_unit_vectors(lat, long) -> np.ndarray:
+    """
+    Maps degrees to points on the unit sphere, where euclidean (chord) distance
+    orders places the same way great-circle distance does.
+    """
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    long = np.radians(np.asarray(long, dtype=np.float64))
+    return np.stack(
+        (np.cos(lat) * np.cos(long), np.cos(lat) * np.sin(long), np.sin(lat)), axis=-1
+    )
+
+
+class KDTree:
+    """
+    Static k-d tree for nearest neighbour queries.
+
+    Nodes are implicit: each range of the (reordered) point array is split at
+    its middle element along the axis of largest spread, ranges of at most
+    `leaf_size` points are scanned directly.
+    """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 16):
+        self.leaf_size = leaf_size
+        self.points = np.array(points, dtype=np.float64)
+        self.index = np.arange(len(self.points))
+        self._axis = np.zeros(len(self.points), dtype=np.int8)
+        self._build(0, len(self.points))
+
+    def _build(self, lo: int, hi: int) -> None:
+        if hi - lo <= self.leaf_size:
+            return
+        points = self.points[lo:hi]
+        axis = int(np.argmax(points.max(axis=0) - points.min(axis=0)))
+        mid = (lo + hi) // 2
+        order = np.argpartition(points[:, axis], mid - lo)
+        self.points[lo:hi] = points[order]
+        self.index[lo:hi] = self.index[lo:hi][order]
+        self._axis[mid] = axis
+        self._build(lo, mid)
+        self._build(mid + 1, hi)
+
+    def query(self, point) -> tuple[float, int]:
+        """
+        Returns (euclidean distance, original index) of the point nearest to
+        `point`, or (inf, -1) for an empty tree.
+        """
+        point = np.asarray(point, dtype=np.float64)
+        best = [math.inf, -1]
+        self._query(point, 0, len(self.points), best)
+        return math.sqrt(best[0]), int(self.index[best[1]]) if best[1] >= 0 else -1
+
+    def _query(self, point: np.ndarray, lo: int, hi: int, best: list) -> None:
+        if hi - lo <= self.leaf_size:
+            if hi > lo:
+                distances = ((self.points[lo:hi] - point) ** 2).sum(axis=1)
+                nearest = int(distances.argmin())
+                if distances[nearest] < best[0]:
+                    best[0], best[1] = float(distances[nearest]), lo + nearest
+            return
+
+        mid = (lo + hi) // 2
+        split = self.points[mid]
+        distance = float(((split - point) ** 2).sum())
+        if distance < best[0]:
+            best[0], best[1] = distance, mid
+
+        diff = float(point[self._axis[mid]] - split[self._axis[mid]])
+        near, far = (
+            ((lo, mid), (mid + 1, hi)) if diff < 0 else ((mid + 1, hi), (lo, mid))
+        )
+        self._query(point, *near, best)
+        if diff * diff < best[0]:
+            self._query(point, *far, best)
+
+
+class OfflineGeocoder:
+    """
+    Reverse geocoder answering from a local GeoNames postal code dump
+    (tab separated: country code, postal code, place name, admin names/codes,
+    latitude, longitude, accuracy), e.g. https://download.geonames.org/export/zip/.
+    Countries are reported by their ISO code as listed in the file.
+    """
+
+    def __init__(self, places: list[GeocodeAddress], lat, long):
+        self.places = places
+        self.tree = KDTree(to_unit_vectors(lat, long))
+
+    @classmethod
+    def from_gazetteer(cls, path: str) -> "OfflineGeocoder":
+        places, lat, long = [], [], []
+        with open(path, encoding="utf-8", newline="") as f:
+            for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+                try:
+                    lat.append(float(row[9]))
+                    long.append(float(row[10]))
+                except (IndexError, ValueError):
+                    continue
+                places.append(
+                    GeocodeAddress(country=row[0], city=row[2], postcode=row[1])
+                )
+        logger.info(f"Loaded {len(places)} places from gazetteer {path}")
+        return cls(places, lat, long)
+
+    def reverse(self, lat: float, long: float) -> Optional[GeocodeAddress]:
+        """
+        Returns the nearest place, or None when the gazetteer has no place
+        within `REPORTING_GEOCODER_MAX_DISTANCE_KM`.
+        """
+        chord, i = self.tree.query(to_unit_vectors(lat, long))
+        if i < 0:
+            return None
+        distance_km = 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+        if distance_km > settings.REPORTING_GEOCODER_MAX_DISTANCE_KM:
+            return None
+        return self.places[i]
+
+
+_offline_geocoder: Optional[OfflineGeocoder] = None
+_lock = threading.Lock()
+
+
+def get_offline_geocoder() -> OfflineGeocoder:
+    """
+    Returns the process-wide offline geocoder, loading
+    `REPORTING_GEOCODER_GAZETTEER_PATH` on first use.
+    """
+    global _offline_geocoder
+    with _lock:
+        if _offline_geocoder is None:
+            _offline_geocoder = OfflineGeocoder.from_gazetteer(
+                settings.REPORTING_GEOCODER_GAZETTEER_PATH
+            )
+        return _offline_geocoder
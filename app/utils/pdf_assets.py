@@ -0,0 +1,165 @@
+import copy
+import io
+import logging
+import os
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from fontTools import ttLib
+from fpdf import FPDF
+from fpdf.fonts import SubsetMap, TTFFont
+from fpdf.image_datastructures import RasterImageInfo
+from fpdf.image_parsing import get_img_info
+
+from core import settings
+from utils.http_client import get_http_session
+
+logger = logging.getLogger(__name__)
+
+OPENAGRI_LOGO = "openagri_logo"
+EU_EMBLEM = "eu_emblem"
+
+
+def _asset_path(path: str) -> str:
+    return path if os.path.isabs(path) else os.path.join(settings.PROJECT_ROOT, path)
+
+
+def _load_logo() -> bytes:
+    path = _asset_path(settings.REPORTING_LOGO_PATH)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+    if not settings.REPORTING_LOGO_URL:
+        raise FileNotFoundError(
+            f"Logo {path} not found and REPORTING_LOGO_URL is not set."
+        )
+    logger.info(f"Logo {path} not found, downloading {settings.REPORTING_LOGO_URL}.")
+    response = get_http_session().get(
+        settings.REPORTING_LOGO_URL,
+        timeout=(
+            settings.REPORTING_HTTP_CONNECT_TIMEOUT,
+            settings.REPORTING_HTTP_READ_TIMEOUT,
+        ),
+    )
+    response.raise_for_status()
+    return response.content
+
+
+def _load_eu_emblem() -> bytes:
+    with open(_asset_path(os.path.join("assets", "eu.png")), "rb") as f:
+        return f.read()
+
+
+_loaders: Dict[str, Callable[[], bytes]] = {
+    OPENAGRI_LOGO: _load_logo,
+    EU_EMBLEM: _load_eu_emblem,
+}
+_decoded: Dict[str, Optional[RasterImageInfo]] = {}
+_lock = threading.Lock()
+
+
+def shared_image_info(name: str) -> Optional[RasterImageInfo]:
+    """
+    The decoded and compressed image data of a branding image, loaded once
+    per process. None when the image could not be loaded, it is not retried.
+    """
+    with _lock:
+        if name not in _decoded:
+            try:
+                _decoded[name] = get_img_info(name, io.BytesIO(_loaders[name]()))
+            except Exception as e:
+                logger.info(f"Branding image {name} could not be loaded. {e}")
+                _decoded[name] = None
+        return _decoded[name]
+
+
+def preload_shared_images() -> None:
+    for name in _loaders:
+        shared_image_info(name)
+
+
+def embed_shared_image(pdf: FPDF, name: str, **kwargs) -> bool:
+    """
+    Places a branding image like `FPDF.image`, without reading or decoding it
+    again. Each document gets its own copy of the image info, the data is
+    shared. Returns False when the image is not available.
+    """
+    info = shared_image_info(name)
+    if info is None:
+        return False
+    images = pdf.image_cache.images
+    if name not in images:
+        doc_info = RasterImageInfo(info)
+        doc_info["i"] = len(images) + 1
+        doc_info["usages"] = 0
+        doc_info["iccp_i"] = None
+        iccp = doc_info.get("iccp")
+        if iccp:
+            icc_profiles = pdf.image_cache.icc_profiles
+            doc_info["iccp_i"] = icc_profiles.setdefault(iccp, len(icc_profiles))
+            doc_info["iccp"] = None
+        images[name] = doc_info
+    pdf.image(name, **kwargs)
+    return True
+
+
+# Parsed once per (path, style), read-only afterwards
+_font_templates: Dict[Tuple[str, str], Tuple[TTFFont, bytes]] = {}
+_font_lock = threading.Lock()
+
+
+def _font_template(font_file_path: str, style: str) -> Tuple[TTFFont, bytes]:
+    key = (font_file_path, style)
+    with _font_lock:
+        if key not in _font_templates:
+            with open(font_file_path, "rb") as f:
+                data = f.read()
+            template = TTFFont(FPDF(), font_file_path, "", style)
+            template.close()
+            _font_templates[key] = template, data
+        return _font_templates[key]
+
+
+def add_shared_font(pdf: FPDF, family: str, style: str, font_file_path: str) -> None:
+    """
+    Adds a TrueType font like `FPDF.add_font`, with its metrics and character
+    map parsed once per process.
+    Each document gets its own fontTools font, read from the cached file data,
+    since subsetting on output modifies it.
+    """
+    style = "".join(sorted(style.upper()))
+    fontkey = f"{family.lower()}{style}"
+    if fontkey in pdf.fonts:
+        return
+    template, data = _font_template(font_file_path, style)
+
+    font = TTFFont.__new__(TTFFont)
+    for attr in (
+        "type",
+        "name",
+        "up",
+        "ut",
+        "scale",
+        "cmap",
+        "glyph_ids",
+        "emphasis",
+        "ttffile",
+    ):
+        setattr(font, attr, getattr(template, attr))
+    font.i = len(pdf.fonts) + 1
+    font.fontkey = fontkey
+    # Updated per document: output names the descriptor, unknown chars add widths
+    font.desc = copy.copy(template.desc)
+    font.cw = copy.copy(template.cw)
+    font.ttfont = ttLib.TTFont(
+        io.BytesIO(data), recalcTimestamp=False, fontNumber=0, lazy=True
+    )
+    font.missing_glyphs = []
+
+    # Same reserved characters as `TTFFont`
+    sbarr = "\x00 \r\n"
+    if pdf.str_alias_nb_pages:
+        sbarr += "0123456789"
+        sbarr += pdf.str_alias_nb_pages
+    font.subset = SubsetMap(font, [ord(char) for char in sbarr])
+    pdf.fonts[fontkey] = font
@@ -0,0 +1,135 @@
+import csv
+import io
+import json
+import re
+from typing import Any, Iterable, List, NamedTuple, Optional, Sequence
+
+from fpdf import FPDF
+from openpyxl import Workbook
+
+from schemas import ReportFormat
+from utils import atomic_report_file
+from utils.table_renderer import FastTable
+
+REPORT_MEDIA_TYPES = {
+    ReportFormat.PDF: "application/pdf",
+    ReportFormat.CSV: "text/csv",
+    ReportFormat.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ReportFormat.JSON: "application/json",
+}
+
+# Excel limits sheet titles to 31 characters without these
+_INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+
+
+class ReportTable(NamedTuple):
+    """
+    A table of a report as shown in the PDF, rows are produced lazily.
+    `styles` are per-column emphases (e.g. "B") only used when drawn in a PDF.
+    """
+
+    title: str
+    columns: List[str]
+    rows: Iterable[Sequence[Any]]
+    styles: Optional[List[Optional[str]]] = None
+
+
+def render_report_table(pdf: FPDF, table: ReportTable, **kwargs) -> None:
+    """
+    Draws the table in the PDF with a `FastTable`, keyword arguments are
+    passed on to it.
+    """
+    styles = table.styles or []
+    with FastTable(pdf, **kwargs) as fast_table:
+        row = fast_table.row()
+        for column in table.columns:
+            row.cell(column)
+        for values in table.rows:
+            row = fast_table.row()
+            for col, value in enumerate(values):
+                row.cell(value, style=styles[col] if col < len(styles) else None)
+
+
+def report_file_path(base_path: str, output_format: ReportFormat) -> str:
+    return f"{base_path}.{output_format.value}"
+
+
+def _cell(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+def _write_csv(f, tables: List[ReportTable]) -> None:
+    text = io.TextIOWrapper(f, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    for i, table in enumerate(tables):
+        if len(tables) > 1:
+            if i:
+                writer.writerow([])
+            writer.writerow([table.title])
+        writer.writerow(table.columns)
+        writer.writerows([_cell(value) for value in row] for row in table.rows)
+    text.flush()
+    text.detach()
+
+
+def _sheet_title(title: str, used: set) -> str:
+    base = _INVALID_SHEET_CHARS.sub(" ", title).strip()[:31] or "Sheet"
+    sheet_title, n = base, 1
+    while sheet_title.lower() in used:
+        n += 1
+        suffix = f" ({n})"
+        sheet_title = f"{base[:31 - len(suffix)]}{suffix}"
+    used.add(sheet_title.lower())
+    return sheet_title
+
+
+def _write_xlsx(f, tables: List[ReportTable]) -> None:
+    workbook = Workbook(write_only=True)
+    used = set()
+    for table in tables:
+        sheet = workbook.create_sheet(_sheet_title(table.title, used))
+        sheet.append(table.columns)
+        for row in table.rows:
+            sheet.append([_cell(value) for value in row])
+    if not tables:
+        workbook.create_sheet("Sheet")
+    workbook.save(f)
+
+
+def _write_json(f, tables: List[ReportTable]) -> None:
+    # Written row by row, the rows of large tables are never all in memory
+    f.write(b'{"tables": [')
+    for i, table in enumerate(tables):
+        if i:
+            f.write(b", ")
+        head = json.dumps({"title": table.title, "columns": table.columns})
+        f.write(f'{head[:-1]}, "rows": ['.encode())
+        for j, row in enumerate(table.rows):
+            if j:
+                f.write(b", ")
+            f.write(json.dumps([_cell(value) for value in row]).encode())
+        f.write(b"]}")
+    f.write(b"]}")
+
+
+_WRITERS = {
+    ReportFormat.CSV: _write_csv,
+    ReportFormat.XLSX: _write_xlsx,
+    ReportFormat.JSON: _write_json,
+}
+
+
+def write_report_tables(
+    tables: List[ReportTable], base_path: str, output_format: ReportFormat
+) -> None:
+    """
+    Writes the tables of a report in a machine-readable format to
+    `base_path` with the format's extension, atomically like the PDFs.
+
+    CSV: one table is written as is, several follow each other, each one
+    preceded by a row with its title and separated by an empty row.
+    XLSX: one sheet per table.
+    JSON: `{"tables": [{"title", "columns", "rows": [[...], ...]}, ...]}`.
+    """
+    with atomic_report_file(report_file_path(base_path, output_format)) as f:
+        _WRITERS[output_format](f, tables)
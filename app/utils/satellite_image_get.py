@@ -1,6 +1,25 @@
+import contextvars
 import io
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Tuple
+
 import requests
-from fastapi import HTTPException
+from PIL import Image
+
+from core import settings
+from utils.disk_cache import DiskLRUCache, content_key
+from utils.entity_cache import fetch_entity, get_cached
+from utils.http_client import get_http_session
+from utils.json_handler import fetch_paginated
+from utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
 # --- Service Definition ---
 # EOX Sentinel-2 Cloudless (Global, Commercial Use OK, CC BY 4.0)
 # This uses the 2016 layer, which is licensed for commercial use.
@@ -8,29 +27,215 @@ EOX_WMS_URL = "https://tiles.maps.eox.at/wms"
 EOX_LAYER = "s2cloudless"
 
 
+# The imagery layers are static, identical GetMap requests are served from disk
+wms_cache = DiskLRUCache(
+    settings.REPORTING_WMS_CACHE_DIR, settings.REPORTING_WMS_CACHE_MAX_BYTES
+)
+
+
 class SatelliteImageException(Exception):
     pass
 
-def fetch_wms_image(
-        lat: float,
-        lon: float,
-        wms_url: str = EOX_WMS_URL,
-        layer_name: str = EOX_LAYER,
-        size_degrees: float = 1.8,
-        width: int = 1600,
-        height: int = 1200
-):
+MM_PER_INCH = 25.4
+
+# Latency samples kept per provider, and needed before they set the hedge delay
+LATENCY_WINDOW = 100
+LATENCY_MIN_SAMPLES = 10
+
+
+def image_size_for_placement(
+        placement_width_mm: float, aspect_ratio: float = 4 / 3
+) -> Tuple[int, int]:
     """
-    Fetches an image from a standard WMS service.
+    Pixel size needed to embed an image `placement_width_mm` wide at
+    `REPORTING_WMS_DPI`, anything larger is never visible in the PDF.
     """
+    width = round(placement_width_mm / MM_PER_INCH * settings.REPORTING_WMS_DPI)
+    return width, round(width / aspect_ratio)
 
-    half_size = size_degrees / 200.0
-    min_lat = lat - half_size
-    max_lat = lat + half_size
-    min_lon = lon - half_size
-    max_lon = lon + half_size
 
-    bbox_1_3_0 = f"{min_lat},{min_lon},{max_lat},{max_lon}"
+def encode_for_embedding(image_bytes: bytes) -> bytes:
+    """
+    Re-encodes the image as JPEG when `REPORTING_WMS_JPEG_QUALITY` is set,
+    fpdf embeds JPEG data as is instead of re-compressing the pixels.
+    """
+    if not settings.REPORTING_WMS_JPEG_QUALITY:
+        return image_bytes
+    with Image.open(io.BytesIO(image_bytes)) as img:
+        return _encode_image(img)
+
+
+def _encode_image(img: Image.Image) -> bytes:
+    output = io.BytesIO()
+    if not settings.REPORTING_WMS_JPEG_QUALITY:
+        img.save(output, format="PNG")
+        return output.getvalue()
+    if img.mode in ("RGBA", "LA", "P", "PA"):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel("A"))
+        img = background
+    elif img.mode != "RGB":
+        img = img.convert("RGB")
+    img.save(
+        output, format="JPEG", quality=settings.REPORTING_WMS_JPEG_QUALITY, optimize=True
+    )
+    return output.getvalue()
+
+
+class ProviderLatency:
+    """
+    Recent successful response times of one WMS provider.
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.failures = 0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        The q-th percentile (0-100) of recent latencies, None until enough
+        samples were collected.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < LATENCY_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * q / 100))]
+
+
+# Concurrent reports of the same area share one download
+wms_flights = SingleFlight()
+
+provider_latencies: Dict[Tuple[str, str], ProviderLatency] = defaultdict(ProviderLatency)
+
+_hedge_executor = ThreadPoolExecutor(
+    max_workers=settings.REPORTING_WMS_HEDGE_WORKERS,
+    thread_name_prefix="wms-hedge",
+)
+
+
+def wms_providers() -> List[Tuple[str, str]]:
+    """
+    Configured (url, layer) providers, in order of preference.
+    """
+    return [
+        (provider["url"], provider.get("layer", EOX_LAYER))
+        for provider in settings.REPORTING_WMS_PROVIDERS
+    ]
+
+
+def hedge_delay(provider: Tuple[str, str]) -> float:
+    """
+    How long to wait on `provider` before asking the next one, the
+    `REPORTING_WMS_HEDGE_PERCENTILE` of its recent latencies.
+    """
+    latency = provider_latencies[provider].percentile(
+        settings.REPORTING_WMS_HEDGE_PERCENTILE
+    )
+    if latency is None:
+        latency = settings.REPORTING_WMS_HEDGE_DEFAULT_DELAY
+    return max(settings.REPORTING_WMS_HEDGE_MIN_DELAY, latency)
+
+
+def _fetch_from_provider(
+        provider: Tuple[str, str], wms_params: dict, cache_key: str
+) -> bytes:
+    wms_url, layer_name = provider
+    started = time.monotonic()
+    try:
+        response = get_http_session().get(
+            wms_url,
+            params={**wms_params, "LAYERS": layer_name},
+            timeout=(
+                settings.REPORTING_HTTP_CONNECT_TIMEOUT,
+                settings.REPORTING_WMS_READ_TIMEOUT,
+            ),
+        )
+        response.raise_for_status()
+
+        if 'image' not in response.headers.get('Content-Type', ''):
+            raise SatelliteImageException(
+                f"No imagery found or error from WMS: {response.text}"
+            )
+        image_bytes = encode_for_embedding(response.content)
+
+    except requests.exceptions.RequestException as e:
+        provider_latencies[provider].record_failure()
+        raise SatelliteImageException(f"Error fetching image from WMS: {e}")
+    except SatelliteImageException:
+        provider_latencies[provider].record_failure()
+        raise
+
+    provider_latencies[provider].record(time.monotonic() - started)
+    wms_cache.put(cache_key, image_bytes)
+    return image_bytes
+
+
+def _fetch_hedged(requests_: List[Tuple[Tuple[str, str], str]], wms_params: dict) -> bytes:
+    """
+    Asks the first provider and, whenever the latest one has not answered
+    within its hedge delay or all running ones failed, the next one as well.
+    The first good image wins, slower requests finish in the background and
+    still feed the cache and latency stats.
+    """
+    waiting = list(requests_)
+    running: Dict[Future, Tuple[str, str]] = {}
+    errors = []
+
+    def _launch():
+        provider, cache_key = waiting.pop(0)
+        future = _hedge_executor.submit(
+            _fetch_from_provider, provider, wms_params, cache_key
+        )
+        running[future] = provider
+        return provider
+
+    latest = _launch()
+    while running:
+        done, _ = wait(
+            running,
+            timeout=hedge_delay(latest) if waiting else None,
+            return_when=FIRST_COMPLETED,
+        )
+        for future in done:
+            provider = running.pop(future)
+            try:
+                return future.result()
+            except Exception as e:
+                logger.info(f"WMS provider {provider[0]} {provider[1]} failed. {e}")
+                errors.append(e)
+        if waiting and (not done or not running):
+            latest = _launch()
+
+    raise SatelliteImageException(f"Error fetching image from WMS: {errors}")
+
+
+def fetch_wms_bbox(
+        bbox: Tuple[float, float, float, float],
+        width: int,
+        height: int,
+        wms_url: Optional[str] = None,
+        layer_name: str = EOX_LAYER,
+) -> bytes:
+    """
+    Fetches the (min_lat, min_lon, max_lat, max_lon) area from a standard WMS
+    service as a `width` x `height` image.
+
+    Without `wms_url` the `REPORTING_WMS_PROVIDERS` are used, with hedged
+    requests to the next provider when one is slow or failing. Concurrent
+    requests for the same image share a single download.
+    """
+    bbox_1_3_0 = ",".join(str(value) for value in bbox)
     crs_1_3_0 = "EPSG:4326"
 
     #Define the WMS parameters
@@ -38,7 +243,6 @@ def fetch_wms_image(
         'SERVICE': 'WMS',
         'REQUEST': 'GetMap',
         'VERSION': '1.3.0',
-        'LAYERS': layer_name,
         'STYLES': '',
         'FORMAT': 'image/png',
         'TRANSPARENT': 'true',
@@ -48,17 +252,244 @@ def fetch_wms_image(
         'HEIGHT': height
     }
 
-    try:
-        response = requests.get(wms_url, params=wms_params, timeout=20)
-        response.raise_for_status()
+    providers = [(wms_url, layer_name)] if wms_url else wms_providers()
+    if not providers:
+        raise SatelliteImageException("No WMS provider configured.")
 
-        if 'image' not in response.headers.get('Content-Type', ''):
-            raise HTTPException(
-                status_code=404,
-                detail=f"No imagery found or error from WMS: {response.text}"
+    requests_ = []
+    for provider in providers:
+        cache_key = content_key(
+            *provider,
+            bbox_1_3_0,
+            width,
+            height,
+            wms_params["FORMAT"],
+            settings.REPORTING_WMS_JPEG_QUALITY,
+        )
+        cached = wms_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        requests_.append((provider, cache_key))
+
+    def _fetch() -> bytes:
+        if len(requests_) == 1:
+            provider, cache_key = requests_[0]
+            return _fetch_from_provider(provider, wms_params, cache_key)
+        return _fetch_hedged(requests_, wms_params)
+
+    return wms_flights.do(requests_[0][1], _fetch)
+
+
+def parcel_bbox(
+        lat: float, lon: float, size_degrees: float = 1.8
+) -> Tuple[float, float, float, float]:
+    """
+    The (min_lat, min_lon, max_lat, max_lon) area shown around a parcel.
+    """
+    half_size = size_degrees / 200.0
+    return lat - half_size, lon - half_size, lat + half_size, lon + half_size
+
+
+def fetch_wms_image(
+        lat: float,
+        lon: float,
+        wms_url: Optional[str] = None,
+        layer_name: str = EOX_LAYER,
+        size_degrees: float = 1.8,
+        width: int = 1600,
+        height: int = 1200,
+        placement_width_mm: Optional[float] = None,
+):
+    """
+    Fetches the image around a location, see `fetch_wms_bbox`.
+
+    With `placement_width_mm` the requested size is derived from the width
+    the image takes in the PDF instead of `width` and `height`.
+    """
+    if placement_width_mm:
+        width, height = image_size_for_placement(placement_width_mm, width / height)
+
+    return fetch_wms_bbox(
+        parcel_bbox(lat, lon, size_degrees), width, height, wms_url, layer_name
+    )
+
+
+class FarmMosaic:
+    """
+    One image covering the views of all parcels of a farm, parcel views are
+    cropped from it locally instead of being fetched one by one.
+    """
+
+    def __init__(
+            self,
+            bbox: Tuple[float, float, float, float],
+            image_bytes: bytes,
+            size_degrees: float,
+            width: int,
+            height: int,
+    ):
+        self.bbox = bbox
+        self.image_bytes = image_bytes
+        self.size_degrees = size_degrees
+        self.width = width
+        self.height = height
+
+    def crop(self, lat: float, lon: float) -> bytes:
+        """
+        The view around (lat, lon), in the size `fetch_wms_image` would return.
+        """
+        min_lat, min_lon, max_lat, max_lon = self.bbox
+        view_min_lat, view_min_lon, view_max_lat, view_max_lon = parcel_bbox(
+            lat, lon, self.size_degrees
+        )
+        with Image.open(io.BytesIO(self.image_bytes)) as img:
+            x_scale = img.width / (max_lon - min_lon)
+            y_scale = img.height / (max_lat - min_lat)
+            box = (
+                round((view_min_lon - min_lon) * x_scale),
+                round((max_lat - view_max_lat) * y_scale),
+                round((view_max_lon - min_lon) * x_scale),
+                round((max_lat - view_min_lat) * y_scale),
             )
+            view = img.crop(box).resize((self.width, self.height), Image.LANCZOS)
+        return _encode_image(view)
 
-        return response.content
 
-    except requests.exceptions.RequestException as e:
-        raise SatelliteImageException(f"Error fetching image from WMS: {e}")
\ No newline at end of file
+def farm_mosaic_bbox(
+        locations: List[Tuple[float, float]], size_degrees: float = 1.8
+) -> Tuple[float, float, float, float]:
+    """
+    Union of the parcel views around the given (lat, lon) locations.
+    """
+    boxes = [parcel_bbox(lat, lon, size_degrees) for lat, lon in locations]
+    return (
+        min(box[0] for box in boxes),
+        min(box[1] for box in boxes),
+        max(box[2] for box in boxes),
+        max(box[3] for box in boxes),
+    )
+
+
+def fetch_farm_mosaic(
+        locations: List[Tuple[float, float]],
+        size_degrees: float = 1.8,
+        width: int = 1600,
+        height: int = 1200,
+        placement_width_mm: Optional[float] = None,
+) -> Optional[FarmMosaic]:
+    """
+    Fetches one image covering the views around all `locations`, at the
+    resolution `fetch_wms_image` would use for a single view.
+    Returns None when the mosaic would exceed `REPORTING_WMS_MOSAIC_MAX_PIXELS`
+    per side, views are then better fetched one by one.
+    """
+    if not locations:
+        return None
+    if placement_width_mm:
+        width, height = image_size_for_placement(placement_width_mm, width / height)
+
+    bbox = farm_mosaic_bbox(sorted(set(locations)), size_degrees)
+    view_degrees = size_degrees / 100.0
+    mosaic_width = round((bbox[3] - bbox[1]) / view_degrees * width)
+    mosaic_height = round((bbox[2] - bbox[0]) / view_degrees * height)
+    if max(mosaic_width, mosaic_height) > settings.REPORTING_WMS_MOSAIC_MAX_PIXELS:
+        return None
+
+    image_bytes = fetch_wms_bbox(bbox, mosaic_width, mosaic_height)
+    return FarmMosaic(bbox, image_bytes, size_degrees, width, height)
+
+
+def _farm_parcel_locations(farm_id: str, token) -> List[Tuple[float, float]]:
+    """
+    Locations of all parcels of a farm, through the entity cache.
+    """
+    def _load() -> list:
+        parcels = fetch_paginated(
+            url=f"{settings.REPORTING_FARMCALENDAR_BASE_URL}{settings.REPORTING_FARMCALENDAR_URLS['parcel']}",
+            params={"farm": farm_id, "format": "json"},
+            token=token,
+        )
+        return [
+            (location["lat"], location["long"])
+            for parcel in parcels
+            for location in [parcel.get("location") or {}]
+            if ((parcel.get("farm") or {}).get("@id") or "").split(":")[-1] == farm_id
+            and location.get("lat") and location.get("long")
+        ]
+
+    return get_cached("farm_parcels", farm_id, token, _load)
+
+
+def fetch_parcel_image(parcel: dict, token, placement_width_mm: float) -> Optional[bytes]:
+    """
+    The satellite image of a Farm Calendar parcel. With
+    `REPORTING_WMS_FARM_MOSAIC` it is cropped from the mosaic of the parcel's
+    farm, which is fetched once for all parcels of the farm.
+    """
+    location = parcel.get("location") or {}
+    if not location.get("lat") or not location.get("long"):
+        return None
+    lat, lon = location["lat"], location["long"]
+
+    farm_id = ((parcel.get("farm") or {}).get("@id") or "").split(":")[-1]
+    if settings.REPORTING_WMS_FARM_MOSAIC and farm_id:
+        locations = _farm_parcel_locations(farm_id, token)
+        if (lat, lon) in locations:
+            mosaic = fetch_farm_mosaic(locations, placement_width_mm=placement_width_mm)
+            if mosaic is not None:
+                return mosaic.crop(lat, lon)
+
+    return fetch_wms_image(lat, lon, placement_width_mm=placement_width_mm)
+
+
+_prefetch_executor = ThreadPoolExecutor(
+    max_workers=settings.REPORTING_WMS_PREFETCH_WORKERS,
+    thread_name_prefix="wms-prefetch",
+)
+
+
+def prefetch_parcel_image(
+        parcel_id: Optional[str], token, placement_width_mm: float
+) -> Optional[Future]:
+    """
+    Starts fetching the satellite image of a parcel in the background, so it
+    downloads while the report collects its Farm Calendar data.
+    The parcel lookup goes through the entity cache and report job memo, the
+    report's own parcel lookup reuses it. Returns None when there is nothing
+    to prefetch.
+    """
+    if not parcel_id or not settings.REPORTING_USING_GATEKEEPER:
+        return None
+
+    def _fetch() -> Optional[bytes]:
+        parcel = fetch_entity("parcel", parcel_id, token) or {}
+        return fetch_parcel_image(parcel, token, placement_width_mm)
+
+    return _prefetch_executor.submit(contextvars.copy_context().run, _fetch)
+
+
+def prefetch_wms_image(lat: float, lon: float, placement_width_mm: float) -> Future:
+    """
+    Starts `fetch_wms_image` for known coordinates in the background.
+    """
+    return _prefetch_executor.submit(
+        contextvars.copy_context().run,
+        fetch_wms_image,
+        lat,
+        lon,
+        placement_width_mm=placement_width_mm,
+    )
+
+
+def collect_prefetched_image(image: Future) -> Optional[bytes]:
+    """
+    Returns the prefetched image bytes, or None when the download failed or
+    is not done within `REPORTING_WMS_PREFETCH_DEADLINE` seconds.
+    """
+    try:
+        return image.result(timeout=settings.REPORTING_WMS_PREFETCH_DEADLINE)
+    except FutureTimeoutError:
+        logger.info("Satellite image not ready in time, continue without image.")
+    except Exception as e:
+        logger.info(f"Satellite image issue happened, continue without image. {e}")
+    return None
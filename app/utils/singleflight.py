@@ -0,0 +1,72 @@
+import asyncio
+import copy
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Coalesces identical calls that are in flight at the same time.
+
+    The first caller for a key (the leader) performs the call, callers arriving
+    while it runs wait for its result instead of issuing their own. Works for
+    both worker threads (`do`) and event loops (`do_async`), a thread may wait
+    on a flight led by a coroutine and the other way around.
+    Followers receive a deep copy of the result so report jobs can't affect
+    each other's data.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = Future()
+            # A running future can't be cancelled by a departing follower
+            flight.set_running_or_notify_cancel()
+            self._flights[key] = flight
+            return flight, True
+
+    def _land(self, key: Hashable, flight: Future) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        flight, leader = self._join(key)
+        if not leader:
+            return copy.deepcopy(flight.result())
+        try:
+            result = fn()
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            self._land(key, flight)
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        flight, leader = self._join(key)
+        if not leader:
+            return copy.deepcopy(await asyncio.wrap_future(flight))
+        try:
+            result = await fn()
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            self._land(key, flight)
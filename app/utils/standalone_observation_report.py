@@ -2,20 +2,27 @@ import datetime
 import io
 import json
 import logging
-import os
+from concurrent.futures import Future
 from typing import List, Optional
 
 from fastapi import HTTPException
-from fpdf.enums import VAlign
 
 from core import settings
-from schemas import CropObservation, ManualFarmInfo, ManualParcelInfo
-from utils import EX, add_fonts
-from utils.satellite_image_get import SatelliteImageException, fetch_wms_image
+from schemas import CropObservation, ManualFarmInfo, ManualParcelInfo, ReportFormat
+from utils import EX, add_fonts, write_pdf
+from utils.report_tables import ReportTable, render_report_table, write_report_tables
+from utils.satellite_image_get import (
+    SatelliteImageException,
+    collect_prefetched_image,
+    fetch_wms_image,
+    prefetch_wms_image,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SATELLITE_IMAGE_WIDTH_MM = 100
+
 
 def _parse_observations(raw) -> List[CropObservation]:
     if not isinstance(raw, list):
@@ -39,6 +46,7 @@ def _render_farm_details(
     farm: ManualFarmInfo,
     from_date: Optional[datetime.date],
     to_date: Optional[datetime.date],
+    satellite_image: Optional[Future] = None,
 ):
     today = datetime.datetime.now().strftime("%d/%m/%Y")
     from_date_local = from_date.strftime("%Y-%m-%d") if from_date else today
@@ -73,16 +81,57 @@ def _render_farm_details(
 
     if parcel.lat is not None and parcel.lng is not None:
         try:
-            image_bytes = fetch_wms_image(parcel.lat, parcel.lng)
-            image_file = io.BytesIO(image_bytes)
-            pdf.ln(2)
-            x_start = (pdf.w - 100) / 2
-            pdf.set_x(x_start)
-            pdf.image(image_file, type="png", w=100)
+            if satellite_image is not None:
+                image_bytes = collect_prefetched_image(satellite_image)
+            else:
+                image_bytes = fetch_wms_image(
+                    parcel.lat, parcel.lng, placement_width_mm=SATELLITE_IMAGE_WIDTH_MM
+                )
+            if image_bytes:
+                image_file = io.BytesIO(image_bytes)
+                pdf.ln(2)
+                x_start = (pdf.w - SATELLITE_IMAGE_WIDTH_MM) / 2
+                pdf.set_x(x_start)
+                pdf.image(image_file, w=SATELLITE_IMAGE_WIDTH_MM)
         except SatelliteImageException:
             logger.info("Satellite image issue happened, continue without image.")
 
 
+def _sort_observations(observations: List[CropObservation]) -> List[CropObservation]:
+    return sorted(
+        observations,
+        key=lambda o: o.hasStartDatetime
+        or o.phenomenonTime
+        or datetime.datetime.min,
+    )
+
+
+def _observation_rows(observations: List[CropObservation]):
+    for obs in observations:
+        start = obs.hasStartDatetime or obs.phenomenonTime
+        end = obs.hasEndDatetime
+        start_str = start.strftime("%d/%m/%Y") if start else ""
+        end_str = end.strftime("%d/%m/%Y") if end else ""
+        value = obs.hasResult.hasValue if obs.hasResult and obs.hasResult.hasValue else ""
+        unit = obs.hasResult.unit if obs.hasResult and obs.hasResult.unit else ""
+        yield [
+            f"{start_str} - {end_str}".strip(" -"),
+            obs.observedProperty or "",
+            str(value),
+            unit,
+            obs.responsibleAgent or "",
+            obs.details or "",
+        ]
+
+
+def observation_table(observations: List[CropObservation]) -> ReportTable:
+    return ReportTable(
+        "Observations",
+        ["Start - End", "Observed Property", "Value", "Unit", "Responsible Agent", "Details"],
+        _observation_rows(_sort_observations(observations)),
+    )
+
+
 def _render_observation_table(pdf: EX, observations: List[CropObservation]):
     if not observations:
         pdf.ln(4)
@@ -90,12 +139,6 @@ def _render_observation_table(pdf: EX, observations: List[CropObservation]):
         pdf.cell(0, 8, "No observations provided.", ln=True)
         return
 
-    observations.sort(
-        key=lambda o: o.hasStartDatetime
-        or o.phenomenonTime
-        or datetime.datetime.min
-    )
-
     pdf.add_page()
     pdf.set_font("FreeSerif", "B", 15)
     pdf.set_x((pdf.w / 4) - 30)
@@ -103,31 +146,7 @@ def _render_observation_table(pdf: EX, observations: List[CropObservation]):
     pdf.ln(4)
 
     pdf.set_fill_color(0, 255, 255)
-    with pdf.table(text_align="CENTER", padding=0.5, v_align=VAlign.M) as table:
-        row = table.row()
-        pdf.set_font("FreeSerif", "B", 10)
-        row.cell("Start - End")
-        row.cell("Observed Property")
-        row.cell("Value")
-        row.cell("Unit")
-        row.cell("Responsible Agent")
-        row.cell("Details")
-        pdf.set_font("FreeSerif", "", 9)
-        pdf.set_fill_color(255, 255, 240)
-        for obs in observations:
-            row = table.row()
-            start = obs.hasStartDatetime or obs.phenomenonTime
-            end = obs.hasEndDatetime
-            start_str = start.strftime("%d/%m/%Y") if start else ""
-            end_str = end.strftime("%d/%m/%Y") if end else ""
-            row.cell(f"{start_str} - {end_str}".strip(" -"))
-            row.cell(obs.observedProperty or "")
-            value = obs.hasResult.hasValue if obs.hasResult and obs.hasResult.hasValue else ""
-            unit = obs.hasResult.unit if obs.hasResult and obs.hasResult.unit else ""
-            row.cell(str(value))
-            row.cell(unit)
-            row.cell(obs.responsibleAgent or "")
-            row.cell(obs.details or "")
+    render_report_table(pdf, observation_table(observations), padding=0.5)
 
 
 def create_standalone_observation_pdf(
@@ -137,6 +156,7 @@ def create_standalone_observation_pdf(
     title: str,
     from_date: Optional[datetime.date],
     to_date: Optional[datetime.date],
+    satellite_image: Optional[Future] = None,
 ) -> EX:
     pdf = EX()
     add_fonts(pdf)
@@ -163,7 +183,7 @@ def create_standalone_observation_pdf(
     pdf.ln(5)
 
     pdf.set_fill_color(240, 240, 240)
-    _render_farm_details(pdf, parcel, farm, from_date, to_date)
+    _render_farm_details(pdf, parcel, farm, from_date, to_date, satellite_image)
     _render_observation_table(pdf, observations)
     pdf.ln(10)
     return pdf
@@ -177,7 +197,14 @@ def process_standalone_observation_data(
     title: str = "Observation Report",
     from_date: Optional[datetime.date] = None,
     to_date: Optional[datetime.date] = None,
+    output_format: ReportFormat = ReportFormat.PDF,
 ) -> None:
+    satellite_image = None
+    if output_format == ReportFormat.PDF and parcel.lat is not None and parcel.lng is not None:
+        satellite_image = prefetch_wms_image(
+            parcel.lat, parcel.lng, placement_width_mm=SATELLITE_IMAGE_WIDTH_MM
+        )
+
     try:
         if not data:
             raise HTTPException(
@@ -194,6 +221,11 @@ def process_standalone_observation_data(
             )
 
         observations = _parse_observations(payload)
+        pdf_dir = f"{settings.PDF_DIRECTORY}{pdf_file_name}"
+
+        if output_format != ReportFormat.PDF:
+            write_report_tables([observation_table(observations)], pdf_dir, output_format)
+            return
 
         pdf = create_standalone_observation_pdf(
             observations=observations,
@@ -202,10 +234,9 @@ def process_standalone_observation_data(
             title=title,
             from_date=from_date,
             to_date=to_date,
+            satellite_image=satellite_image,
         )
-        pdf_dir = f"{settings.PDF_DIRECTORY}{pdf_file_name}"
-        os.makedirs(os.path.dirname(f"{pdf_dir}.pdf"), exist_ok=True)
-        pdf.output(f"{pdf_dir}.pdf")
+        write_pdf(pdf, f"{pdf_dir}.pdf")
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,248 @@
+from typing import Dict, List, Optional, Tuple
+
+from fpdf import FPDF
+
+# Cached word widths per font, cleared when a table renders a lot of unique text
+MAX_CACHED_WIDTHS = 50_000
+
+
+class TableRow:
+    """
+    Cells of one `FastTable` row, filled like the rows of `FPDF.table`.
+    """
+
+    __slots__ = ("cells", "styles")
+
+    def __init__(self):
+        self.cells: List[str] = []
+        self.styles: List[Optional[str]] = []
+
+    def cell(self, text: Optional[str] = None, style: Optional[str] = None) -> None:
+        """
+        Adds a cell, `style` is an emphasis like "B" overriding the row's.
+        """
+        self.cells.append("" if text is None else str(text))
+        self.styles.append(style)
+
+
+class FastTable:
+    """
+    Renderer for long report tables, used like `FPDF.table`.
+
+    The first row is the heading, in bold and repeated on every page.
+    Column widths are computed once from the heading and the first
+    `sample_size` rows, after that rows are drawn as they are added.
+    Text is wrapped with cached word widths and drawn with plain text and
+    line operators, the font is only switched when a cell's style differs
+    from the previous one.
+    """
+
+    def __init__(
+        self,
+        pdf: FPDF,
+        font_family: str = "FreeSerif",
+        font_size: float = 9,
+        heading_font_size: float = 10,
+        padding: float = 0.5,
+        text_align: str = "CENTER",
+        sample_size: int = 50,
+    ):
+        self.pdf = pdf
+        self.font_family = font_family.lower()
+        self.font_size = font_size
+        self.heading_font_size = heading_font_size
+        self.padding = padding
+        self.text_align = text_align.upper()
+        self.sample_size = sample_size
+
+        self.heading: Optional[TableRow] = None
+        self.col_widths: Optional[List[float]] = None
+        self.rows_rendered = 0
+        self._pending: List[TableRow] = []
+        self._row: Optional[TableRow] = None
+        self._word_widths: Dict[Tuple[str, float], Dict[str, float]] = {}
+
+    def __enter__(self) -> "FastTable":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.flush()
+
+    def row(self) -> TableRow:
+        self._add_previous()
+        self._row = TableRow()
+        return self._row
+
+    def flush(self) -> None:
+        """
+        Draws all rows added so far.
+        """
+        self._add_previous()
+        if self.heading is None:
+            return
+        if self.col_widths is None:
+            self.col_widths = self._compute_col_widths()
+            self._draw(self.heading, heading=True)
+        for row in self._pending:
+            self._draw(row)
+        self._pending = []
+        self.pdf.set_x(self.pdf.l_margin)
+
+    def _add_previous(self) -> None:
+        row, self._row = self._row, None
+        if row is None:
+            return
+        if self.heading is None:
+            self.heading = row
+            return
+        self._pending.append(row)
+        if self.col_widths is not None or len(self._pending) >= self.sample_size:
+            self.flush()
+
+    # Measuring
+
+    def _style(self, row: TableRow, col: int, heading: bool) -> Tuple[str, float]:
+        style = row.styles[col] if col < len(row.styles) else None
+        if heading:
+            return style if style is not None else "B", self.heading_font_size
+        return style or "", self.font_size
+
+    def _width(self, text: str, font: Tuple[str, float]) -> float:
+        widths = self._word_widths.setdefault(font, {})
+        width = widths.get(text)
+        if width is None:
+            if len(widths) > MAX_CACHED_WIDTHS:
+                widths.clear()
+            style, size = font
+            _, width = self.pdf.fonts[f"{self.font_family}{style}"].get_text_width(
+                text, size, None
+            )
+            width = widths[text] = width / self.pdf.k
+        return width
+
+    def _compute_col_widths(self) -> List[float]:
+        rows = [(self.heading, True)] + [(row, False) for row in self._pending]
+        columns = max(len(row.cells) for row, _ in rows)
+        natural = [0.0] * columns
+        minimal = [0.0] * columns
+        for row, heading in rows:
+            for col, text in enumerate(row.cells):
+                font = self._style(row, col, heading)
+                for line in text.split("\n"):
+                    natural[col] = max(natural[col], self._width(line, font))
+                    for word in line.split(" "):
+                        minimal[col] = max(minimal[col], self._width(word, font))
+
+        available = self.pdf.epw - 2 * self.padding * columns
+        if sum(natural) <= available:
+            widths = natural
+        elif sum(minimal) <= available:
+            # Every column gets its longest word, the space left is shared
+            # evenly, columns needing less than their share keep one line
+            widths = list(minimal)
+            remaining = available - sum(minimal)
+            wrapping = [col for col in range(columns) if natural[col] > minimal[col]]
+            while wrapping:
+                share = remaining / len(wrapping)
+                fitting = [
+                    col for col in wrapping if natural[col] - widths[col] <= share
+                ]
+                if not fitting:
+                    for col in wrapping:
+                        widths[col] += share
+                    break
+                for col in fitting:
+                    remaining -= natural[col] - widths[col]
+                    widths[col] = natural[col]
+                    wrapping.remove(col)
+        else:
+            widths = minimal
+        total = sum(widths) or columns
+        return [available * (width or 1) / total + 2 * self.padding for width in widths]
+
+    def _wrap(self, text: str, width: float, font: Tuple[str, float]) -> List[str]:
+        lines = []
+        space = self._width(" ", font)
+        for paragraph in text.split("\n"):
+            line, line_width = "", 0.0
+            for word in paragraph.split(" "):
+                word_width = self._width(word, font)
+                if line and line_width + space + word_width <= width:
+                    line, line_width = f"{line} {word}", line_width + space + word_width
+                    continue
+                if line:
+                    lines.append(line)
+                while word_width > width and len(word) > 1:
+                    cut = self._fitting_chars(word, width, font)
+                    lines.append(word[:cut])
+                    word = word[cut:]
+                    word_width = self._width(word, font)
+                line, line_width = word, word_width
+            lines.append(line)
+        return lines
+
+    def _fitting_chars(self, word: str, width: float, font: Tuple[str, float]) -> int:
+        used = 0.0
+        for i, char in enumerate(word):
+            used += self._width(char, font)
+            if used > width:
+                return max(i, 1)
+        return len(word)
+
+    # Drawing
+
+    def _set_font(self, font: Tuple[str, float]) -> None:
+        pdf = self.pdf
+        if (pdf.font_family, pdf.font_style, pdf.font_size_pt) != (
+            self.font_family,
+            *font,
+        ):
+            pdf.set_font(self.font_family, *font)
+
+    def _draw(self, row: TableRow, heading: bool = False) -> None:
+        pdf = self.pdf
+        cells = []
+        lines_count = 1
+        for col, width in enumerate(self.col_widths):
+            text = row.cells[col] if col < len(row.cells) else ""
+            font = self._style(row, col, heading)
+            lines = self._wrap(text, width - 2 * self.padding, font) if text else []
+            lines_count = max(lines_count, len(lines))
+            cells.append((lines, font))
+
+        line_height = 2 * self.font_size / pdf.k
+        height = lines_count * line_height + 2 * self.padding
+        if pdf.y + height > pdf.page_break_trigger and pdf.y > pdf.t_margin:
+            pdf.add_page()
+            if not heading:
+                self._draw(self.heading, heading=True)
+
+        x, y = pdf.l_margin, pdf.y
+        pdf.rect(x, y, sum(self.col_widths), height)
+        for width in self.col_widths[:-1]:
+            x += width
+            pdf.line(x, y, x, y + height)
+
+        x = pdf.l_margin
+        for width, (lines, font) in zip(self.col_widths, cells):
+            if lines:
+                self._set_font(font)
+                top = y + (height - len(lines) * line_height) / 2
+                baseline = 0.5 * line_height + 0.3 * font[1] / pdf.k
+                for i, line in enumerate(lines):
+                    if self.text_align == "LEFT":
+                        line_x = x + self.padding
+                    else:
+                        free = width - 2 * self.padding - self._width(line, font)
+                        line_x = (
+                            x
+                            + self.padding
+                            + (free / 2 if self.text_align == "CENTER" else free)
+                        )
+                    pdf.text(line_x, top + i * line_height + baseline, line)
+            x += width
+
+        pdf.set_y(y + height)
+        if not heading:
+            self.rows_rendered += 1
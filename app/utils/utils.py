@@ -1,39 +1,56 @@
 import datetime
+import io
 import logging
 import os
+import tempfile
+from contextlib import contextmanager
+from functools import partial
+from typing import BinaryIO, Iterator, List, Union
 
 import jwt
 from fpdf import FPDF
 from pydantic import BaseModel
+from pypdf import PdfReader, PdfWriter
 
 from core import settings
-from utils.json_handler import make_get_request
-from geopy.geocoders import Nominatim
+from utils.entity_cache import fetch_entity
+from utils.geocoding import GeocodingService, reverse_geocode
+from utils.json_handler import fetch_paginated_async, run_concurrently
+from utils.pdf_assets import (
+    EU_EMBLEM,
+    OPENAGRI_LOGO,
+    add_shared_font,
+    embed_shared_image,
+)
 
 logger = logging.Logger("utils")
 
+PDF_WRITE_CHUNK_SIZE = 1024 * 1024
+
+LOGO_WIDTH = 40.0
+LOGO_ASPECT_RATIO = 338 / 1024
+
 
 def add_fonts(pdf):
     fonts_folder_path = os.path.join(
         os.path.dirname(os.path.abspath(__file__)), "fonts"
     )
 
-    pdf.add_font(
-        "FreeSerif", "", os.path.join(fonts_folder_path, "FreeSerif.ttf"), uni=True
+    add_shared_font(
+        pdf, "FreeSerif", "", os.path.join(fonts_folder_path, "FreeSerif.ttf")
     )
-    pdf.add_font(
-        "FreeSerif", "B", os.path.join(fonts_folder_path, "FreeSerifBold.ttf"), uni=True
+    add_shared_font(
+        pdf, "FreeSerif", "B", os.path.join(fonts_folder_path, "FreeSerifBold.ttf")
     )
 
 
 class EX(FPDF):
     def header(self):
-        self.image(
-            "https://horizon-openagri.eu/wp-content/uploads/2023/12/Logo-Open-Agri-blue-1024x338.png",
-            w=40.0,
-            keep_aspect_ratio=True,
-            x=160,
-        )
+        if not embed_shared_image(
+            self, OPENAGRI_LOGO, w=LOGO_WIDTH, keep_aspect_ratio=True, x=160
+        ):
+            # Keep the layout of the logo, the report is still usable without it
+            self.set_y(self.y + LOGO_WIDTH * LOGO_ASPECT_RATIO)
 
     def footer(self):
         self.set_y(-15)
@@ -42,12 +59,64 @@ class EX(FPDF):
             \tOpenAgri has received funding from the EU's Horizon Europe research and  innovation programme under Grant Agreement no. 101134083. This output reflects
             only the author's view and the European Commission cannot be held responsible for any use that may be made of the information contained therein.
         """
-        image_path = os.path.join(settings.PROJECT_ROOT, "assets", "eu.png")
-        self.image(image_path, x=self.x, y=self.y, w=20)
+        embed_shared_image(self, EU_EMBLEM, x=self.x, y=self.y, w=20)
         self.set_x(self.get_x()+10)
         self.multi_cell(200, 2, acknowledgement_text, border=0, align="J")
 
 
+def merge_pdfs(documents: List[bytes]) -> bytes:
+    """
+    Concatenates rendered PDF documents, keeping the outline of each one
+    pointing at its pages in the merged document.
+    """
+    writer = PdfWriter()
+    for document in documents:
+        writer.append(PdfReader(io.BytesIO(document)), import_outline=True)
+    merged = io.BytesIO()
+    writer.write(merged)
+    return merged.getvalue()
+
+
+@contextmanager
+def atomic_report_file(path: str) -> Iterator[BinaryIO]:
+    """
+    Opens a temporary file in the directory of `path` for writing, moved to
+    `path` with an atomic rename once the block completes, so a report is
+    either complete or not there yet. Nothing is left behind on errors.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    suffix = os.path.splitext(path)[1]
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=f"{suffix}.tmp")
+    try:
+        with os.fdopen(fd, "wb", buffering=PDF_WRITE_CHUNK_SIZE) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_pdf(pdf: Union[FPDF, bytes], path: str) -> None:
+    """
+    Writes the PDF, or an already rendered document, to `path` atomically.
+    The rendered document is written in chunks without copying it.
+    """
+    document = memoryview(pdf if isinstance(pdf, (bytes, bytearray)) else pdf.output())
+    try:
+        with atomic_report_file(path) as f:
+            for offset in range(0, len(document), PDF_WRITE_CHUNK_SIZE):
+                f.write(document[offset:offset + PDF_WRITE_CHUNK_SIZE])
+    finally:
+        document.release()
+
+
 def decode_jwt_token(token: str) -> dict:
     """
     Decode JWT token
@@ -92,7 +161,7 @@ class ParcelInfo(BaseModel):
 
 
 def get_parcel_info(
-    parcel_id: str, token: dict, geolocator: Nominatim, identifier_flag: bool = False
+    parcel_id: str, token: dict, geolocator: GeocodingService, identifier_flag: bool = False
 ):
     farm = FarmInfo(
         description="",
@@ -109,11 +178,7 @@ def get_parcel_info(
             return parcel_info, farm, identifier
         else:
             return parcel_info, farm
-    farm_parcel_info = make_get_request(
-        url=f'{settings.REPORTING_FARMCALENDAR_BASE_URL}{settings.REPORTING_FARMCALENDAR_URLS["parcel"]}{parcel_id}/',
-        token=token,
-        params={"format": "json"},
-    )
+    farm_parcel_info = fetch_entity("parcel", parcel_id, token)
 
     if not farm_parcel_info:
         if identifier_flag:
@@ -128,11 +193,7 @@ def get_parcel_info(
     if farm_id:
         farm_id = farm_id.split(":")[-1]
     if farm_id:
-        farm_info = make_get_request(
-            url=f'{settings.REPORTING_FARMCALENDAR_BASE_URL}{settings.REPORTING_FARMCALENDAR_URLS["farm"]}{farm_id}/',
-            token=token,
-            params={"format": "json"},
-        )
+        farm_info = fetch_entity("farm", farm_id, token)
 
         contact = farm_info.get("contactPerson") or {}
         farm = FarmInfo(
@@ -149,16 +210,9 @@ def get_parcel_info(
         if location:
             lat = location.get('lat')
             long = location.get('long')
-            coordinates = f"{lat}, {long}"
             parcel_info.lat = lat
             parcel_info.long = long
-            l_info = geolocator.reverse(coordinates)
-            address_details = l_info.raw.get("address", {})
-            city = address_details.get("city") or ""
-            country = address_details.get("country") or ""
-            postcode = address_details.get("postcode") or ""
-            address = f"Country: {country} | City: {city} | Postcode: {postcode}"
-            parcel_info.address = address
+            parcel_info.address = reverse_geocode(lat, long, geolocator)
     except Exception as e:
         logger.error("Error with geolocator", e)
         if identifier_flag:
@@ -177,32 +231,48 @@ def get_farm_operation_data(
     Fetches observations and material-related data for a farm operation.
 
     """
-    base_url = settings.REPORTING_FARMCALENDAR_BASE_URL
-    urls = settings.REPORTING_FARMCALENDAR_URLS
-
-    # Fetch and append observations
-    obs_url = f'{base_url}{urls["operations"]}{id}{urls["observations"]}'
-    observations_local = make_get_request(url=obs_url, token=token, params=params)
-    if observations_local:
-        observations.extend(observations_local)
+    get_farm_operations_data([id], token, params, observations, materials)
 
-    # Fetch and append materials
-    material_url = f'{base_url}{urls["operations"]}{id}{urls["materials"]}'
-    materials_partials = make_get_request(url=material_url, token=token, params=params)
-    if materials_partials:
-        materials.extend(materials_partials)
 
-    # Fetch and append irrigation operations
-    irrigation_url = f'{base_url}{urls["operations"]}{id}{urls["irrigations"]}'
-    irrigation_ops = make_get_request(url=irrigation_url, token=token, params=params)
-    if irrigation_ops:
-        materials.extend(irrigation_ops)
+def get_farm_operations_data(
+    ids: list[str],
+    token: dict[str, str],
+    params: dict,
+    observations: list,
+    materials: list,
+):
+    """
+    Fetches observations and material-related data (raw materials, irrigation and
+    compost turning operations) for several farm operations concurrently.
+    Results are appended in operation order.
 
-    # Fetch and append compost turning operations
-    turn_url = f'{base_url}{urls["operations"]}{id}{urls["turning_operations"]}'
-    compost_turning_ops = make_get_request(url=turn_url, token=token, params=params)
-    if compost_turning_ops:
-        materials.extend(compost_turning_ops)
+    """
+    base_url = settings.REPORTING_FARMCALENDAR_BASE_URL
+    urls = settings.REPORTING_FARMCALENDAR_URLS
+    related = ("observations", "materials", "irrigations", "turning_operations")
+
+    tasks = {}
+    for id in ids:
+        for key in related:
+            tasks[(id, key)] = partial(
+                fetch_paginated_async,
+                url=f'{base_url}{urls["operations"]}{id}{urls[key]}',
+                token=token,
+                params=params,
+            )
+    results = run_concurrently(tasks)
+
+    for id in ids:
+        # Fetch and append observations
+        observations_local = results.get((id, "observations"))
+        if observations_local:
+            observations.extend(observations_local)
+
+        # Fetch and append materials, irrigation and compost turning operations
+        for key in related[1:]:
+            materials_partials = results.get((id, key))
+            if materials_partials:
+                materials.extend(materials_partials)
 
 
 def get_pesticide(id: str, token: dict[str, str]):
@@ -210,15 +280,10 @@ def get_pesticide(id: str, token: dict[str, str]):
     Fetches pesticide for Crop Operation
 
     """
-    base_url = settings.REPORTING_FARMCALENDAR_BASE_URL
-    urls = settings.REPORTING_FARMCALENDAR_URLS
-
-    pest_url = f'{base_url}{urls["pest"]}{id}/'
-    pest = make_get_request(url=pest_url, token=token, params={"format": "json"})
-    return pest
+    return fetch_entity("pest", id, token)
 
 
-def display_pdf_parcel_details(pdf: FPDF, parcel_id: str, geolocator: Nominatim, token: str | dict) -> ParcelInfo:
+def display_pdf_parcel_details(pdf: FPDF, parcel_id: str, geolocator: GeocodingService, token: str | dict) -> ParcelInfo:
     parcel_data, farm, identifier = get_parcel_info(
         parcel_id, token, geolocator, identifier_flag=True
     )